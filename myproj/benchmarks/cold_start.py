@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""
+Benchmark cold start of 'myproj' from the source tree and from a zipapp.
+
+Every run starts a fresh interpreter. For the source tree, bytecode caches
+are removed before each run and not written, so that the cost of compiling
+modules on first import, as on a freshly provisioned machine, is included.
+The zipapp is expected to ship precompiled bytecode (see
+'scripts/build_zipapp.py').
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import (Dict, List, Optional, Sequence)
+
+ROOT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir,
+)
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT_DIR)
+
+from myproj.config import ConfigParser  # noqa: E402
+
+from pipeline import complete_params  # noqa: E402
+
+PACKAGE_DIR = os.path.join(ROOT_DIR, "myproj")
+
+
+def clear_bytecode(root_dir: str = PACKAGE_DIR) -> None:
+    """Remove all bytecode caches below a directory.
+
+    :param root_dir: directory to clear.
+
+    :returns: None
+    """
+    for dir_path, dir_names, _ in os.walk(root_dir):
+        if "__pycache__" in dir_names:
+            shutil.rmtree(os.path.join(dir_path, "__pycache__"))
+            dir_names.remove("__pycache__")
+
+
+def time_command(
+    command: Sequence[str],
+    repeat: int = 5,
+    from_source: bool = False,
+) -> Dict[str, float]:
+    """Time cold runs of a command.
+
+    :param command: command to run.
+    :param repeat: number of runs.
+    :param from_source: whether the command runs modules from the source
+            tree; if so, bytecode caches are cleared before each run.
+
+    :returns: dictionary of timing statistics in seconds
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    values: List[float] = []
+    for _ in range(repeat):
+        if from_source:
+            clear_bytecode()
+        start = time.perf_counter()
+        subprocess.run(
+            command,
+            cwd=ROOT_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        values.append(time.perf_counter() - start)
+    return {
+        "min": min(values),
+        "median": statistics.median(values),
+        "mean": statistics.mean(values),
+        "max": max(values),
+        "runs": len(values),
+    }
+
+
+def run(zipapp: Optional[str] = None, repeat: int = 5) -> Dict[str, Dict]:
+    """Benchmark cold start for a set of command lines.
+
+    :param zipapp: path to zipapp archive; if `None`, only the source tree is
+            benchmarked.
+    :param repeat: number of runs per command line.
+
+    :returns: dictionary of timing statistics by layout and command line
+    """
+    work_dir = tempfile.mkdtemp(prefix="myproj_cold_start_")
+    try:
+        config_file = os.path.join(work_dir, "config.yaml")
+        ConfigParser.dict_to_yaml(
+            d=complete_params(project_dir=os.path.join(work_dir, "project")),
+            yaml_file=config_file,
+        )
+        command_lines = {
+            "version": ["--version"],
+            "plan": ["--config", config_file, "--plan"],
+        }
+        layouts = {"source": [sys.executable, "-m", "myproj.cli"]}
+        if zipapp is not None:
+            layouts["zipapp"] = [sys.executable, os.path.abspath(zipapp)]
+        return {
+            layout: {
+                name: time_command(
+                    command=prefix + args,
+                    repeat=repeat,
+                    from_source=layout == "source",
+                )
+                for name, args in command_lines.items()
+            }
+            for layout, prefix in layouts.items()
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def parse_cli_args(args: Optional[Sequence[str]]) -> argparse.Namespace:
+    """Parse CLI arguments.
+
+    :param args: iterable containing command line parameters and arguments.
+
+    :returns: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--zipapp',
+        default=None,
+        help="Zipapp archive to compare against the source tree.",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help="Number of runs per command line.",
+    )
+    parser.add_argument(
+        '--output',
+        default=None,
+        help="Write results as JSON to this file instead of STDOUT.",
+        metavar="PATH",
+    )
+    return parser.parse_args(args)
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    """Run benchmarks and write results.
+
+    :param args: iterable containing command line parameters and arguments.
+
+    :returns: exit status
+    """
+    args_parsed = parse_cli_args(args)
+    results_json = json.dumps(
+        run(zipapp=args_parsed.zipapp, repeat=args_parsed.repeat),
+        indent=2,
+    )
+    if args_parsed.output:
+        with open(args_parsed.output, "w") as fh:
+            fh.write(results_json)
+    else:
+        print(results_json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
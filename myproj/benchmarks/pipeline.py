@@ -0,0 +1,433 @@
+#!/usr/bin/env python
+"""
+Benchmark the phases of the project generation pipeline.
+
+Each phase of 'myproj.cli.main()' is timed on its own for a set of scenarios
+of increasing size. Results are written as JSON so that runs can be compared
+between commits.
+"""
+
+import argparse
+import copy
+from datetime import datetime
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import (Callable, Dict, List, Optional, Sequence)
+
+ROOT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir,
+)
+# Import the package from the source tree only when run as a script, so that
+# importing this module does not shadow an installed package
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT_DIR)
+
+from myproj.config import ConfigParser  # noqa: E402
+from myproj.models import Defaults  # noqa: E402
+from myproj.params import GetParams  # noqa: E402
+from myproj.project import Project  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS_FILE = os.path.join(ROOT_DIR, "myproj", "config", "defaults.yaml")
+TEMPLATE_DIR = os.path.join(ROOT_DIR, "myproj", "templates")
+PHASES = [
+    "defaults",
+    "config",
+    "validate",
+    "params",
+    "prepare",
+    "render",
+    "cleanup",
+]
+
+# Scenario definitions: number of (complete) config files that are merged,
+# factor by which template files are inflated, and whether all optional
+# features are enabled
+SCENARIOS: Dict[str, Dict] = {
+    "small": {
+        "config_files": 1,
+        "template_scale": 1,
+        "features": False,
+    },
+    "medium": {
+        "config_files": 5,
+        "template_scale": 1,
+        "features": True,
+    },
+    "large": {
+        "config_files": 200,
+        "template_scale": 100,
+        "features": True,
+    },
+}
+
+
+def complete_params(project_dir: str, features: bool = True) -> Dict:
+    """Build a complete parameter dictionary that requires no user input.
+
+    :param project_dir: path at which the project is to be rendered.
+    :param features: whether all optional files and software should be
+            enabled.
+
+    :returns: dict
+    """
+    yes_no = "yes" if features else "no"
+    return {
+        "org": {
+            "name": "Bench Org",
+            "slug": "bench_org",
+            "copyright_owner": "Bench Org",
+            "git_host": "https://github.com/bench_org",
+            "docker_host": "registry.hub.docker.com/benchorg",
+        },
+        "user": {
+            "name": "Bench User",
+            "slug": "bench_user",
+            "email": "bench.user@email.com",
+            "affiliation": "Bench Org",
+            "url": "https://github.com/bench_user",
+        },
+        "project": {
+            "name": "bench project",
+            "slug": "bench_project",
+            "path": project_dir,
+            "synopsis": "Benchmarks the project generation pipeline.",
+            "version": "0.1.0",
+            "tags": "benchmark",
+            "license": "apache2" if features else "mit",
+            "copyright_year": "2020",
+            "original_author": "Bench User",
+            "git_repo": "https://github.com/bench_org/bench_project",
+            "docker_image_name": "benchorg/bench_project",
+        },
+        "soft": {
+            "python_version": "3.8.1",
+            "docs": yes_no,
+            "docker": yes_no,
+            "packaging": yes_no,
+            "cli_script": yes_no,
+            "linter": ["flake8", "pylint"] if features else ["none"],
+            "testing": ["pytest"] if features else ["none"],
+            "ci_cd": ["gitlab_docker"] if features else ["none"],
+            "auto_version_bump": yes_no,
+        },
+    }
+
+
+def write_config_files(
+    work_dir: str,
+    params: Dict,
+    n_files: int = 1,
+) -> List[str]:
+    """Write a number of complete config files.
+
+    Each file sets all parameters, overriding the values of the previous
+    ones, so that merging is exercised.
+
+    :param work_dir: directory to write config files to.
+    :param params: complete parameter dictionary.
+    :param n_files: number of config files to write.
+
+    :returns: list of paths to config files, in the order of parsing
+    """
+    config_files = []
+    for i in range(n_files):
+        conf = copy.deepcopy(params)
+        conf['project']['synopsis'] += f" Revision {i}."
+        path = os.path.join(work_dir, f"config_{i}.yaml")
+        ConfigParser.dict_to_yaml(d=conf, yaml_file=path)
+        config_files.append(path)
+    return config_files
+
+
+def write_template_dir(work_dir: str, scale: int = 1) -> str:
+    """Create template directory with files inflated by a given factor.
+
+    :param work_dir: directory to create template directory in.
+    :param scale: factor by which to multiply the contents of each template
+            file; for a factor of 1, the packaged templates are used as is.
+
+    :returns: path to template directory
+    """
+    if scale == 1:
+        return TEMPLATE_DIR
+    template_dir = os.path.join(work_dir, "templates")
+    shutil.copytree(TEMPLATE_DIR, template_dir)
+    for dir_path, _, file_names in os.walk(template_dir):
+        for file_name in file_names:
+            path = os.path.join(dir_path, file_name)
+            with open(path, "rb") as fh:
+                contents = fh.read()
+            with open(path, "wb") as fh:
+                fh.write(contents * scale)
+    return template_dir
+
+
+def timed(func: Callable, *args, **kwargs) -> float:
+    """Return wall time in seconds of calling a function."""
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def run_pipeline(
+    config_files: Sequence[str],
+    template_dir: str,
+    work_dir: str,
+) -> Dict[str, float]:
+    """Run all phases of the generation pipeline once and time each.
+
+    :param config_files: config files to merge.
+    :param template_dir: template directory to assemble projects from.
+    :param work_dir: directory to create temporary and project files in.
+
+    :returns: dictionary of wall times in seconds by phase
+    """
+    times: Dict[str, float] = {}
+    result: Dict = {}
+
+    def defaults():
+        result['defaults'] = ConfigParser(DEFAULTS_FILE)
+
+    def config():
+        result['config'] = ConfigParser(*config_files)
+
+    def validate():
+        if not ConfigParser.same_keys(
+            query=result['defaults'].values,
+            ref=Defaults().as_mapping(),
+        ):
+            raise TypeError("Defaults file is corrupt.")
+
+    def params():
+        result['params'] = GetParams(
+            defaults=result['defaults'].values,
+            params=result['config'].values,
+        )
+
+    def prepare():
+        result['project'] = Project(result['params'].params)
+        result['project'].prepare_template(
+            root_dir=os.path.join(work_dir, "tmp"),
+            template_dir=template_dir,
+        )
+
+    def render():
+        result['project'].render_project()
+
+    def cleanup():
+        result['project'].clean_up(include_project_dir=True)
+
+    phases = {
+        "defaults": defaults,
+        "config": config,
+        "validate": validate,
+        "params": params,
+        "prepare": prepare,
+        "render": render,
+        "cleanup": cleanup,
+    }
+    for name in PHASES:
+        times[name] = timed(phases[name])
+    return times
+
+
+def run_scenario(name: str, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Benchmark a scenario.
+
+    :param name: name of scenario in `SCENARIOS`.
+    :param repeat: number of times to run the pipeline.
+
+    :returns: dictionary of timing statistics (in seconds) by phase
+    """
+    scenario = SCENARIOS[name]
+    work_dir = tempfile.mkdtemp(prefix=f"myproj_bench_{name}_")
+    try:
+        params = complete_params(
+            project_dir=os.path.join(work_dir, "project"),
+            features=scenario['features'],
+        )
+        config_files = write_config_files(
+            work_dir=work_dir,
+            params=params,
+            n_files=scenario['config_files'],
+        )
+        template_dir = write_template_dir(
+            work_dir=work_dir,
+            scale=scenario['template_scale'],
+        )
+        runs: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+        for _ in range(repeat):
+            times = run_pipeline(
+                config_files=config_files,
+                template_dir=template_dir,
+                work_dir=work_dir,
+            )
+            for phase, seconds in times.items():
+                runs[phase].append(seconds)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        phase: {
+            "min": min(values),
+            "median": statistics.median(values),
+            "mean": statistics.mean(values),
+            "max": max(values),
+            "runs": len(values),
+        }
+        for phase, values in runs.items()
+    }
+
+
+def metadata() -> Dict[str, Optional[str]]:
+    """Collect information about the benchmarked code and host."""
+    try:
+        commit: Optional[str] = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def compare(
+    results: Dict,
+    baseline: Dict,
+    threshold: float = 0.2,
+) -> List[str]:
+    """Compare median phase timings against those of a baseline run.
+
+    :param results: benchmark results of the current run.
+    :param baseline: benchmark results of the baseline run.
+    :param threshold: relative slowdown above which a phase is considered
+            to have regressed.
+
+    :returns: list of regressed phases, as 'scenario/phase' strings
+    """
+    regressions = []
+    for scenario, phases in results['scenarios'].items():
+        for phase, stats in phases.items():
+            try:
+                ref = baseline['scenarios'][scenario][phase]['median']
+            except KeyError:
+                continue
+            ratio = stats['median'] / ref if ref else 1.0
+            logger.info(f"{scenario}/{phase}: {ratio:.2f}x baseline")
+            if ratio > 1 + threshold:
+                regressions.append(f"{scenario}/{phase}")
+    return regressions
+
+
+def parse_cli_args(args: Optional[Sequence[str]]) -> argparse.Namespace:
+    """Parse CLI arguments.
+
+    :param args: iterable containing command line parameters and arguments.
+
+    :returns: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+    )
+    parser.add_argument(
+        '--scenario',
+        action="append",
+        choices=list(SCENARIOS),
+        help=(
+            "Scenario to run; can be specified multiple times. Defaults to "
+            "all scenarios."
+        ),
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help="Number of times the pipeline is run per scenario.",
+    )
+    parser.add_argument(
+        '--output',
+        default=None,
+        help="Write results as JSON to this file instead of STDOUT.",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        '--compare',
+        default=None,
+        help=(
+            "JSON results of a previous run to compare against; exits with "
+            "a non-zero status if any phase regressed."
+        ),
+        metavar="PATH",
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.2,
+        help="Relative slowdown of a phase that counts as a regression.",
+    )
+    return parser.parse_args(args)
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    """Run benchmarks and write/compare results.
+
+    :param args: iterable containing command line parameters and arguments.
+
+    :returns: exit status
+    """
+    args_parsed = parse_cli_args(args)
+    logging.basicConfig(format="%(message)s")
+    logging.getLogger().setLevel(logging.ERROR)
+    logger.setLevel(logging.INFO)
+
+    results = {
+        "meta": metadata(),
+        "repeat": args_parsed.repeat,
+        "scenarios": {
+            name: run_scenario(name=name, repeat=args_parsed.repeat)
+            for name in (args_parsed.scenario or SCENARIOS)
+        },
+    }
+
+    results_json = json.dumps(results, indent=2)
+    if args_parsed.output:
+        with open(args_parsed.output, "w") as fh:
+            fh.write(results_json)
+    else:
+        print(results_json)
+
+    if args_parsed.compare:
+        with open(args_parsed.compare) as fh:
+            baseline = json.load(fh)
+        regressions = compare(
+            results=results,
+            baseline=baseline,
+            threshold=args_parsed.threshold,
+        )
+        if regressions:
+            logger.error(f"Performance regressions: {regressions}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Benchmark rendering of placeholder-only templates by substitution.
+
+Every packaged template file in use that consists of plain placeholders only is
+rendered repeatedly, once by the template engine and once by its compiled
+substitution (see 'myproj.placeholders'). Templates are loaded and compiled
+before timing, so that only rendering is compared.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import (Dict, Optional, Sequence)
+
+import jinja2
+
+ROOT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir,
+)
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT_DIR)
+
+from myproj import placeholders  # noqa: E402
+from myproj.models import thaw  # noqa: E402
+from myproj.project import Project  # noqa: E402
+
+from pipeline import (TEMPLATE_DIR, complete_params)  # noqa: E402
+
+# Drafts of templates that are not used for any project yet
+UNUSED_TEMPLATES = "LATER/"
+
+
+def time_render(render, repeat: int = 1000) -> float:
+    """Return median wall time in seconds of a number of renderings."""
+    values = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            render()
+        values.append(time.perf_counter() - start)
+    return statistics.median(values)
+
+
+def run(repeat: int = 1000) -> Dict[str, Dict]:
+    """Benchmark both renderers on all placeholder-only templates.
+
+    :param repeat: number of renderings per template and timing.
+
+    :returns: dictionary of timings in seconds by template name, plus their
+            totals
+    """
+    params = complete_params(project_dir="project")
+    params['replace'] = thaw(Project(params).plan_template()['replace'])
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+        keep_trailing_newline=True,
+    )
+    results: Dict[str, Dict] = {}
+    for name in sorted(env.list_templates()):
+        if name.startswith(UNUSED_TEMPLATES):
+            continue
+        path = os.path.join(TEMPLATE_DIR, name)
+        try:
+            with open(path, encoding='utf-8') as fh:
+                compiled = placeholders.compile(fh.read())
+        except UnicodeDecodeError:
+            continue
+        if compiled is None or not compiled.paths:
+            continue
+        template = env.get_template(name)
+        try:
+            expected = template.render(cookiecutter=params)
+        except jinja2.UndefinedError:
+            continue
+        if compiled.render(params) != expected:
+            raise RuntimeError(f"Renderings of '{name}' differ.")
+        results[name] = {
+            "jinja": time_render(
+                lambda: template.render(cookiecutter=params),
+                repeat=repeat,
+            ),
+            "compiled": time_render(
+                lambda: compiled.render(params),
+                repeat=repeat,
+            ),
+        }
+    total = {
+        renderer: sum(times[renderer] for times in results.values())
+        for renderer in ("jinja", "compiled")
+    }
+    total['speedup'] = total['jinja'] / total['compiled']
+    return {"repeat": repeat, "templates": results, "total": total}
+
+
+def parse_cli_args(args: Optional[Sequence[str]]) -> argparse.Namespace:
+    """Parse CLI arguments.
+
+    :param args: iterable containing command line parameters and arguments.
+
+    :returns: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1000,
+        help="Number of renderings per template and timing.",
+    )
+    parser.add_argument(
+        '--output',
+        default=None,
+        help="Write results as JSON to this file instead of STDOUT.",
+        metavar="PATH",
+    )
+    return parser.parse_args(args)
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    """Run benchmarks and write results.
+
+    :param args: iterable containing command line parameters and arguments.
+
+    :returns: exit status
+    """
+    args_parsed = parse_cli_args(args)
+    results_json = json.dumps(run(repeat=args_parsed.repeat), indent=2)
+    if args_parsed.output:
+        with open(args_parsed.output, "w") as fh:
+            fh.write(results_json)
+    else:
+        print(results_json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
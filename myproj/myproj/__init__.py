@@ -0,0 +1,5 @@
+"""
+Python project generator.
+"""
+
+__version__ = "0.1.0"
@@ -1,4 +1,4 @@
-from myproj.cli import main
+from myproj.cli import run
 
 if __name__ == "__main__":
-    main()
+    run()
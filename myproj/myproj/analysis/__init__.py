@@ -0,0 +1,346 @@
+"""
+Static analysis of template files.
+
+Every template file is parsed once to find the parameters it references
+(e.g., 'project.slug' for `{{cookiecutter.project.slug}}`) and to report
+malformed markup and references to parameters or replacement strings that
+do not exist. The results are kept in an index, mapping file paths to the
+referenced parameters, which is persisted with the package (see
+'scripts/index_templates.py') and tells which files a parameter change
+affects. The index also records the content hash, size and classification
+(see `scan()`) of each file, so that packaged templates whose hash matches
+are classified without being scanned; see `packaged_index()`.
+"""
+import codecs
+import functools
+import hashlib
+import json
+import logging
+import threading
+from typing import (Callable, Dict, Iterable, List, Mapping, Optional, Set,
+                    Tuple)
+
+import jinja2
+from jinja2 import nodes
+
+from myproj import (resources, schema)
+from myproj.resources import Traversable
+
+logger = logging.getLogger(__name__)
+
+# Version of the index format
+INDEX_VERSION = 2
+
+# Packaged index of packaged templates, relative to the package root
+INDEX_FILE = ("config", "template_index.json")
+
+# Name under which parameters are available to templates
+CONTEXT_NAME = "cookiecutter"
+
+# Section of the context holding replacement strings
+REPLACE_SECTION = "replace"
+
+# Names of directories that do not contain template files
+IGNORED_DIRS = frozenset({"__pycache__"})
+
+# Start delimiters of template markup
+MARKERS = (b"{{", b"{%", b"{#")
+
+# Classifications of file contents, by SHA-256 digest
+_verbatim: Dict[str, bool] = {}
+_verbatim_lock = threading.Lock()
+
+
+def scan(chunks: Iterable[bytes]) -> bool:
+    """Return whether file contents, read in chunks, are verbatim.
+
+    Verbatim files render to themselves and can be copied as they are:
+    files without template markup, and binary files, i.e., files that are
+    not UTF-8 encoded text, which the template engine cannot render.
+
+    :param chunks: file contents, in chunks of any size.
+
+    :returns: bool
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    markup = False
+    tail = b""
+    try:
+        for chunk in chunks:
+            decoder.decode(chunk)
+            if not markup:
+                markup = (
+                    any(marker in chunk for marker in MARKERS)
+                    or tail + chunk[:1] in MARKERS
+                )
+                tail = chunk[-1:] or tail
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return True
+    return not markup
+
+
+def is_verbatim(data: bytes) -> bool:
+    """Return whether file contents are verbatim; see `scan()`.
+
+    :param data: file contents.
+
+    :returns: bool
+    """
+    return scan((data,))
+
+
+def classify(digest: str, read: Callable[[], Iterable[bytes]]) -> bool:
+    """Return whether file contents are verbatim, caching the result by
+    content hash; see `scan()`.
+
+    :param digest: hexadecimal SHA-256 digest of file contents.
+    :param read: function returning the file contents in chunks; only
+            called if the contents were not classified before.
+
+    :returns: whether the contents are verbatim
+    """
+    with _verbatim_lock:
+        verbatim = _verbatim.get(digest)
+    if verbatim is None:
+        verbatim = scan(read())
+        with _verbatim_lock:
+            _verbatim[digest] = verbatim
+    return verbatim
+
+
+def _chain(node: nodes.Node) -> Optional[List[str]]:
+    parts: List[str] = []
+    while True:
+        if isinstance(node, nodes.Getattr):
+            parts.append(node.attr)
+            node = node.node
+        elif (
+            isinstance(node, nodes.Getitem)
+            and isinstance(node.arg, nodes.Const)
+            and isinstance(node.arg.value, str)
+        ):
+            parts.append(node.arg.value)
+            node = node.node
+        elif isinstance(node, nodes.Name):
+            parts.append(node.name)
+            return parts[::-1]
+        else:
+            return None
+
+
+def _walk(node: nodes.Node, found: Set[Tuple[str, ...]]) -> None:
+    if isinstance(node, (nodes.Getattr, nodes.Getitem, nodes.Name)):
+        chain = _chain(node)
+        if chain is not None:
+            found.add(tuple(chain))
+            return
+    for child in node.iter_child_nodes():
+        _walk(child, found)
+
+
+def references(source: str) -> List[Tuple[str, ...]]:
+    """Find the variables referenced by a template.
+
+    :param source: template source.
+
+    :returns: sorted list of variables, as tuples of attribute names
+    :raises: jinja2.TemplateSyntaxError
+    """
+    tree = jinja2.Environment().parse(source)
+    assigned = {
+        node.name for node in tree.find_all(nodes.Name)
+        if node.ctx in ("store", "param")
+    }
+    found: Set[Tuple[str, ...]] = set()
+    _walk(tree, found)
+    return sorted(chain for chain in found if chain[0] not in assigned)
+
+
+def check_reference(
+    chain: Tuple[str, ...],
+    replacements: Mapping,
+) -> Optional[str]:
+    """Check whether a referenced variable exists.
+
+    :param chain: variable, as tuple of attribute names.
+    :param replacements: replacement strings.
+
+    :returns: description of the problem, or `None` if the variable exists
+    """
+    name = '.'.join(chain)
+    if chain[0] != CONTEXT_NAME:
+        return f"undefined variable '{name}'"
+    path = chain[1:]
+    if not path:
+        return None
+    if path[0] == REPLACE_SECTION:
+        value: object = replacements
+        for key in path[1:]:
+            if not isinstance(value, Mapping) or key not in value:
+                return f"undefined replacement string '{name}'"
+            value = value[key]
+        return None
+    if path[0] not in schema.SECTIONS:
+        return f"undefined parameter '{name}'"
+    if len(path) > 1 and '.'.join(path[:2]) not in schema.FIELDS:
+        return f"undefined parameter '{name}'"
+    if len(path) > 2:
+        return f"undefined parameter '{name}'"
+    return None
+
+
+def analyse_file(data: bytes, replacements: Mapping) -> Dict:
+    """Analyse a template file.
+
+    :param data: contents of template file.
+    :param replacements: replacement strings.
+
+    :returns: index entry with keys 'sha256', 'size', 'verbatim' (see
+            `is_verbatim()`), 'variables' (referenced parameters, without the
+            context name) and 'problems'
+    """
+    entry: Dict = {
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'size': len(data),
+        'verbatim': is_verbatim(data),
+        'variables': [],
+        'problems': [],
+    }
+    try:
+        source = data.decode()
+    except UnicodeDecodeError:
+        entry['binary'] = True
+        return entry
+    try:
+        chains = references(source)
+    except jinja2.TemplateSyntaxError as e:
+        entry['problems'].append(f"line {e.lineno}: {e.message}")
+        return entry
+    for chain in chains:
+        problem = check_reference(chain=chain, replacements=replacements)
+        if problem is not None:
+            entry['problems'].append(problem)
+        if chain[0] == CONTEXT_NAME and len(chain) > 1:
+            entry['variables'].append('.'.join(chain[1:]))
+    return entry
+
+
+def files(template_dir: Traversable, prefix: str = "") -> List[str]:
+    """List all files below a template directory.
+
+    :param template_dir: template directory.
+    :param prefix: prefix of paths in `template_dir`.
+
+    :returns: sorted list of '/'-separated paths
+    """
+    paths: List[str] = []
+    for item in template_dir.iterdir():
+        if item.is_dir():
+            if item.name in IGNORED_DIRS:
+                continue
+            paths.extend(files(item, prefix=f"{prefix}{item.name}/"))
+        else:
+            paths.append(f"{prefix}{item.name}")
+    return sorted(paths)
+
+
+def build_index(template_dir: Traversable, replacements: Mapping) -> Dict:
+    """Analyse all files below a template directory.
+
+    :param template_dir: template directory.
+    :param replacements: replacement strings.
+
+    :returns: index with keys 'version' and 'files', mapping paths to index
+            entries; see `analyse_file()`
+    """
+    index: Dict = {'version': INDEX_VERSION, 'files': {}}
+    for path in files(template_dir):
+        index['files'][path] = analyse_file(
+            data=template_dir.joinpath(*path.split('/')).read_bytes(),
+            replacements=replacements,
+        )
+    return index
+
+
+def dumps(index: Mapping) -> str:
+    """Serialize index in canonical form.
+
+    :param index: index; see `build_index()`.
+
+    :returns: str
+    """
+    return json.dumps(index, indent=2, sort_keys=True) + '\n'
+
+
+def load_index(path: str) -> Dict:
+    """Load persisted index.
+
+    :param path: path to index file.
+
+    :returns: dict
+    :raises: ValueError
+    """
+    with open(path) as fh:
+        return _check_version(index=json.load(fh), name=path)
+
+
+@functools.lru_cache(maxsize=1)
+def packaged_index() -> Optional[Dict]:
+    """Load index of the packaged templates.
+
+    The index is kept up to date with 'scripts/index_templates.py'.
+
+    :returns: index; `None` if it is missing or of an unsupported version
+    """
+    try:
+        return _check_version(
+            index=json.loads(resources.data(*INDEX_FILE).read_text()),
+            name='/'.join(INDEX_FILE),
+        )
+    except (OSError, ValueError) as e:
+        logger.debug(f"Packaged template index not used: {e}")
+        return None
+
+
+def _check_version(index: Dict, name: str) -> Dict:
+    if index.get('version') != INDEX_VERSION:
+        raise ValueError(
+            f"Unsupported template index version '{index.get('version')}' "
+            f"in file '{name}'."
+        )
+    return index
+
+
+def problems(index: Mapping) -> List[str]:
+    """List all problems found in the indexed files.
+
+    :param index: index; see `build_index()`.
+
+    :returns: list of problems, prefixed with the path of the file
+    """
+    return [
+        f"{path}: {problem}"
+        for path, entry in sorted(index['files'].items())
+        for problem in entry['problems']
+    ]
+
+
+def affected(index: Mapping, params: Iterable[str]) -> List[str]:
+    """List the files that reference any of a set of parameters.
+
+    :param index: index; see `build_index()`.
+    :param params: parameters or sections, e.g., 'project.slug' or 'soft'.
+
+    :returns: sorted list of paths
+    """
+    prefixes = tuple(params)
+    return sorted(
+        path for path, entry in index['files'].items()
+        if any(
+            variable == prefix or variable.startswith(prefix + '.')
+            or prefix.startswith(variable + '.')
+            for variable in entry['variables']
+            for prefix in prefixes
+        )
+    )
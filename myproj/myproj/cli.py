@@ -14,7 +14,6 @@ Initialize Python project.
 # - add conda
 # - add virtual environment
 
-__version__ = "0.1.0"
 __copyright__ = "Copyright 2020 Zavolan lab, Biozentrum, University of Basel"
 __license__ = "Apache License 2.0"
 __author__ = "Alex Kanitz"
@@ -22,18 +21,24 @@ __maintainer__ = "Alex Kanitz"
 __email__ = "alexander.kanitz@alumni.ethz.ch"
 
 import argparse
+import contextlib
+import json
 import logging
 import os
 import sys
-from typing import (Optional, Sequence)
+from typing import (Any, Iterator, Optional, Sequence)
 
-from myproj.config import ConfigParser
-from myproj.models import Defaults
-from myproj.params import GetParams
-from myproj.project import Project
+from myproj import __version__
+
+# NOTE: Heavy modules (and with them 'yaml', 'addict' and 'cookiecutter') are
+# imported lazily inside 'main()' so that '--help', '--version' and argument
+# errors return without loading them.
 
 logger = logging.getLogger()
 
+# Sentinel for the user config file; resolved only when needed
+_PACKAGED_CONFIG: Any = object()
+
 
 def parse_cli_args(args: Optional[Sequence[str]]) -> argparse.Namespace:
     """Parse CLI arguments.
@@ -58,18 +63,15 @@ def parse_cli_args(args: Optional[Sequence[str]]) -> argparse.Namespace:
     parser.add_argument(
         '--defaults',
         type=argparse.FileType('r', encoding='UTF-8'),
-        default=os.path.join(
-            os.path.dirname(__file__),
-            os.pardir,
-            "config",
-            "defaults.yaml",
-        ),
+        default=None,
         help=(
             "Can be used to supply a different default values file than the "
             "one that is shipped with this package and which is used by "
             "default. If specified, the path should lead to a file that "
-            "corresponds precisely to the original defaults file. Use with "
-            "care."
+            "corresponds precisely to the original defaults file. "
+            "Parameter descriptions shown in prompts are taken from the "
+            "packaged description catalog unless the file gives them as "
+            "'description' entries. Use with care."
         ),
         metavar="PATH",
     )
@@ -79,28 +81,26 @@ def parse_cli_args(args: Optional[Sequence[str]]) -> argparse.Namespace:
         '--config',
         type=argparse.FileType('r', encoding='UTF-8'),
         action="append",
-        default=[os.path.join(
-            os.path.dirname(__file__),
-            os.pardir,
-            "config",
-            "user_config.yaml",
-        )],
+        default=[],
         help=(
             "Use the provided YAML configuration file instead of the default "
             "user-specific configuration. This option can be used to "
             "completely forego user interaction. Howerver, this requires "
             "that the specified configuration file defines values for all "
             "parameters in the defaults file available at path "
-            "'config/defaults.yaml' relative to the root of the project "
-            "repository. Parameters that are not required by the program are "
-            "silently ignored. Note that the option can be provided multiple "
-            "times. In that case, the specified configuration files are "
-            "parsed in the provided order, with conflicting values "
-            "overriding any previously set ones. This can be used to "
-            "override specific values of the default user-specific parameter "
-            "file (located at 'config/user_config.yaml' relative to project "
-            "root) or to provide a file with only only project-specific "
-            "parameters to ensure that the execution in non-interactive."
+            "'myproj/config/defaults.yaml' relative to the root of the "
+            "project repository. Parameters that are not required by the "
+            "program are silently ignored. Note that the option can be "
+            "provided multiple times. In that case, the specified "
+            "configuration files are parsed in the provided order, with "
+            "conflicting values overriding any previously set ones. This can "
+            "be used to override specific values of the default "
+            "user-specific parameter file (located at "
+            "'myproj/config/user_config.yaml' relative to project root, or "
+            "in directory 'myproj' of the user's configuration directory "
+            "when run from an archive) or to provide a file with only only "
+            "project-specific parameters to ensure that the execution in "
+            "non-interactive."
         ),
         metavar="PATH",
     )
@@ -115,6 +115,88 @@ def parse_cli_args(args: Optional[Sequence[str]]) -> argparse.Namespace:
         )
     )
 
+    parser.add_argument(
+        '--templates',
+        default=None,
+        help=(
+            "Template directory or template pack (see command "
+            "'pack-templates') to assemble the project from. Defaults to the "
+            "packaged templates."
+        ),
+        metavar="PATH",
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=None,
+        help=(
+            "Keep prepared template trees in this directory and reuse them "
+            "in later runs creating projects with the same licence and "
+            "features. By default, prepared template trees are only reused "
+            "within a run."
+        ),
+        metavar="DIR",
+    )
+    parser.add_argument(
+        '--dedup-root',
+        default=None,
+        help=(
+            "Share the contents of output files that are identical to those "
+            "of other projects generated with the same option value. Files "
+            "are cloned (copy-on-write), so they remain independent and "
+            "writable; on file systems that do not support cloning, files "
+            "are written as usual, unless '--dedup-hardlinks' is given. The "
+            "directory needs to be on the same file system as the project."
+        ),
+        metavar="DIR",
+    )
+    parser.add_argument(
+        '--dedup-hardlinks',
+        dest="dedup_method",
+        action='store_const',
+        const="hardlink",
+        default=None,
+        help=(
+            "With '--dedup-root', hard link identical output files instead "
+            "of cloning them. This saves space on any file system, but the "
+            "files are shared between projects and read-only, so they "
+            "need to be copied before being edited."
+        ),
+    )
+    parser.add_argument(
+        '--result-cache',
+        default=None,
+        help=(
+            "Keep rendered projects in this directory and materialize "
+            "projects requested again with identical parameters from it "
+            "instead of rendering them. The least recently used projects are "
+            "evicted once the cache holds more than 64 projects."
+        ),
+        metavar="DIR",
+    )
+    parser.add_argument(
+        '--no-input',
+        action='store_true',
+        default=False,
+        help=(
+            "Never query the user. Parameters missing from the config "
+            "files are inferred where possible; if any parameters remain "
+            "missing, the program aborts with a list of all of them. Implied "
+            "if STDIN is not a terminal."
+        ),
+    )
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        default=False,
+        help=(
+            "Do not create the project. Instead, write a JSON document to "
+            "STDOUT that lists the complete parameters and how the project "
+            "would be assembled: the template files to be copied, the "
+            "license, the software requirements and the replacement "
+            "strings, including those that are blanked. Neither the user "
+            "config nor any project files are written."
+        ),
+    )
     parser.add_argument(
         '--verbose', "-v",
         action='store_true',
@@ -127,6 +209,50 @@ def parse_cli_args(args: Optional[Sequence[str]]) -> argparse.Namespace:
         default=False,
         help="Print debugging messages to STDERR. Implies `--verbose`.",
     )
+    parser.add_argument(
+        '--profile',
+        default=None,
+        help=(
+            "Profile each phase of the run and write the profiles to this "
+            "directory: one file '<phase>.pstats' per phase, for use with "
+            "'pstats' or 'snakeviz', plus file 'profile.collapsed' with the "
+            "stacks of all phases in the collapsed stack format read by "
+            "flame graph tools."
+        ),
+        metavar="DIR",
+    )
+    parser.add_argument(
+        '--metrics',
+        default=None,
+        help=(
+            "Write wall time, CPU time, peak resident set size of the "
+            "process and its increase, numbers of files copied and "
+            "rendered, bytes written and subprocess spawns of each phase of "
+            "the run to this file. Metrics are written as "
+            "JSON if the file name ends with '.json' and in the OpenMetrics "
+            "text format otherwise."
+        ),
+        metavar="PATH",
+    )
+    parser.add_argument(
+        '--log-file',
+        default=None,
+        help=(
+            "Append log messages to this file, in addition to writing them "
+            "to STDERR."
+        ),
+        metavar="PATH",
+    )
+    parser.add_argument(
+        '--project-log-dir',
+        default=None,
+        help=(
+            "Additionally append the log messages of generating the project "
+            "to file '<project slug>.log' in this directory, e.g., to keep "
+            "separate logs of projects generated in a batch."
+        ),
+        metavar="DIR",
+    )
     parser.add_argument(
         '--version',
         action='version',
@@ -134,14 +260,66 @@ def parse_cli_args(args: Optional[Sequence[str]]) -> argparse.Namespace:
         help="Show version information and exit.",
     )
 
+    commands = parser.add_subparsers(
+        dest="command",
+        metavar="COMMAND",
+        title="commands",
+        description=(
+            "If no command is given, a project is created. Options listed "
+            "above must be given before the command."
+        ),
+    )
+    pack_templates = commands.add_parser(
+        'pack-templates',
+        help=(
+            "Bundle a template directory into a single, indexed template "
+            "pack file."
+        ),
+        description=(
+            "Bundle a template directory into a single, indexed template "
+            "pack file that can be passed to option '--templates'."
+        ),
+    )
+    pack_templates.add_argument(
+        '--template-dir',
+        default=None,
+        help="Template directory to pack. Defaults to the packaged templates.",
+        metavar="DIR",
+    )
+    pack_templates.add_argument(
+        '--output', '-o',
+        default="templates.mptpk",
+        help="Path of the template pack to write.",
+        metavar="PATH",
+    )
+
+    verify = commands.add_parser(
+        'verify',
+        help=(
+            "Check a generated project against its integrity manifest."
+        ),
+        description=(
+            "Check a generated project against its integrity manifest "
+            "'<PATH>.manifest.json', reporting files that are missing, "
+            "modified or not listed in the manifest. Exits with a non-zero "
+            "status if any are found."
+        ),
+    )
+    verify.add_argument(
+        'project_dir',
+        help="Root directory of the generated project.",
+        metavar="PATH",
+    )
+
     args_parsed = parser.parse_args(args)
 
     if args_parsed.defaults:
         args_parsed.defaults.close()
         args_parsed.defaults = args_parsed.defaults.name
 
-    if args_parsed.config:
-        conf_list = []
+    if args_parsed.config is not None:
+        from myproj.resources import user_config_file
+        conf_list = [user_config_file()]
         for conf in args_parsed.config:
             if not isinstance(conf, str):
                 conf.close()
@@ -158,167 +336,317 @@ def setup_logging(
     logger: Optional[logging.Logger] = None,
     verbose: bool = False,
     debug: bool = False,
+    log_file: Optional[str] = None,
 ) -> None:
     """Configure logging.
 
+    Records are written by a background thread; repeated calls reconfigure
+    logging instead of adding handlers. See '.logs'.
+
     :param logger: logging object to use for logging.
     :param verbose: whether info messages should be logged.
     :param debug: whether debug messages should be logged.
+    :param log_file: if not `None`, messages are also appended to this file.
 
     :returns: None
     """
     if logger:
+        from myproj import logs
         if debug:
-            logger.setLevel(logging.DEBUG)
+            level = logging.DEBUG
         elif verbose:
-            logger.setLevel(logging.INFO)
+            level = logging.INFO
         else:
-            logger.setLevel(logging.WARNING)
-        handler = logging.StreamHandler()
-        handler.setFormatter(logging.Formatter(
-            "[%(asctime)-15s: %(levelname)-8s @ %(funcName)s] %(message)s"
-        ))
-        logger.addHandler(handler)
+            level = logging.WARNING
+        logs.setup(logger=logger, level=level, log_file=log_file)
+
+
+@contextlib.contextmanager
+def phase(name: str, *instruments: Any) -> Iterator[None]:
+    """Context manager running the enclosed code as a named phase of the
+    current run.
+
+    :param name: name of phase.
+    :param *instruments: objects recording phases, such as
+            '.profiling.PhaseProfiler' or '.metrics.PhaseMetrics'; each needs
+            to implement a method `phase(name)` returning a context manager.
+            Instruments are entered in the listed order.
+
+    :returns: None
+    """
+    with contextlib.ExitStack() as stack:
+        for instrument in instruments:
+            stack.enter_context(instrument.phase(name))
+        yield
 
 
 def main(
-    defaults_file: str = os.path.join(
-        os.path.dirname(__file__),
-        os.pardir,
-        "config",
-        "defaults.yaml",
-    ),
-    config_files: Optional[Sequence[str]] = [os.path.join(
-        os.path.dirname(__file__),
-        os.pardir,
-        "config",
-        "user_config.yaml",
-    )],
+    defaults_file: Optional[str] = None,
+    config_files: Optional[Sequence[str]] = _PACKAGED_CONFIG,
+    profile_dir: Optional[str] = None,
+    metrics_file: Optional[str] = None,
+    plan: bool = False,
+    template_dir: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    interactive: Optional[bool] = None,
+    dedup_root: Optional[str] = None,
+    dedup_method: Optional[str] = None,
+    result_cache: Optional[str] = None,
+    project_log_dir: Optional[str] = None,
 ) -> None:
     """Main function for Python project creation.
 
     :param defaults_file: YAML file containing default values for user and
-            project parameters; needs to conform to '.models.Defaults'.
+            project parameters; needs to conform to '.models.Defaults'. If
+            `None`, the packaged defaults file is used.
     :param config_files: ordered list of YAML files containing actual values
             user and project parameters, parsed and overridden in the listed
             order; users will only be queried for any required parameter
-            values missing here.
+            values missing here. Defaults to the packaged user config file;
+            set to `None` to skip reading any config files.
+    :param profile_dir: if not `None`, each phase of the run is profiled and
+            profiles are written to this directory; see
+            '.profiling.PhaseProfiler'.
+    :param metrics_file: if not `None`, timing and resource metrics of each
+            phase of the run are written to this file, as JSON if the file
+            name ends with '.json' and in the OpenMetrics text format
+            otherwise; see '.metrics.PhaseMetrics'.
+    :param plan: if `True`, write a JSON plan of the project to STDOUT and
+            exit without writing the user config or any project files; the
+            plan contains the complete parameters and how the project
+            template would be assembled; see '.project.Project.plan_template'.
+    :param template_dir: template directory or template pack to assemble
+            the project from; defaults to the packaged templates.
+    :param cache_dir: directory to keep prepared template trees in across
+            runs; see '.project.Project.prepare_template'.
+    :param interactive: whether the user may be queried for missing
+            parameters; if `False`, the run fails listing all missing
+            parameters instead; see '.params.GetParams'. If `None`, the user
+            is only queried if STDIN is a terminal.
+    :param dedup_root: if not `None`, output files are deduplicated against
+            those of other projects generated with the same directory; see
+            '.dedup.OutputStore'.
+    :param dedup_method: method of deduplicating output files, one of
+            '.dedup.METHODS'; if `None`, files are cloned if the file system
+            supports it.
+    :param result_cache: if not `None`, projects are materialized from and
+            added to a cache of rendered projects in this directory; see
+            '.results.ResultCache'.
+    :param project_log_dir: if not `None`, log messages of generating the
+            project are also appended to file '<project slug>.log' in this
+            directory; requires logging to be set up, see
+            '.logs.project_log'.
 
     :returns: None
     """
+    from myproj import logs
+    from myproj import resources
+    from myproj.config import ConfigParser
+    from myproj.dedup import OutputStore
+    from myproj.metrics import PhaseMetrics
+    from myproj.models import Defaults
+    from myproj.params import GetParams
+    from myproj.profiling import PhaseProfiler
+    from myproj.project import Project
+    from myproj.results import ResultCache
+
+    if defaults_file is None:
+        defaults_file = resources.path("config", "defaults.yaml")
+    if config_files is _PACKAGED_CONFIG:
+        config_files = [resources.user_config_file()]
+    if interactive is None:
+        interactive = sys.stdin is not None and sys.stdin.isatty()
+
+    profiler = PhaseProfiler(out_dir=profile_dir)
+    metrics = PhaseMetrics()
+    project_log = contextlib.ExitStack()
+
     try:
 
-        # Parse defaults
-        logger.debug(f"Reading defaults file '{defaults_file}'...")
-        defaults = ConfigParser(
-            defaults_file,
-            log=True,
-            header="=== PARAMETER DEFAULT VALUES ===",
-        )
+        with phase("defaults", profiler, metrics):
 
-        # Validate defaults
-        if not ConfigParser.same_keys(
-            query=defaults.values,
-            ref=Defaults().to_dict()
-        ):
-            raise TypeError(
-                f"The provided defaults file '{defaults_file}' is corrupt."
+            # Parse defaults
+            logger.debug(f"Reading defaults file '{defaults_file}'...")
+            defaults = ConfigParser(
+                defaults_file,
+                log=True,
+                header="=== PARAMETER DEFAULT VALUES ===",
             )
 
-        # Parse config
-        if not config_files:
-            logger.debug(
-                "Config parsing skipped because option '--no-config' supplied."
-            )
-            params = ConfigParser(
-                log=True,
-                header="=== USER-DEFINED PARAMETER VALUES ===",
+            # Validate defaults
+            if not ConfigParser.same_keys(
+                query=defaults.values,
+                ref=Defaults().as_mapping()
+            ):
+                raise TypeError(
+                    f"The provided defaults file '{defaults_file}' is "
+                    "corrupt."
+                )
+
+        with phase("config", profiler, metrics):
+
+            # Parse config
+            if not config_files:
+                logger.debug(
+                    "Config parsing skipped because option '--no-config' "
+                    "supplied."
+                )
+                params = ConfigParser(
+                    log=True,
+                    header="=== USER-DEFINED PARAMETER VALUES ===",
+                )
+            else:
+                logger.debug(f"Reading config files {config_files}...")
+                params = ConfigParser(
+                    *config_files,
+                    log=True,
+                    header="=== LOADED CONFIG PARAMETERS ===",
+                )
+
+        with phase("params", profiler, metrics):
+
+            # Get missing parameters
+            params = GetParams(
+                defaults=defaults.values,
+                params=params.values,
+                interactive=interactive,
             )
-        else:
             logger.debug(f"Reading config files {config_files}...")
-            params = ConfigParser(
-                *config_files,
-                log=True,
-                header="=== LOADED CONFIG PARAMETERS ===",
+            ConfigParser.log_yaml(
+                header="=== COMPLETE CONFIG PARAMETERS ===",
+                **params.params,
             )
 
-        # Get missing parameters
-        params = GetParams(
-            defaults=defaults.values,
-            params=params.values,
-        )
-        logger.debug(f"Reading config files {config_files}...")
-        ConfigParser.log_yaml(
-            header="=== COMPLETE CONFIG PARAMETERS ===",
-            **params.params,
-        )
+        # Write plan instead of project
+        if plan:
+            with phase("plan", profiler, metrics):
+                project = Project(params.params)
+                print(json.dumps(
+                    {
+                        'params': params.params,
+                        'template': project.plan_template(
+                            template_dir=template_dir,
+                        ),
+                    },
+                    indent=2,
+                ))
+            logger.info("Program finished after writing plan.")
+            sys.exit(0)
+
+        # Log generation of project to its own log file
+        if project_log_dir is not None:
+            os.makedirs(project_log_dir, exist_ok=True)
+            project_log.enter_context(logs.project_log(os.path.join(
+                project_log_dir,
+                f"{params.params['project']['slug']}.log",
+            )))
+
+        with phase("user_config", profiler, metrics):
+
+            # Save parameters in user config
+            user_config = {
+                'org': params.params['org'],
+                'user': params.params['user'],
+                'soft': params.params['soft'],
+            }
+            user_config_file = resources.user_config_file()
+            ConfigParser.dict_to_yaml(
+                d=user_config,
+                yaml_file=user_config_file,
+            )
 
-        # Save parameters in user config
-        user_config = {
-            'org': params.params['org'],
-            'user': params.params['user'],
-            'soft': params.params['soft'],
-        }
-        user_config_file = os.path.join(
-            os.path.dirname(__file__),
-            os.pardir,
-            "config",
-            "user_config.yaml",
-        )
-        ConfigParser.dict_to_yaml(
-            d=user_config,
-            yaml_file=user_config_file,
-        )
+        with phase("prepare", profiler, metrics):
 
-        # Set up project
-        project = Project(params.params)
-        try:
-            project.prepare_template()
-        except Exception:
-            logger.error(
-                "An error occured during the creation of the project "
-                f"template. The template directory '{project.temp_dir}' "
-                "will be removed."
+            # Set up project
+            project = Project(params.params)
+            cache = (
+                None if result_cache is None
+                else ResultCache(cache_dir=result_cache)
             )
             try:
-                # project.clean_up()
-                logger.warning("Re-activate cleanup and remove this warning.")
+                project.prepare_template(
+                    template_dir=template_dir,
+                    cache_dir=cache_dir,
+                    cache=cache,
+                )
             except Exception:
                 logger.error(
-                    "An error occured during cleanup of the project. Please "
-                    "manually remove the template directory."
+                    "An error occured during the creation of the project "
+                    f"template. The template directory '{project.temp_dir}' "
+                    "will be removed."
                 )
+                try:
+                    # project.clean_up()
+                    logger.warning(
+                        "Re-activate cleanup and remove this warning."
+                    )
+                except Exception:
+                    logger.error(
+                        "An error occured during cleanup of the project. "
+                        "Please manually remove the template directory."
+                    )
+                    raise
                 raise
-            raise
 
-        # Render project
-        try:
-            project.render_project()
-        except FileExistsError:
+        with phase("render", profiler, metrics):
+
+            # Render project
             try:
-                logger.error(
-                    "An error occured during the creation of the project "
-                    f"template. The template directory '{project.temp_dir}' "
-                    "will be removed."
+                project.render_project(
+                    store=(
+                        None if dedup_root is None
+                        else OutputStore(
+                            root_dir=dedup_root,
+                            method=dedup_method,
+                        )
+                    ),
+                    cache=cache,
                 )
-                # project.clean_up()
-                logger.warning("Re-activate cleanup and remove this warning.")
+            except FileExistsError:
+                try:
+                    logger.error(
+                        "An error occured during the creation of the project "
+                        "template. The template directory "
+                        f"'{project.temp_dir}' will be removed."
+                    )
+                    # project.clean_up()
+                    logger.warning(
+                        "Re-activate cleanup and remove this warning."
+                    )
+                except Exception:
+                    logger.error(
+                        "An error occured during cleanup of the project. "
+                        "Please manually remove the template and project "
+                        "directories."
+                    )
+                    raise
+                raise
             except Exception:
                 logger.error(
-                    "An error occured during cleanup of the project. Please "
-                    "manually remove the template and project directories."
+                    "An error occured during rendering of the project. "
+                    f"The template directory '{project.temp_dir}' and the "
+                    f"project directory '{project.project_dir} will be "
+                    "removed."
                 )
+                try:
+                    # project.clean_up(include_project_dir=True)
+                    logger.warning(
+                        "Re-activate cleanup and remove this warning."
+                    )
+                except Exception:
+                    logger.error(
+                        "An error occured during cleanup of the project. "
+                        "Please manually remove the template and project "
+                        "directories."
+                    )
+                    raise
                 raise
-            raise
-        except Exception:
-            logger.error(
-                "An error occured during rendering of the project. "
-                f"The template directory '{project.temp_dir}' and the "
-                f"project directory '{project.project_dir} will be "
-                "removed."
-            )
+
+        with phase("cleanup", profiler, metrics):
+
+            # Clean up
             try:
-                # project.clean_up(include_project_dir=True)
+                # project.clean_up()
                 logger.warning("Re-activate cleanup and remove this warning.")
             except Exception:
                 logger.error(
@@ -326,18 +654,6 @@ def main(
                     "manually remove the template and project directories."
                 )
                 raise
-            raise
-
-        # Clean up
-        try:
-            # project.clean_up()
-            logger.warning("Re-activate cleanup and remove this warning.")
-        except Exception:
-            logger.error(
-                "An error occured during cleanup of the project. Please "
-                "manually remove the template and project directories."
-            )
-            raise
 
     except Exception:
         logger.exception("Program finished with non-zero exit status.")
@@ -345,17 +661,116 @@ def main(
     else:
         logger.info("Program finished.")
         sys.exit(0)
+    finally:
+        project_log.close()
+        # Failing to write reports must not change the exit status
+        try:
+            profiler.write_collapsed()
+        except OSError as e:
+            logger.error(f"Could not write collapsed stacks: {e}")
+        if metrics_file is not None:
+            try:
+                metrics.write(path=metrics_file)
+            except OSError as e:
+                logger.error(f"Could not write metrics: {e}")
 
 
-if __name__ == "__main__":
-    args = parse_cli_args(sys.argv[1:])
+def pack_templates(
+    output: str,
+    template_dir: Optional[str] = None,
+) -> None:
+    """Build a template pack.
+
+    :param output: path of the template pack to write.
+    :param template_dir: template directory to pack; defaults to the
+            packaged templates.
+
+    :returns: None
+    """
+    from myproj import resources
+    from myproj.pack import TemplatePack
+
+    try:
+        TemplatePack.build(
+            template_dir=(
+                resources.data('templates') if template_dir is None
+                else template_dir
+            ),
+            output=output,
+        )
+    except Exception:
+        logger.exception("Program finished with non-zero exit status.")
+        sys.exit(1)
+    logger.info(f"Template pack written to '{output}'.")
+    sys.exit(0)
+
+
+def verify(project_dir: str) -> None:
+    """Check a generated project against its integrity manifest.
+
+    :param project_dir: root directory of the generated project.
+
+    :returns: None
+    """
+    from myproj import manifest
+
+    try:
+        problems = manifest.verify(project_dir=project_dir)
+    except Exception:
+        logger.exception("Program finished with non-zero exit status.")
+        sys.exit(1)
+    for problem in problems:
+        print(problem)
+    if problems:
+        logger.error(
+            f"Project '{project_dir}' does not match its manifest: "
+            f"{len(problems)} problem(s)."
+        )
+        sys.exit(1)
+    logger.info(f"Project '{project_dir}' matches its manifest.")
+    sys.exit(0)
+
+
+def run(args: Optional[Sequence[str]] = None) -> None:
+    """Parse CLI arguments, set up logging and create project.
+
+    Entry point for the command line and for zipapp distributions.
+
+    :param args: iterable containing command line parameters and arguments;
+            defaults to the arguments the program was called with.
+
+    :returns: None
+    """
+    args_parsed = parse_cli_args(sys.argv[1:] if args is None else args)
     setup_logging(
         logger=logger,
-        verbose=args.verbose,
-        debug=args.debug,
+        verbose=args_parsed.verbose,
+        debug=args_parsed.debug,
+        log_file=args_parsed.log_file,
     )
     logger.info("Program started.")
+    if args_parsed.command == "pack-templates":
+        pack_templates(
+            output=args_parsed.output,
+            template_dir=args_parsed.template_dir,
+        )
+    if args_parsed.command == "verify":
+        verify(project_dir=args_parsed.project_dir)
     main(
-        defaults_file=args.defaults,
-        config_files=args.config,
+        defaults_file=args_parsed.defaults,
+        config_files=args_parsed.config,
+        profile_dir=args_parsed.profile,
+        metrics_file=args_parsed.metrics,
+        plan=args_parsed.plan,
+        template_dir=args_parsed.templates,
+        cache_dir=args_parsed.cache_dir,
+        interactive=False if args_parsed.no_input else None,
+        dedup_root=args_parsed.dedup_root,
+        dedup_method=args_parsed.dedup_method,
+        result_cache=args_parsed.result_cache,
+        project_log_dir=args_parsed.project_log_dir,
     )
+
+
+if __name__ == "__main__":
+    run()
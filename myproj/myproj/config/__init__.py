@@ -14,6 +14,8 @@ from typing import (Any, Dict, Iterable, Mapping, Optional)
 import addict
 import yaml
 
+from myproj import metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -133,6 +135,7 @@ class ConfigParser:
                     data=d,
                     stream=fh,
                 )
+                metrics.count("bytes_written", fh.tell())
         except yaml.representer.RepresenterError:
             logger.exception("Object could not be represented as YAML.")
             raise
@@ -0,0 +1,250 @@
+"""
+Deduplication of identical output files across projects.
+
+When many projects are generated below a common output root, most of their
+files (e.g., licenses, '.gitignore') are byte-identical. An `OutputStore`
+keeps one copy of each distinct file in a content-addressed object directory
+below the root and makes project files reflinks (copy-on-write clones) of
+it, so that they share data on disk but writing to one project's file leaves
+all others untouched. Where the file system does not support reflinks,
+files are written as usual, unless hard links are requested explicitly:
+hard linked project files share one read-only inode, so they save space on
+any file system, but cannot be edited in place (see `HARDLINK`). Which
+method is used is decided once per store; see `supports_reflink()`.
+"""
+import errno
+import functools
+import hashlib
+import logging
+import os
+import tempfile
+from typing import (BinaryIO, Callable, Optional, Union)
+
+from myproj import (metrics, streams)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover; not available on Windows
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Name of object directory below output root
+OBJECTS_DIR = ".myproj-objects"
+
+# Linux ioctl request cloning a file ('FICLONE')
+FICLONE = 0x40049409
+
+# Link methods: clone files, falling back to copying them if cloning fails
+REFLINK = "reflink"
+# Hard link files to read-only objects; never chosen automatically, as
+# editing a project file in place would fail (or, once its permissions are
+# changed, edit the files of all projects sharing it)
+HARDLINK = "hardlink"
+# Copy files
+COPY = "copy"
+METHODS = (REFLINK, HARDLINK, COPY)
+
+
+def reflink(src: str, dst: str) -> bool:
+    """Clone a file without copying its data, if supported.
+
+    :param src: path to source file.
+    :param dst: path to destination file; must not exist.
+
+    :returns: whether the file was cloned
+    """
+    if fcntl is None:
+        return False
+    fd_src = os.open(src, os.O_RDONLY)
+    try:
+        fd_dst = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            fcntl.ioctl(fd_dst, FICLONE, fd_src)
+        except OSError:
+            os.close(fd_dst)
+            fd_dst = -1
+            os.remove(dst)
+            return False
+        finally:
+            if fd_dst >= 0:
+                os.close(fd_dst)
+    finally:
+        os.close(fd_src)
+    return True
+
+
+def supports_reflink(directory: str) -> bool:
+    """Check whether files in a directory can be cloned, by cloning a
+    scratch file.
+
+    :param directory: existing, writable directory.
+
+    :returns: bool
+    """
+    fd, src = tempfile.mkstemp(dir=directory)
+    dst = f"{src}.clone"
+    try:
+        os.close(fd)
+        return reflink(src, dst)
+    finally:
+        for path in (src, dst):
+            if os.path.lexists(path):
+                os.remove(path)
+
+
+def link(src: str, dst: str, method: str = REFLINK) -> str:
+    """Make a file with the contents of another file, sharing its data
+    where possible.
+
+    :param src: path to source file.
+    :param dst: path to destination file; must not exist.
+    :param method: link method, one of `METHODS`. With `REFLINK`, the file
+            is copied if it cannot be cloned, so that the destination is
+            always an independent, writable file; with `HARDLINK`, it shares
+            the inode, and thus the permissions, of the source file.
+
+    :returns: link method used
+    :raises: FileExistsError, ValueError
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown link method '{method}'.")
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst)
+    if method == HARDLINK:
+        os.link(src, dst)
+        return HARDLINK
+    if method == REFLINK:
+        if reflink(src, dst):
+            return REFLINK
+        logger.debug(f"Could not clone '{src}'; copying it instead.")
+    with open(dst, 'xb') as fh:
+        metrics.count("bytes_written", streams.copy_file(src=src, fdst=fh))
+    return COPY
+
+
+class OutputStore:
+    """Content-addressed store of output files below an output root."""
+
+    def __init__(
+        self,
+        root_dir: str,
+        method: Optional[str] = None,
+    ) -> None:
+        """Class constructor.
+
+        :param root_dir: output root; all files written through the store
+                need to be located on the same file system.
+        :param method: link method to use, one of `METHODS`; if `None`,
+                `REFLINK` is used if the file system supports it, and
+                `COPY` otherwise. With `COPY`, files are written directly
+                and nothing is stored.
+
+        :returns: None
+        :raises: ValueError
+        """
+        if method not in (None, *METHODS):
+            raise ValueError(f"Unknown link method '{method}'.")
+        self.root_dir = root_dir
+        self.objects_dir = os.path.join(root_dir, OBJECTS_DIR)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        if method is None:
+            method = (
+                REFLINK if supports_reflink(self.objects_dir) else COPY
+            )
+            logger.debug(f"Deduplicating output files by '{method}'.")
+        self.method = method
+
+    def object_path(self, digest: str) -> str:
+        """Return path of the object with a given content hash.
+
+        :param digest: hexadecimal SHA-256 digest of file contents.
+
+        :returns: str
+        """
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def write(self, path: str, contents: Union[str, bytes]) -> bool:
+        """Write file, sharing its contents with identical files.
+
+        :param path: path to destination file; must not exist.
+        :param contents: contents to write; strings are encoded as UTF-8.
+
+        :returns: whether the contents were already stored
+        :raises: FileExistsError
+        """
+        data = contents.encode() if isinstance(contents, str) else contents
+        return self.store(
+            digest=hashlib.sha256(data).hexdigest(),
+            path=path,
+            write=lambda fh: fh.write(data),
+        )
+
+    def copy(self, src: str, path: str) -> bool:
+        """Copy file, sharing its contents with identical files.
+
+        The file is hashed in chunks and, unless already stored, copied by
+        the kernel (see '.streams'), so that its contents are never read
+        into memory as a whole.
+
+        :param src: path to source file.
+        :param path: path to destination file; must not exist.
+
+        :returns: whether the contents were already stored
+        :raises: FileExistsError
+        """
+        with open(src, 'rb') as fh:
+            digest = streams.sha256(fh)
+        return self.store(
+            digest=digest,
+            path=path,
+            write=functools.partial(streams.copy_file, src),
+        )
+
+    def store(
+        self,
+        digest: str,
+        path: str,
+        write: Callable[[BinaryIO], int],
+    ) -> bool:
+        """Make a file with stored contents, storing them first if needed.
+
+        :param digest: hexadecimal SHA-256 digest of file contents.
+        :param path: path to destination file; must not exist.
+        :param write: function writing the contents to an open file and
+                returning the number of bytes written; only called if the
+                contents are not stored yet or cannot be shared.
+
+        :returns: whether the contents were already stored
+        :raises: FileExistsError
+        """
+        if self.method == COPY:
+            # Without reflinks, storing contents would not save any space
+            with open(path, 'xb') as fh:
+                metrics.count("bytes_written", write(fh))
+            return False
+        obj = self.object_path(digest)
+        stored = os.path.exists(obj)
+        if not stored:
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.objects_dir)
+            with os.fdopen(fd, 'wb') as fh:
+                size = write(fh)
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, obj)
+            metrics.count("bytes_written", size)
+        else:
+            metrics.count("files_deduplicated")
+        self.link(obj, path)
+        return stored
+
+    def link(self, obj: str, path: str) -> None:
+        """Make a file with the contents of a stored object.
+
+        :param obj: path to object.
+        :param path: path to destination file; must not exist.
+
+        :returns: None
+        :raises: FileExistsError
+        """
+        link(src=obj, dst=path, method=self.method)
@@ -0,0 +1,305 @@
+"""
+Non-blocking, queue-based logging.
+
+Records are put on a queue by a `logging.handlers.QueueHandler` attached to
+the configured logger and written by a single `logging.handlers.QueueListener`
+thread, so that logging calls never wait on STDERR or log files. Setup is
+idempotent: repeated calls reconfigure the existing handler and listener
+instead of adding new ones.
+
+For batches run in several processes, set up logging with
+`multiprocessing=True` in the parent process and call `setup_worker()` with
+the returned queue in each worker, e.g., as a pool initializer; records of
+all workers are then written by the parent's listener.
+
+Records logged while generating a given project can additionally be written
+to a log file of that project; see `project_log()`. They are routed to their
+file by a single handler of the listener, so that opening and closing project
+log files never interrupts the listener.
+"""
+import atexit
+import contextlib
+import contextvars
+import logging
+import logging.handlers
+import os
+import queue as queue_module
+import sys
+import threading
+from typing import (Any, Dict, Iterator, List, Optional)
+
+# Format of log records
+FORMAT = "[%(asctime)-15s: %(levelname)-8s @ %(funcName)s] %(message)s"
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue: Optional[Any] = None
+_multiprocessing = False
+_handlers: List[logging.Handler] = []
+
+# Log file of the project currently generated in this context
+_project_log: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "project_log",
+    default=None,
+)
+
+
+class StderrHandler(logging.StreamHandler):
+    """Handler writing to the current `sys.stderr`.
+
+    Unlike `logging.StreamHandler`, the stream is looked up on every record,
+    so that records are not written to streams that were replaced or closed
+    since setup.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(stream=sys.stderr)
+
+    @property  # type: ignore[override]
+    def stream(self) -> Any:
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value: Any) -> None:
+        pass
+
+
+class ProjectFilter(logging.Filter):
+    """Filter tagging records with the log file of the project they are
+    logged for, if any; see `project_log()`.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "project_log"):
+            record.project_log = _project_log.get()
+        return True
+
+
+class ProjectLogHandler(logging.Handler):
+    """Handler appending records to the log file of the project they are
+    logged for, as tagged by `ProjectFilter`.
+
+    Log files are kept open while any context logging to them is active
+    (see `project_log()`); records arriving for a log file after that, e.g.,
+    records queued just before a context ended, are appended by reopening
+    the file.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.setFormatter(logging.Formatter(FORMAT))
+        self.files: Dict[str, logging.FileHandler] = {}
+        self.users: Dict[str, int] = {}
+
+    def open_file(self, path: str) -> None:
+        """Keep a log file open, in addition to other users of it.
+
+        :param path: absolute path to log file.
+
+        :returns: None
+        """
+        self.acquire()
+        try:
+            if path not in self.files:
+                handler = logging.FileHandler(path, delay=True)
+                handler.setFormatter(self.formatter)
+                self.files[path] = handler
+                self.users[path] = 0
+            self.users[path] += 1
+        finally:
+            self.release()
+
+    def close_file(self, path: str) -> None:
+        """Close a log file once its last user is done with it.
+
+        :param path: absolute path to log file; see `open_file()`.
+
+        :returns: None
+        """
+        self.acquire()
+        try:
+            self.users[path] -= 1
+            if self.users[path]:
+                return
+            del self.users[path]
+            handler = self.files.pop(path)
+        finally:
+            self.release()
+        handler.close()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        path = getattr(record, "project_log", None)
+        if path is None:
+            return
+        handler = self.files.get(path)
+        if handler is not None:
+            handler.emit(record)
+            return
+        handler = logging.FileHandler(path)
+        handler.setFormatter(self.formatter)
+        try:
+            handler.emit(record)
+        finally:
+            handler.close()
+
+
+# Handler writing the log files of projects
+_project_handler = ProjectLogHandler()
+
+
+def _queue_handler(logger: logging.Logger) -> Optional[
+    logging.handlers.QueueHandler
+]:
+    for handler in logger.handlers:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            return handler
+    return None
+
+
+def _new_queue_handler(queue: Any) -> logging.handlers.QueueHandler:
+    handler = logging.handlers.QueueHandler(queue)
+    handler.addFilter(ProjectFilter())
+    return handler
+
+
+def _restart() -> None:
+    """Replace the listener by one writing to all current handlers.
+
+    Records queued before are written by the old listener.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    _listener = logging.handlers.QueueListener(
+        _queue,
+        *_handlers,
+        _project_handler,
+        respect_handler_level=True,
+    )
+    _listener.start()
+
+
+def setup(
+    logger: logging.Logger,
+    level: int = logging.WARNING,
+    log_file: Optional[str] = None,
+    multiprocessing: bool = False,
+) -> Any:
+    """Configure logger to log via a queue to STDERR and, optionally, a file.
+
+    :param logger: logger to configure.
+    :param level: log level of the logger.
+    :param log_file: if not `None`, records are also appended to this file.
+    :param multiprocessing: whether records of worker processes are to be
+            funnelled into the listener; see `setup_worker()`. If logging
+            was set up before in the other mode, a new queue is created, so
+            workers set up with the previous queue need to be set up again.
+
+    :returns: queue that records are put on; pass to `setup_worker()` in
+            worker processes
+    """
+    global _listener, _multiprocessing, _queue
+    with _lock:
+        if _queue is None:
+            atexit.register(shutdown)
+        if _queue is None or multiprocessing != _multiprocessing:
+            if _listener is not None:
+                _listener.stop()
+                _listener = None
+            if multiprocessing:
+                import multiprocessing as mp
+                _queue = mp.Queue()
+            else:
+                _queue = queue_module.SimpleQueue()
+            _multiprocessing = multiprocessing
+        formatter = logging.Formatter(FORMAT)
+        handlers: List[logging.Handler] = [StderrHandler()]
+        if log_file is not None:
+            handlers.append(logging.FileHandler(log_file, delay=True))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        previous = list(_handlers)
+        _handlers[:] = handlers
+        _restart()
+        for handler in previous:
+            handler.close()
+        logger.setLevel(level)
+        queue_handler = _queue_handler(logger)
+        if queue_handler is None:
+            logger.addHandler(_new_queue_handler(_queue))
+        else:
+            queue_handler.queue = _queue
+        return _queue
+
+
+@contextlib.contextmanager
+def project_log(path: str) -> Iterator[None]:
+    """Context manager additionally appending records logged for a project
+    to a log file of that project.
+
+    Records are logged for the project if they are logged within the context
+    or in calls submitted to '.pool' from within it, so that several projects
+    can be generated concurrently, each with its own log file. Contexts for
+    the same log file share it, so that each record is written to it once.
+    Records of worker processes (see `setup_worker()`) are not included.
+
+    :param path: log file of the project.
+
+    :returns: None
+    :raises: RuntimeError if logging is not set up; see `setup()`
+    """
+    path = os.path.abspath(path)
+    with _lock:
+        if _listener is None:
+            raise RuntimeError(
+                f"Cannot write project log file '{path}': logging is not "
+                "set up."
+            )
+    _project_handler.open_file(path)
+    token = _project_log.set(path)
+    try:
+        yield
+    finally:
+        _project_log.reset(token)
+        _project_handler.close_file(path)
+
+
+def setup_worker(
+    queue: Any,
+    logger: Optional[logging.Logger] = None,
+    level: int = logging.WARNING,
+) -> None:
+    """Configure logging in a worker process to use the parent's listener.
+
+    All other handlers of the logger are removed, so that records are only
+    written once.
+
+    :param queue: queue returned by `setup()` in the parent process.
+    :param logger: logger to configure; defaults to the root logger.
+    :param level: log level of the logger; should match the level passed
+            to `setup()` in the parent process, as records of workers are not
+            filtered by the parent's logger.
+
+    :returns: None
+    """
+    logger = logging.getLogger() if logger is None else logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(_new_queue_handler(queue))
+    logger.setLevel(level)
+
+
+def shutdown() -> None:
+    """Write all queued records and stop the listener.
+
+    Logging can be set up again afterwards.
+
+    :returns: None
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        for handler in _handlers:
+            handler.close()
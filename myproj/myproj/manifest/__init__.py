@@ -0,0 +1,157 @@
+"""
+Integrity manifests of generated projects.
+
+Every generated project comes with a manifest listing the SHA-256 hash and
+the size of each of its files, for auditing and for later incremental
+updates. The manifest is written beside the project directory, as
+'<project directory>.manifest.json', so that the project itself only holds
+the rendered files (see `path()`).
+Hashes are computed while files are written (see '.render.render_tree()'),
+so that generated files are never read back. `verify()` checks a project
+tree against its manifest, hashing files in parallel.
+"""
+import json
+import logging
+import os
+from typing import (Dict, List, Mapping, Optional)
+
+from myproj import (pool, streams)
+
+logger = logging.getLogger(__name__)
+
+# Suffix appended to the project directory to name its manifest file
+MANIFEST_SUFFIX = ".manifest.json"
+
+# Version of the manifest format
+VERSION = 1
+
+
+def path(project_dir: str) -> str:
+    """Return path to the manifest file of a project.
+
+    :param project_dir: project root.
+
+    :returns: str
+    """
+    return os.path.abspath(project_dir) + MANIFEST_SUFFIX
+
+
+def write(project_dir: str, files: Mapping[str, Mapping]) -> str:
+    """Write manifest of a project.
+
+    :param project_dir: project root.
+    :param files: manifest entries with keys 'sha256' and 'size', by
+            '/'-separated path relative to the project root.
+
+    :returns: path to manifest file
+    """
+    manifest_file = path(project_dir)
+    with open(manifest_file, 'w') as fh:
+        json.dump(
+            {
+                'version': VERSION,
+                'files': {
+                    name: {'sha256': entry['sha256'], 'size': entry['size']}
+                    for name, entry in sorted(files.items())
+                },
+            },
+            fh,
+            indent=2,
+        )
+    return manifest_file
+
+
+def load(project_dir: str) -> Dict[str, Dict]:
+    """Load manifest of a project.
+
+    :param project_dir: project root.
+
+    :returns: manifest entries by '/'-separated path
+    :raises: FileNotFoundError
+    :raises: ValueError if the manifest format is not supported
+    """
+    with open(path(project_dir)) as fh:
+        manifest = json.load(fh)
+    if manifest.get('version') != VERSION:
+        raise ValueError(
+            f"Unsupported manifest version '{manifest.get('version')}' in "
+            f"project '{project_dir}'."
+        )
+    return manifest['files']
+
+
+def files(project_dir: str) -> List[str]:
+    """List all files of a project tree.
+
+    :param project_dir: project root.
+
+    :returns: sorted list of '/'-separated paths
+    """
+    paths: List[str] = []
+    for dir_path, dir_names, file_names in os.walk(project_dir):
+        dir_names.sort()
+        rel = os.path.relpath(dir_path, project_dir)
+        for file_name in file_names:
+            name = file_name if rel == os.curdir else os.path.join(
+                rel, file_name
+            )
+            paths.append(name.replace(os.sep, '/'))
+    return sorted(paths)
+
+
+def check(path: str, entry: Mapping) -> Optional[str]:
+    """Check a file against its manifest entry.
+
+    Sizes are compared first, so that files are only hashed if their sizes
+    match.
+
+    :param path: path to file.
+    :param entry: manifest entry.
+
+    :returns: description of the mismatch, or `None` if the file matches
+    """
+    try:
+        with open(path, 'rb') as fh:
+            if os.fstat(fh.fileno()).st_size != entry['size']:
+                return "size mismatch"
+            if streams.sha256(fh) != entry['sha256']:
+                return "hash mismatch"
+    except FileNotFoundError:
+        return "missing"
+    return None
+
+
+def verify(project_dir: str) -> List[str]:
+    """Check a project tree against its manifest.
+
+    :param project_dir: project root.
+
+    :returns: sorted list of problems, as 'path: problem' strings; empty if
+            the tree matches its manifest
+    :raises: FileNotFoundError if the project has no manifest
+    :raises: ValueError if the manifest format is not supported
+    """
+    entries = load(project_dir)
+    names = sorted(entries)
+    results = pool.map_threads(
+        lambda name: check(
+            path=os.path.join(project_dir, *name.split('/')),
+            entry=entries[name],
+        ),
+        names,
+    )
+    problems = [
+        f"{name}: {problem}"
+        for name, problem in zip(names, results)
+        if problem is not None
+    ]
+    problems.extend(
+        f"{name}: not in manifest"
+        for name in files(project_dir)
+        if name not in entries
+    )
+    logger.debug(
+        f"Verified {len(names)} files of project '{project_dir}': "
+        f"{len(problems)} problem(s)."
+    )
+    return sorted(problems)
@@ -0,0 +1,177 @@
+"""
+Machine-readable timing and resource metrics of program runs.
+"""
+import collections
+import contextlib
+import json
+import logging
+import sys
+import threading
+import time
+from typing import (Dict, Iterator, Optional)
+
+try:
+    import resource
+except ImportError:  # pragma: no cover; not available on Windows
+    resource = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Process-wide event counters, incremented by instrumented code via 'count()'
+counters: collections.Counter = collections.Counter()
+_counters_lock = threading.Lock()
+
+# Counters reported for every phase
+COUNTERS = (
+    "files_copied",
+    "files_rendered",
+    "bytes_written",
+    "files_deduplicated",
+    "cache_hits",
+    "cache_misses",
+    "subprocesses",
+)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increment a process-wide event counter; thread-safe.
+
+    :param name: name of counter, usually one of `COUNTERS`.
+    :param n: increment.
+
+    :returns: None
+    """
+    with _counters_lock:
+        counters[name] += n
+
+
+def peak_rss() -> Optional[int]:
+    """Return peak resident set size of the current process in bytes.
+
+    :returns: int, or `None` if it cannot be determined on this platform
+    """
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return maxrss
+    return maxrss * 1024
+
+
+class PhaseMetrics:
+    """Records timing and resource metrics for each phase of a program run.
+
+    For every phase, wall time, CPU time, the peak resident set size (RSS)
+    of the process up to the end of the phase, how much the phase raised
+    that peak, and the increments of all `COUNTERS` during the phase are
+    recorded. As the operating system only reports the peak RSS over the
+    lifetime of the process, a phase that uses less memory than an earlier
+    one shows no increase. Metrics can be exported as a JSON document or in
+    the OpenMetrics text format.
+    """
+
+    def __init__(self) -> None:
+        """Class constructor.
+
+        :returns: None
+        """
+        self.phases: Dict[str, Dict] = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Context manager recording metrics for the enclosed code.
+
+        :param name: name of phase.
+
+        :returns: None
+        """
+        start_counters = {key: counters[key] for key in COUNTERS}
+        start_rss = peak_rss()
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            end_rss = peak_rss()
+            metrics = {
+                "wall_seconds": time.perf_counter() - start_wall,
+                "cpu_seconds": time.process_time() - start_cpu,
+                "process_peak_rss_bytes": end_rss,
+                "peak_rss_increase_bytes": (
+                    None if start_rss is None or end_rss is None
+                    else end_rss - start_rss
+                ),
+            }
+            for key in COUNTERS:
+                metrics[key] = counters[key] - start_counters[key]
+            self.phases[name] = metrics
+
+    def to_dict(self) -> Dict:
+        """Return metrics of all phases and their totals as dictionary.
+
+        :returns: dict
+        """
+        total: Dict = {
+            "wall_seconds": 0.0,
+            "cpu_seconds": 0.0,
+            "process_peak_rss_bytes": None,
+            "peak_rss_increase_bytes": None,
+        }
+        for key in COUNTERS:
+            total[key] = 0
+        for metrics in self.phases.values():
+            for key in total:
+                if metrics[key] is None:
+                    continue
+                if key == "process_peak_rss_bytes":
+                    total[key] = max(total[key] or 0, metrics[key])
+                else:
+                    total[key] = (total[key] or 0) + metrics[key]
+        return {
+            "phases": self.phases,
+            "total": total,
+        }
+
+    def to_openmetrics(self, prefix: str = "myproj") -> str:
+        """Return metrics of all phases in the OpenMetrics text format.
+
+        :param prefix: prefix of all metric names.
+
+        :returns: str
+        """
+        units = {
+            "wall_seconds": "seconds",
+            "cpu_seconds": "seconds",
+            "process_peak_rss_bytes": "bytes",
+            "peak_rss_increase_bytes": "bytes",
+        }
+        units.update({key: "" for key in COUNTERS})
+        lines = []
+        for key, unit in units.items():
+            name = f"{prefix}_phase_{key}"
+            lines.append(f"# TYPE {name} gauge")
+            if unit:
+                lines.append(f"# UNIT {name} {unit}")
+            for phase, metrics in self.phases.items():
+                if metrics[key] is not None:
+                    lines.append(f'{name}{{phase="{phase}"}} {metrics[key]}')
+        lines.append("# EOF")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str) -> None:
+        """Write metrics to file.
+
+        Metrics are written as JSON if the file name ends with '.json', in
+        the OpenMetrics text format otherwise.
+
+        :param path: path to output file.
+
+        :returns: None
+        """
+        with open(path, 'w') as fh:
+            if path.endswith(".json"):
+                json.dump(self.to_dict(), fh, indent=2)
+            else:
+                fh.write(self.to_openmetrics())
+        logger.debug(f"Metrics written to '{path}'.")
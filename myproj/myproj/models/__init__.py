@@ -2,7 +2,11 @@
 Model classes for representing nested data structures.
 """
 import enum
-from typing import Dict
+import threading
+from types import MappingProxyType
+from typing import (Dict, Mapping, Tuple)
+
+from myproj import schema
 
 
 class License(enum.Enum):
@@ -19,121 +23,126 @@ class YesNo(enum.Enum):
     yes = True
 
 
-class Linter(enum.Enum):
-    """Enumerator class for supported linters."""
-    black = "black"
-    flake8 = "flake8"
-    pylint = "pylint"
-    pyright = "pyright"
+# Guards construction of the per-class model instances
+_lock = threading.Lock()
+
+
+def freeze(d: Mapping) -> Mapping:
+    """Return a read-only view of a nested dictionary.
+
+    :param d: dictionary whose values are dictionaries, lists or scalars.
+
+    :returns: types.MappingProxyType
+    """
+    return MappingProxyType({
+        key: (
+            freeze(value) if isinstance(value, Mapping)
+            else tuple(value) if isinstance(value, list)
+            else value
+        )
+        for key, value in d.items()
+    })
 
 
-class TestSuite(enum.Enum):
-    """Enumerator class for supported test suites."""
-    pytest = "pytest"
+def thaw(d: Mapping) -> Dict:
+    """Return a mutable deep copy of a view created with 'freeze()'.
 
+    :param d: read-only view.
 
-class CI_CD(enum.Enum):
-    """Enumerator class for supported CI/CD engines."""
-    gitlab_docker = ".gitlab-ci.yml"
+    :returns: dict
+    """
+    return {
+        key: (
+            thaw(value) if isinstance(value, Mapping)
+            else list(value) if isinstance(value, tuple)
+            else value
+        )
+        for key, value in d.items()
+    }
 
 
 class Parameters:
-    """Collection of required fields for project config file or object."""
-    def __init__(self) -> None:
-        # Organization parameters
-        self.org: dict = dict()
-        self.org['name'] = ""
-        self.org['slug'] = ""
-        self.org['copyright_owner'] = ""
-        self.org['git_host'] = ""
-        self.org['docker_host'] = ""
-        # User parameters
-        self.user: dict = dict()
-        self.user['name'] = ""
-        self.user['slug'] = ""
-        self.user['email'] = ""
-        self.user['affiliation'] = ""
-        self.user['url'] = ""
-        # Project parameters
-        self.project: dict = dict()
-        self.project['name'] = ""
-        self.project['slug'] = ""
-        self.project['path'] = ""
-        self.project['synopsis'] = ""
-        self.project['version'] = ""
-        self.project['tags'] = ""
-        self.project['license'] = ""
-        self.project['copyright_year'] = ""
-        self.project['original_author'] = ""
-        self.project['git_repo'] = ""
-        self.project['docker_image_name'] = ""
-        # Files and software parameters
-        self.soft: dict = dict()
-        self.soft['python_version'] = ""
-        self.soft['docs'] = ""
-        self.soft['docker'] = ""
-        self.soft['packaging'] = ""
-        self.soft['cli_script'] = ""
-        self.soft['linter'] = ""
-        self.soft['testing'] = ""
-        self.soft['ci_cd'] = ""
-        self.soft['auto_version_bump'] = ""
+    """Collection of required fields for project config file or object.
+
+    Instances are immutable and built only once per process; calling the
+    class returns the same instance every time, which can be shared freely,
+    including between threads. Each section (e.g., `org`) is a read-only
+    mapping of field names to their empty values.
+    """
+    __slots__ = ("org", "user", "project", "soft", "_view")
+
+    # Field names by section
+    fields: Mapping[str, Tuple[str, ...]] = schema.SECTIONS
+
+    _instances: Dict[type, "Parameters"] = {}
+
+    def __new__(cls) -> "Parameters":
+        instance = cls._instances.get(cls)
+        if instance is None:
+            with _lock:
+                instance = cls._instances.get(cls)
+                if instance is None:
+                    instance = super().__new__(cls)
+                    view = freeze({
+                        section: {
+                            key: cls.field_value(section=section, key=key)
+                            for key in keys
+                        }
+                        for section, keys in cls.fields.items()
+                    })
+                    for section, values in view.items():
+                        object.__setattr__(instance, section, values)
+                    object.__setattr__(instance, "_view", view)
+                    cls._instances[cls] = instance
+        return instance
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"'{type(self).__name__}' object is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"'{type(self).__name__}' object is read-only")
+
+    @classmethod
+    def field_value(cls, section: str, key: str) -> object:
+        """Return the empty value of a field.
+
+        :param section: name of section, e.g., 'org'.
+        :param key: name of field in section.
+
+        :returns: object
+        """
+        return ""
+
+    def as_mapping(self) -> Mapping:
+        """Return read-only view of all sections.
+
+        :returns: types.MappingProxyType
+        """
+        return self._view
 
     def to_dict(self) -> Dict:
-        """Return instance attributes as dictionary."""
-        _excluded_keys = set(Parameters.__dict__.keys())
-        return dict(
-            (key, value) for (key, value) in self.__dict__.items()
-            if key not in _excluded_keys
-        )
+        """Return instance attributes as (mutable) dictionary.
+
+        :returns: dict
+        """
+        return thaw(self._view)
 
 
 class Defaults(Parameters):
-    """Collection of required fields for project defaults file or object."""
-    def __init__(self) -> None:
-        Parameters.__init__(self)
-        regular_dict = {
-            "value": "",
-            "description": "",
-        }
-        choice_dict = {
-            "value": "",
-            "choices": [],
-            "multiple": False,
-            "alternative": "",
-            "description": "",
-        }
-        # Organization parameters
-        self.org['name'] = regular_dict
-        self.org['slug'] = regular_dict
-        self.org['copyright_owner'] = regular_dict
-        self.org['git_host'] = regular_dict
-        self.org['docker_host'] = regular_dict
-        # User parameters
-        self.user['name'] = regular_dict
-        self.user['slug'] = regular_dict
-        self.user['email'] = regular_dict
-        self.user['affiliation'] = regular_dict
-        self.user['url'] = regular_dict
-        # Project parameters
-        self.project['name'] = regular_dict
-        self.project['slug'] = regular_dict
-        self.project['path'] = regular_dict
-        self.project['synopsis'] = regular_dict
-        self.project['version'] = regular_dict
-        self.project['tags'] = regular_dict
-        self.project['license'] = choice_dict
-        self.project['copyright_year'] = regular_dict
-        self.project['original_author'] = regular_dict
-        self.project['git_repo'] = regular_dict
-        self.project['docker_image_name'] = regular_dict
-        # Files and software parameters
-        self.soft['python_version'] = regular_dict
-        self.soft['docs'] = choice_dict
-        self.soft['docker'] = choice_dict
-        self.soft['packaging'] = choice_dict
-        self.soft['cli_script'] = choice_dict
-        self.soft['linter'] = choice_dict
-        self.soft['testing'] = choice_dict
-        self.soft['ci_cd'] = choice_dict
-        self.soft['auto_version_bump'] = choice_dict
+    """Collection of required fields for project defaults file or object.
+
+    Each field holds its entry in the defaults file, as declared in
+    '.schema'.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def field_value(cls, section: str, key: str) -> Dict:
+        """Return the defaults file entry of a field.
+
+        :param section: name of section, e.g., 'org'.
+        :param key: name of field in section.
+
+        :returns: dict
+        """
+        return schema.FIELDS[f"{section}.{key}"].to_defaults()
@@ -0,0 +1,274 @@
+"""
+Single-file template packs.
+
+A template pack bundles all files of a template directory in a single file,
+so that templates can be read with a single open and a single memory map,
+instead of one file system access per template file. The layout is:
+
+    MAGIC (8 bytes) | header length (8 bytes, little-endian) | header | data
+
+The header is a UTF-8 encoded JSON document indexing the data section by
+'/'-separated file path, with the offset (relative to the start of the data
+section), size and SHA-256 hash of each file.
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import pathlib
+import shutil
+import struct
+from types import TracebackType
+from typing import (Dict, Iterator, List, Optional, Tuple, Type, Union)
+
+from myproj import (metrics, streams)
+from myproj.resources import Traversable
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MYPROJPK"
+VERSION = 1
+SUFFIX = ".mptpk"
+_PREAMBLE = struct.Struct("<8sQ")
+
+
+class TemplatePack:
+    """Read-only, memory-mapped template pack."""
+
+    def __init__(self, path: str) -> None:
+        """Class constructor.
+
+        :param path: path to template pack.
+
+        :returns: None
+        :raises: ValueError
+        """
+        self.path = path
+        self._fh = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(
+                self._fh.fileno(),
+                0,
+                access=mmap.ACCESS_READ,
+            )
+            magic, header_size = _PREAMBLE.unpack_from(self._mmap, 0)
+            if magic != MAGIC:
+                raise ValueError(f"File '{path}' is not a template pack.")
+            header_start = _PREAMBLE.size
+            header = json.loads(
+                self._mmap[header_start:header_start + header_size]
+            )
+            if header['version'] != VERSION:
+                raise ValueError(
+                    f"Unsupported template pack version "
+                    f"'{header['version']}' in file '{path}'."
+                )
+        except Exception:
+            self.close()
+            raise
+        self._data_start = header_start + header_size
+        self.index: Dict[str, Dict] = {
+            entry['path']: entry for entry in header['files']
+        }
+
+    def __enter__(self) -> "TemplatePack":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def close(self) -> None:
+        """Release memory map and file handle.
+
+        :returns: None
+        """
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._fh.close()
+
+    def view(self, name: str) -> memoryview:
+        """Return contents of a file without copying them.
+
+        The returned view is only valid until the pack is closed.
+
+        :param name: '/'-separated path of file in pack.
+
+        :returns: memoryview
+        :raises: KeyError
+        """
+        entry = self.index[name]
+        start = self._data_start + entry['offset']
+        return memoryview(self._mmap)[start:start + entry['size']]
+
+    def read(self, name: str, verify: bool = False) -> bytes:
+        """Return contents of a file.
+
+        :param name: '/'-separated path of file in pack.
+        :param verify: whether to check the contents against the hash
+                recorded in the index.
+
+        :returns: bytes
+        :raises: KeyError
+        :raises: ValueError
+        """
+        entry = self.index[name]
+        start = self._data_start + entry['offset']
+        contents = self._mmap[start:start + entry['size']]
+        if verify and (
+            hashlib.sha256(contents).hexdigest() != entry['sha256']
+        ):
+            raise ValueError(
+                f"Hash mismatch for file '{name}' in template pack "
+                f"'{self.path}'."
+            )
+        return contents
+
+    def chunks(
+        self,
+        name: str,
+        size: int = streams.CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """Iterate over the contents of a file in chunks.
+
+        :param name: '/'-separated path of file in pack.
+        :param size: maximum size of chunks.
+
+        :returns: iterator over bytes
+        :raises: KeyError
+        """
+        view = self.view(name)
+        try:
+            for start in range(0, len(view), size):
+                yield bytes(view[start:start + size])
+        finally:
+            view.release()
+
+    def extract(self, name: str, dst: str) -> str:
+        """Write a file from the pack to the file system.
+
+        The file is copied by the kernel, without reading its contents into
+        memory; see '.streams'.
+
+        :param name: '/'-separated path of file in pack.
+        :param dst: destination path; if a directory, the file is written
+                to it under its base name.
+
+        :returns: path to written file
+        :raises: KeyError
+        """
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, name.rsplit('/', 1)[-1])
+        entry = self.index[name]
+        with open(dst, 'wb') as fh:
+            streams.copy_range(
+                fd_src=self._fh.fileno(),
+                fd_dst=fh.fileno(),
+                count=entry['size'],
+                offset=self._data_start + entry['offset'],
+            )
+        mode = self.index[name].get('mode')
+        if mode is not None:
+            os.chmod(dst, mode)
+        metrics.count("files_copied")
+        metrics.count("bytes_written", self.index[name]['size'])
+        return dst
+
+    @staticmethod
+    def files(
+        template_dir: Union[str, Traversable],
+    ) -> List[Tuple[str, Traversable]]:
+        """List all files in a template directory.
+
+        :param template_dir: template directory.
+
+        :returns: list of '/'-separated paths relative to the template
+                directory and the corresponding files, sorted by path
+        """
+        if isinstance(template_dir, str):
+            template_dir = pathlib.Path(template_dir)
+        files: List[Tuple[str, Traversable]] = []
+
+        def walk(directory: Traversable, prefix: str) -> None:
+            for item in directory.iterdir():
+                if item.is_dir():
+                    walk(item, f"{prefix}{item.name}/")
+                elif item.is_file():
+                    files.append((f"{prefix}{item.name}", item))
+
+        walk(template_dir, "")
+        return sorted(files, key=lambda item: item[0])
+
+    @staticmethod
+    def build(
+        template_dir: Union[str, Traversable],
+        output: str,
+    ) -> str:
+        """Build template pack from a template directory.
+
+        :param template_dir: template directory.
+        :param output: path to output template pack.
+
+        :returns: path to output template pack
+        """
+        entries = []
+        items = TemplatePack.files(template_dir)
+        offset = 0
+        for name, item in items:
+            with item.open('rb') as fh:
+                digest = streams.sha256(fh)
+                size = fh.tell()
+            entry = {
+                'path': name,
+                'offset': offset,
+                'size': size,
+                'sha256': digest,
+            }
+            if isinstance(item, pathlib.Path):
+                entry['mode'] = item.stat().st_mode & 0o777
+            entries.append(entry)
+            offset += size
+        header = json.dumps(
+            {'version': VERSION, 'files': entries},
+            separators=(',', ':'),
+        ).encode()
+        with open(output, 'wb') as fh:
+            fh.write(_PREAMBLE.pack(MAGIC, len(header)))
+            fh.write(header)
+            for _, item in items:
+                if isinstance(item, pathlib.Path):
+                    streams.copy_file(src=str(item), fdst=fh)
+                    fh.seek(0, os.SEEK_END)
+                else:
+                    with item.open('rb') as fsrc:
+                        shutil.copyfileobj(fsrc, fh)
+        logger.debug(
+            f"Template pack with {len(entries)} files written to '{output}'."
+        )
+        return output
+
+    @staticmethod
+    def is_pack(path: str) -> bool:
+        """Return whether a file is a template pack.
+
+        :param path: path to file.
+
+        :returns: bool
+        """
+        try:
+            with open(path, 'rb') as fh:
+                return fh.read(len(MAGIC)) == MAGIC
+        except (IsADirectoryError, FileNotFoundError, PermissionError):
+            return False
@@ -3,12 +3,11 @@ Classes for dealing with project parameters.
 """
 import collections.abc
 import copy
-from datetime import date
+import functools
 import logging
-import os
-import string
-import sys
-from typing import (Dict, List, Mapping)
+from typing import (Dict, FrozenSet, List, Mapping, Optional)
+
+from myproj import (plugins, schema, utils)
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +18,7 @@ class GetParams:
         self,
         defaults: Mapping,
         params: Dict = {},
+        interactive: bool = True,
     ) -> None:
         """
         :param defaults: dictionary of suggested default values when asking
@@ -27,347 +27,139 @@ class GetParams:
                 '.models.Defaults'
         :param params: dictionary of configuration values; must conform to
                 model in '.models.Parameters'
+        :param interactive: whether the user may be queried for missing
+                parameters; if `False`, parameters are only taken from
+                `params` or inferred, see `get_params()`.
 
         :returns: None
+        :raises: ValueError if not `interactive` and parameters are missing
         """
         self.params = params
         self.defaults = defaults
+        self.interactive = interactive
         self.get_params()
 
     def get_params(self, retries: int = 5) -> None:
         """Get missing parameters from user.
 
+        Parameters are collected in the order of '.schema.SCHEMA'; where the
+        schema declares an inference rule, the suggested default is inferred
+        from the parameters collected before. The environment lookups that
+        inference rules depend on (see '.schema.Probes') are performed in a
+        background thread while the user answers the first questions. Values
+        of parameters that allow multiple choices are normalized to lists.
+        Features installed as plugins (see '.plugins') are offered in
+        addition to the choices in the defaults. Descriptions of parameters
+        are taken from the defaults if given there, and otherwise from the
+        description catalog, which is only loaded once the user is first
+        queried; see `descriptions()`. If a default cannot be inferred, the
+        parameter has no default, and the user needs to enter a value. The
+        defaults are not modified.
+
+        If the instance is not interactive, the user is never queried.
+        Instead, missing parameters are inferred, and an error listing all
+        parameters that could neither be found nor inferred is raised.
+
         :param retries: use default value after user has entered n invalid
                 inputs. Set to negative value to keep asking the user
                 infinitely as long as the input remains invalid.
 
         :returns: None
+        :raises: ValueError if not interactive and parameters are missing,
+                or if no value is entered for a parameter without default
         :raises: re-raises TypeError and KeyboardInterrupt from query_user()
         """
-        # Organization params
-        d = self.defaults['org']
-        if "org" not in self.params:
-            self.params['org'] = {}
-        p = self.params['org']
-
-        k = "name"
-        if k not in p:
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "slug"
-        if k not in p:
-            d[k]['value'] = GetParams.slugify(s=p['name'])
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "copyright_owner"
-        if k not in p:
-            d[k]['value'] = p['name']
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "git_host"
-        if k not in p:
-            d[k]['value'] = "https://github.com/" + p['slug']
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "docker_host"
-        if k not in p:
-            d[k]['value'] = "registry.hub.docker.com/" + GetParams.slugify(
-                s=p['name'],
-                whitespace_replace="",
-            )
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        # User params
-        d = self.defaults['user']
-        if "user" not in self.params:
-            self.params['user'] = {}
-        p = self.params['user']
-
-        k = "name"
-        if k not in p:
-            try:
-                d[k]['value'] = os.popen(
-                    'git config --get user.name'
-                ).read().rstrip()
-            except Exception:
-                pass
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "slug"
-        if k not in p:
-            d[k]['value'] = GetParams.slugify(s=p['name'])
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "email"
-        if k not in p:
-            try:
-                d[k]['value'] = os.popen(
-                    'git config --get user.email'
-                ).read().rstrip()
-            except Exception:
-                d[k]['value'] = (
-                    f"{p['slug']}@{self.params['org']['slug']}.com"
-                )
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "affiliation"
-        if k not in p:
-            d[k]['value'] = self.params['org']['name']
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "url"
-        if k not in p:
-            d[k]['value'] = f"https://github.com/{p['slug']}"
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        # Project params
-        d = self.defaults['project']
-        if "project" not in self.params:
-            self.params['project'] = {}
-        p = self.params['project']
-
-        k = "name"
-        if k not in p:
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "slug"
-        if k not in p:
-            d[k]['value'] = GetParams.slugify(s=p['name'])
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "path"
-        if k not in p:
-            d[k]['value'] = f"{os.getcwd()}{os.sep}{p['slug']}"
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "synopsis"
-        if k not in p:
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "version"
-        if k not in p:
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "tags"
-        if k not in p:
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "license"
-        if k not in p:
-            try:
-                p[k] = GetParams.query_user(
-                    d=d[k],
-                    retries=retries,
-                )
-            except ValueError:
-                logger.warning(
-                    "Too many invalid inputs. Using default value "
-                    f"'{d[k]['value']}'.")
-                p[k] = d[k]['value']
-
-        k = "copyright_year"
-        if k not in p:
-            d[k]['value'] = date.today().year
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "original_author"
-        if k not in p:
-            d[k]['value'] = self.params['user']['name']
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "git_repo"
-        if k not in p:
-            d[k]['value'] = (
-                f"{self.params['org']['git_host']}"
-                f"{os.sep}{p['slug']}"
-            )
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        k = "docker_image_name"
-        if k not in p:
-            d[k]['value'] = (
-                f"{self.params['org']['docker_host']}"
-                f"{os.sep}{p['slug']}"
-            )
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries,
-            )
-
-        # Software & file params
-        d = self.defaults['soft']
-        if "soft" not in self.params:
-            self.params['soft'] = {}
-        p = self.params['soft']
-
-        k = "python_version"
-        if k not in p:
-            d[k]['value'] = '.'.join([str(i) for i in sys.version_info[0:3]])
-            p[k] = GetParams.query_user(
-                d=d[k],
-                retries=retries
-            )
-
-        k = "docs"
-        if k not in p:
-            try:
-                p[k] = GetParams.query_user(
-                    d=d[k],
-                    retries=retries,
-                )
-            except ValueError:
-                logger.warning(
-                    "Too many invalid inputs. Using default value "
-                    f"'{d[k]['value']}'.")
-                p[k] = d[k]['value']
-
-        k = "docker"
-        if k not in p:
-            try:
-                p[k] = GetParams.query_user(
-                    d=d[k],
-                    retries=retries,
-                )
-            except ValueError:
-                logger.warning(
-                    "Too many invalid inputs. Using default value "
-                    f"'{d[k]['value']}'.")
-                p[k] = d[k]['value']
-
-        k = "packaging"
-        if k not in p:
-            try:
-                p[k] = GetParams.query_user(
-                    d=d[k],
-                    retries=retries,
+        missing = [
+            field for field in schema.SCHEMA
+            if field.key not in self.params.get(field.section, {})
+        ]
+        env = schema.Probes()
+        if any(field.infer is not None for field in missing):
+            env.start()
+        if not self.interactive:
+            self.infer_params(env=env)
+            return
+        for field in schema.SCHEMA:
+            p = self.params.setdefault(field.section, {})
+            if field.key in p:
+                p[field.key] = field.normalize(p[field.key])
+                continue
+            d = dict(self.defaults[field.section][field.key])
+            if field.section == "soft" and field.key in plugins.GROUPS:
+                d['choices'] = list(d['choices']) + [
+                    name for name in plugins.available(kind=field.key)
+                    if name not in d['choices']
+                ]
+            if field.infer is not None:
+                try:
+                    d['value'] = field.infer(self.params, env)
+                except Exception as e:
+                    logger.debug(
+                        f"Could not infer default of '{field.path}': {e}"
+                    )
+            if d['value'] == schema.INFER:
+                d['value'] = ""
+            if 'description' not in d:
+                d['description'] = GetParams.description(
+                    section=field.section,
+                    key=field.key,
                 )
-            except ValueError:
-                logger.warning(
-                    "Too many invalid inputs. Using default value "
-                    f"'{d[k]['value']}'.")
-                p[k] = d[k]['value']
-
-        k = "cli_script"
-        if k not in p:
-            try:
-                p[k] = GetParams.query_user(
-                    d=d[k],
+            if not field.choices:
+                p[field.key] = GetParams.query_user(
+                    d=d,
                     retries=retries,
                 )
-            except ValueError:
-                logger.warning(
-                    "Too many invalid inputs. Using default value "
-                    f"'{d[k]['value']}'.")
-                p[k] = d[k]['value']
-
-        k = "linter"
-        if k not in p:
+                continue
             try:
-                p[k] = GetParams.split_choices(s=GetParams.query_user(
-                    d=d[k],
+                p[field.key] = field.normalize(GetParams.query_user(
+                    d=d,
                     retries=retries,
                 ))
             except ValueError:
                 logger.warning(
                     "Too many invalid inputs. Using default value "
-                    f"'{d[k]['value']}'.")
-                p[k] = d[k]['value']
+                    f"'{d['value']}'.")
+                p[field.key] = field.normalize(d['value'])
 
-        k = "testing"
-        if k not in p:
-            try:
-                p[k] = GetParams.split_choices(s=GetParams.query_user(
-                    d=d[k],
-                    retries=retries,
-                ))
-            except ValueError:
-                logger.warning(
-                    "Too many invalid inputs. Using default value "
-                    f"'{d[k]['value']}'.")
-                p[k] = d[k]['value']
+    def infer_params(self, env: Mapping) -> None:
+        """Infer missing parameters without querying the user.
 
-        k = "ci_cd"
-        if k not in p:
-            try:
-                p[k] = GetParams.split_choices(s=GetParams.query_user(
-                    d=d[k],
-                    retries=retries,
-                ))
-            except ValueError:
-                logger.warning(
-                    "Too many invalid inputs. Using default value "
-                    f"'{d[k]['value']}'.")
-                p[k] = d[k]['value']
+        Values are inferred in the order of '.schema.SCHEMA'. Parameters
+        without an inference rule, as well as parameters whose inference
+        fails or yields an empty or invalid value, are missing.
 
-        k = "auto_version_bump"
-        if k not in p:
+        :param env: results of environment lookups; see '.schema.Probes'.
+
+        :returns: None
+        :raises: ValueError if any parameters are missing
+        """
+        missing: List[str] = []
+        for field in schema.SCHEMA:
+            p = self.params.setdefault(field.section, {})
+            if field.key in p:
+                p[field.key] = field.normalize(p[field.key])
+                continue
+            if field.infer is None:
+                missing.append(field.path)
+                continue
             try:
-                p[k] = GetParams.query_user(
-                    d=d[k],
-                    retries=retries,
+                value = field.normalize(field.infer(self.params, env))
+            except Exception as e:
+                logger.debug(
+                    f"Could not infer default of '{field.path}': {e}"
                 )
-            except ValueError:
-                logger.warning(
-                    "Too many invalid inputs. Using default value "
-                    f"'{d[k]['value']}'.")
-                p[k] = d[k]['value']
+                missing.append(field.path)
+                continue
+            if value in ("", None) or field.invalid(value):
+                missing.append(field.path)
+                continue
+            p[field.key] = value
+        if missing:
+            raise ValueError(
+                f"{len(missing)} required parameter(s) missing in "
+                "non-interactive mode; please provide them in a config "
+                "file:\n" + "\n".join(f"  - {path}" for path in missing)
+            )
 
     @staticmethod
     def query_user(
@@ -377,7 +169,8 @@ class GetParams:
         """Query user for parameters to be used for project setup.
 
         :param d: default dictionary of the minimal form {"value": "",
-                "description": ""}.
+                "description": ""}; an empty value means that there is no
+                default, in which case an empty input is returned as is.
         :param retries: how many times the user can retry entering input if it
                 is invalid; a negative integer will allow indefinite inputs.
 
@@ -395,52 +188,52 @@ class GetParams:
                 f"Type 'int' expected, got '{type(retries)}'"
             )
         try:
-            # Build description
+            # Build description and validator
             choices = ""
+            allowed: Optional[FrozenSet[str]] = None
             if "choices" in d:
                 multi = ""
                 alt = ""
+                allowed = frozenset(d['choices'])
                 if d['multiple']:
                     multi = "or more "
                 if d["alternative"]:
                     alt = f"; or pick '{d['alternative']}'"
+                    allowed |= {d['alternative']}
                 ls = ["'" + choice + "'" for choice in d['choices']]
                 choices = (f"\n(pick one {multi}of {', '.join(ls)}{alt})")
-            # Get user input, fall back to default
-            s = input(
+            if d['value'] in ("", None):
+                default = "(no default)"
+            else:
+                default = f"(default: '{d['value']}')"
+            prompt = (
                 "\n"
                 f"{d['description']}\n"
-                f"(default: '{d['value']}'){choices}\n"
+                f"{default}{choices}\n"
                 "> "
             )
-            if not s:
-                s = d["value"]
-            # Validate user input
-            if "choices" in d:
-                allowed = d['choices']
-                if d['alternative']:
-                    allowed += [d['alternative']]
+            while True:
+                # Get user input, fall back to default
+                s = input(prompt)
+                if not s:
+                    s = d["value"]
+                # Validate user input
+                if allowed is None:
+                    break
                 if d['multiple']:
-                    ls = [item.strip() for item in s.split(',')]
-                    for item in ls:
-                        if item not in allowed:
-                            logger.warning(
-                                f"\nIllegal value '{item}' entered. Please "
-                                "try again."
-                            )
-                            if retries:
-                                return GetParams.query_user(d=d, retries=retries - 1)
-                            else:
-                                raise ValueError(f"Too many wrong inputs.")
+                    items = [item.strip() for item in s.split(',')]
                 else:
-                    if s not in allowed:
-                        logger.warning(
-                            f"\nIllegal value '{s}' entered. Please try again."
-                        )
-                        if retries:
-                            return GetParams.query_user(d=d, retries=retries - 1)
-                        else:
-                            raise ValueError(f"Too many wrong inputs.")
+                    items = [s]
+                illegal = [item for item in items if item not in allowed]
+                if not illegal:
+                    break
+                logger.warning(
+                    f"\nIllegal value '{illegal[0]}' entered. Please try "
+                    "again."
+                )
+                if not retries:
+                    raise ValueError("Too many wrong inputs.")
+                retries -= 1
         except KeyError:
             raise TypeError(
                 f"The provided defaults file is corrupt."
@@ -450,81 +243,60 @@ class GetParams:
         return s
 
     @staticmethod
-    def slugify(
-        s: str,
-        allowed_start: str = string.ascii_lowercase,
-        allowed_end: str = string.ascii_lowercase + string.digits,
-        allowed_rest: str = string.ascii_lowercase + string.digits + "_",
-        lower: bool = True,
-        whitespace_replace: str = "_",
-    ) -> str:
-        """Transforms string into 'machine-readable' slugs.
+    def description(section: str, key: str) -> str:
+        """Get description of a parameter from the description catalog.
+
+        :param section: name of section, e.g., 'org'.
+        :param key: name of parameter in section.
+
+        :returns: str; empty if the parameter is not described
+        """
+        return GetParams.descriptions().get(section, {}).get(key, "")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def descriptions() -> Mapping:
+        """Load the packaged description catalog.
+
+        The catalog holds the human-readable descriptions of all parameters
+        and is kept apart from the defaults, so that runs that do not query
+        the user never parse it.
+
+        :returns: read-only mapping of descriptions by section and
+                parameter name; see '.models.freeze()'
+        """
+        from myproj import resources
+        from myproj.config import ConfigParser
+        from myproj.models import freeze
+
+        logger.debug("Loading description catalog...")
+        return freeze(ConfigParser.yaml_to_dict(
+            yaml_file=resources.path("config", "descriptions.yaml"),
+        ))
+
+    @staticmethod
+    def git_config(key: str) -> str:
+        """Get value of a Git configuration variable; see
+        '.utils.git_config()'.
+
+        :param key: name of configuration variable, e.g., 'user.name'.
+
+        :returns: str
+        """
+        return utils.git_config(key=key)
+
+    @staticmethod
+    def slugify(s: str, **kwargs) -> str:
+        """Transforms string into 'machine-readable' slugs; see
+        '.utils.slugify()'.
 
         :param s: string to be processed.
-        :param allowed_start: string of characters allowed in the first
-                position of the output string. The beginning of the input
-                string will be trimmed until the first allowed character.
-        :param allowed_end: string of characters allowed in the last
-                position of the output string. The end of the input string
-                will be trimmed from the last allowed character.
-        :param allowed_rest: string of characters allowed in all but the first
-                and last positions of the output string. Any characters that
-                are not allowed will be removed from the input string.
-        :param lower: whether uppercase characters should be transformed to
-                lower case.
-        :param whitespace_replace: string to replace all whitespace
-                characters. Runs of whitespace characters will be replaced by
-                a single instance of the string. Note that whitespace
-                replacement occurs before checking of allowed characters takes
-                place, so if this string contains characters not in the
-                allowed characters, these characters will be removed.
+        :param kwargs: keyword arguments passed to '.utils.slugify()'.
 
         :returns: str
         :raises: TypeError
         """
-        if not type(s) is str:
-            raise TypeError(
-                f"Type 'str' expected, got '{type(s)}'"
-            )
-        if not type(allowed_start) is str:
-            raise TypeError(
-                f"Type 'str' expected, got '{type(allowed_start)}'"
-            )
-        if not type(allowed_end) is str:
-            raise TypeError(
-                f"Type 'str' expected, got '{type(allowed_end)}'"
-            )
-        if not type(allowed_rest) is str:
-            raise TypeError(
-                f"Type 'str' expected, got '{type(allowed_rest)}'"
-            )
-        if not type(lower) is bool:
-            raise TypeError(
-                f"Type 'bool' expected, got '{type(lower)}'"
-            )
-        if not type(whitespace_replace) is str:
-            raise TypeError(
-                f"Type 'str' expected, got '{type(whitespace_replace)}'"
-            )
-        if lower:
-            s = s.lower()
-        s = whitespace_replace.join(s.split())
-        c = 0
-        for c in range(0, len(s)):
-            if s[c] in allowed_start:
-                break
-        else:
-            c += 1
-        s = s[c:]
-        d = len(s)
-        for d in reversed(range(0, len(s))):
-            if s[d] in allowed_end:
-                break
-        else:
-            d -= 1
-        s = s[:d+1]
-        s = ''.join([c for c in s if c in allowed_rest])
-        return s
+        return utils.slugify(s, **kwargs)
 
     @staticmethod
     def split_choices(
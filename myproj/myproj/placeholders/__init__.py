@@ -0,0 +1,121 @@
+"""
+Compiled substitution of plain placeholders.
+
+Most template files only contain plain placeholders, such as
+`{{cookiecutter.project.slug}}`, and no other template markup. Such
+templates are compiled into alternating literal segments and lookup paths,
+so that rendering them is a single join instead of a run of the template
+engine. Templates are rendered exactly as by the template engine (with
+`keep_trailing_newline`); templates for which this cannot be guaranteed are
+not compiled.
+"""
+import re
+from typing import (Any, List, Mapping, Optional, Tuple)
+
+# Plain placeholder looking up a parameter in the context
+PLACEHOLDER_RX = re.compile(
+    r"\{\{-?\s*cookiecutter((?:\.[A-Za-z_][A-Za-z0-9_]*)+)\s*-?\}\}"
+)
+
+# Start delimiters of template markup
+MARKERS = ("{{", "{%", "{#")
+
+# Names resolved to methods rather than items of mappings by the template
+# engine
+RESERVED = frozenset(dir(dict))
+
+
+class PlaceholderTemplate:
+    """Template consisting of literal segments and lookup paths only."""
+    __slots__ = ("literals", "paths")
+
+    def __init__(
+        self,
+        literals: Tuple[str, ...],
+        paths: Tuple[Tuple[str, ...], ...],
+    ) -> None:
+        """Class constructor.
+
+        :param literals: literal segments; one more than `paths`.
+        :param paths: lookup paths of placeholders, as tuples of keys
+                below the context.
+
+        :returns: None
+        """
+        self.literals = literals
+        self.paths = paths
+
+    def render(self, context: Mapping) -> str:
+        """Render template.
+
+        Placeholders that cannot be resolved render as empty strings, as
+        with the template engine.
+
+        :param context: parameters, as looked up below 'cookiecutter'.
+
+        :returns: str
+        :raises: KeyError if a lookup path cannot be resolved as by the
+                template engine; see `lookup()`
+        """
+        parts: List[str] = [self.literals[0]]
+        for path, literal in zip(self.paths, self.literals[1:]):
+            parts += (lookup(context, path), literal)
+        return ''.join(parts)
+
+
+def lookup(context: Mapping, path: Tuple[str, ...]) -> str:
+    """Resolve a lookup path to its string value.
+
+    :param context: parameters.
+    :param path: keys below the context.
+
+    :returns: str; empty if the last key is missing
+    :raises: KeyError if an intermediate key is missing, or if a key names
+            an attribute of a value that is not a mapping, which the
+            template engine would resolve to the attribute
+    """
+    value: Any = context
+    try:
+        for key in path:
+            value = value[key]
+        return str(value)
+    except (KeyError, TypeError):
+        value = context
+    for i, key in enumerate(path):
+        if not isinstance(value, Mapping) and hasattr(value, key):
+            raise KeyError('.'.join(path[:i + 1]))
+        if not isinstance(value, Mapping) or key not in value:
+            if i == len(path) - 1:
+                return ""
+            raise KeyError('.'.join(path[:i + 1]))
+        value = value[key]
+    return str(value)
+
+
+def compile(source: str) -> Optional[PlaceholderTemplate]:
+    """Compile template source consisting of plain placeholders.
+
+    :param source: template source.
+
+    :returns: compiled template, or `None` if the source contains template
+            markup other than plain placeholders, or anything else that the
+            template engine would not render as is
+    """
+    if '\r' in source:
+        return None
+    literals: List[str] = []
+    paths: List[Tuple[str, ...]] = []
+    pos = 0
+    for match in PLACEHOLDER_RX.finditer(source):
+        if '-' in (match.group(0)[2], match.group(0)[-3]):
+            return None
+        path = tuple(match.group(1)[1:].split('.'))
+        if any(key in RESERVED for key in path):
+            return None
+        literals.append(source[pos:match.start()])
+        paths.append(path)
+        pos = match.end()
+    literals.append(source[pos:])
+    if any(marker in literal for literal in literals for marker in MARKERS):
+        return None
+    return PlaceholderTemplate(literals=tuple(literals), paths=tuple(paths))
@@ -0,0 +1,239 @@
+"""
+Registry of optional project features, such as linters, test suites and
+CI/CD engines.
+
+Each feature is declared as a `Feature` object. Features shipped with
+'myproj' are listed in `BUILTINS`; further features can be provided by other
+distributions through the entry point groups in `GROUPS`, e.g.:
+
+    entry_points={
+        'myproj.linters': ['mylinter = mypackage.features:mylinter'],
+    }
+
+Features are resolved by name and imported only once selected, so that the
+number of installed plugins does not affect start-up time.
+"""
+import functools
+import importlib
+import logging
+from types import MappingProxyType
+from typing import (Callable, Dict, List, Mapping, Optional, Sequence, Tuple)
+
+logger = logging.getLogger(__name__)
+
+# Entry point groups by kind of feature; each kind corresponds to the
+# parameter in section 'soft' that features of this kind are selected with
+GROUPS: Mapping[str, str] = MappingProxyType({
+    "linter": "myproj.linters",
+    "testing": "myproj.test_suites",
+    "ci_cd": "myproj.ci_cd",
+})
+
+# Built-in features by kind and name, as 'module:attribute' references
+BUILTINS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "linter": MappingProxyType({
+        "black": "myproj.plugins.builtin:black",
+        "flake8": "myproj.plugins.builtin:flake8",
+        "pylint": "myproj.plugins.builtin:pylint",
+        "pyright": "myproj.plugins.builtin:pyright",
+    }),
+    "testing": MappingProxyType({
+        "pytest": "myproj.plugins.builtin:pytest",
+    }),
+    "ci_cd": MappingProxyType({
+        "gitlab_docker": "myproj.plugins.builtin:gitlab_docker",
+    }),
+})
+
+# Value that deselects all features of a kind
+NONE = "none"
+
+# Predicate of a condition, given the parameters in section 'soft' and the
+# software requirements of a project
+Condition = Callable[[Mapping, Sequence[str]], bool]
+
+# Loaded features by kind and name
+_loaded: Dict[Tuple[str, str], "Feature"] = {}
+
+
+class Feature:
+    """Declaration of an optional project feature.
+
+    A feature contributes template files and software requirements to a
+    project, and may override or blank replacement strings of the project
+    template.
+
+    Replacement strings listed in `blank_unless` are blanked if their
+    condition does not hold for the project. Conditions are either
+    'requirements', which holds if the project has any software
+    requirements, or '<parameter>:<value>', which holds if the value of the
+    given parameter in section 'soft' is, or includes, the given value.
+    """
+    __slots__ = (
+        "name",
+        "files",
+        "requirements",
+        "replace",
+        "blank_unless",
+        "blank_rules",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        files: Sequence[Tuple[str, str]] = (),
+        requirements: Sequence[str] = (),
+        replace: Optional[Mapping[str, str]] = None,
+        blank_unless: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """Class constructor.
+
+        :param name: name by which the feature is selected.
+        :param files: pairs of template file paths, '/'-separated and
+                relative to the template directory, and their destinations,
+                relative to the project root.
+        :param requirements: software requirements added to the project.
+        :param replace: replacement string values to set, by '.'-separated
+                key path.
+        :param blank_unless: conditions under which replacement strings are
+                kept, by '.'-separated key path.
+
+        :returns: None
+        """
+        self.name = name
+        self.files = tuple(tuple(item) for item in files)
+        self.requirements = tuple(requirements)
+        self.replace = MappingProxyType(dict(replace or {}))
+        self.blank_unless = MappingProxyType(dict(blank_unless or {}))
+        self.blank_rules: Tuple[Tuple[str, Condition], ...] = tuple(
+            (key_path, Feature.compile_condition(condition))
+            for key_path, condition in self.blank_unless.items()
+        )
+
+    def __repr__(self) -> str:
+        return f"Feature('{self.name}')"
+
+    def blanked(
+        self,
+        soft: Mapping,
+        requirements: Sequence[str],
+    ) -> List[str]:
+        """Return replacement strings to blank for a project.
+
+        :param soft: parameters in section 'soft'.
+        :param requirements: software requirements of the project.
+
+        :returns: list of '.'-separated key paths
+        """
+        return [
+            key_path
+            for key_path, holds in self.blank_rules
+            if not holds(soft, requirements)
+        ]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def compile_condition(condition: str) -> "Condition":
+        """Compile a condition of `blank_unless` into a predicate.
+
+        :param condition: condition, e.g., 'testing:pytest'.
+
+        :returns: function of the parameters in section 'soft' and the
+                software requirements of a project, returning whether the
+                condition holds
+        :raises: ValueError
+        """
+        if condition == "requirements":
+            return lambda soft, requirements: bool(requirements)
+        key, sep, value = condition.partition(":")
+        if not sep:
+            raise ValueError(f"Invalid feature condition '{condition}'.")
+
+        def holds(soft: Mapping, requirements: Sequence[str]) -> bool:
+            selected = soft[key]
+            if isinstance(selected, str):
+                return selected == value
+            return value in selected
+
+        return holds
+
+
+def _entry_points(kind: str) -> Dict:
+    """Return entry points of a kind of feature by name.
+
+    :param kind: kind of feature, one of `GROUPS`.
+
+    :returns: dict of 'importlib.metadata.EntryPoint' objects
+    """
+    from importlib import metadata
+    group = GROUPS[kind]
+    try:
+        entry_points = metadata.entry_points(group=group)
+    except TypeError:  # pragma: no cover; Python < 3.10
+        entry_points = metadata.entry_points().get(group, [])
+    return {entry_point.name: entry_point for entry_point in entry_points}
+
+
+def available(kind: str) -> List[str]:
+    """Return names of all features of a kind, without importing them.
+
+    :param kind: kind of feature, one of `GROUPS`.
+
+    :returns: list of str
+    """
+    return sorted(set(BUILTINS[kind]) | set(_entry_points(kind)))
+
+
+def load(kind: str, name: str) -> Feature:
+    """Import a feature.
+
+    Built-in features take precedence over features provided through entry
+    points; the latter are only looked up if no built-in feature of the
+    given name exists.
+
+    :param kind: kind of feature, one of `GROUPS`.
+    :param name: name of feature.
+
+    :returns: Feature
+    :raises: KeyError
+    :raises: TypeError
+    """
+    if (kind, name) in _loaded:
+        return _loaded[(kind, name)]
+    if name in BUILTINS[kind]:
+        module_name, _, attr = BUILTINS[kind][name].partition(":")
+        feature = getattr(importlib.import_module(module_name), attr)
+    else:
+        entry_points = _entry_points(kind)
+        if name not in entry_points:
+            raise KeyError(
+                f"No feature '{name}' found in entry point group "
+                f"'{GROUPS[kind]}'."
+            )
+        feature = entry_points[name].load()
+    if not isinstance(feature, Feature):
+        raise TypeError(
+            f"Type 'Feature' expected for feature '{name}', got "
+            f"'{type(feature)}'"
+        )
+    logger.debug(f"Loaded {kind} feature '{name}'.")
+    _loaded[(kind, name)] = feature
+    return feature
+
+
+def selected(kind: str, soft: Mapping) -> List[Feature]:
+    """Load the features of a kind that are selected for a project.
+
+    :param kind: kind of feature, one of `GROUPS`.
+    :param soft: parameters in section 'soft'.
+
+    :returns: list of Feature
+    :raises: KeyError
+    :raises: TypeError
+    """
+    names = soft[kind]
+    if isinstance(names, str):
+        names = [names]
+    if NONE in names:
+        return []
+    return [load(kind=kind, name=name) for name in names]
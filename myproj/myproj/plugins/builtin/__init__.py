@@ -0,0 +1,42 @@
+"""
+Features shipped with 'myproj'.
+"""
+from myproj.plugins import Feature
+
+# Linters
+black = Feature(
+    name="black",
+    requirements=["black"],
+)
+flake8 = Feature(
+    name="flake8",
+    requirements=["flake8"],
+)
+pylint = Feature(
+    name="pylint",
+    requirements=["pylint"],
+)
+pyright = Feature(
+    name="pyright",
+    requirements=["pyright"],
+)
+
+# Test suites
+pytest = Feature(
+    name="pytest",
+    requirements=["pytest"],
+)
+
+# CI/CD engines
+gitlab_docker = Feature(
+    name="gitlab_docker",
+    files=[
+        ("ci_cd/.gitlab-ci.yml", ".gitlab-ci.yml"),
+    ],
+    blank_unless={
+        "ci_cd.install_requirements.gitlab_docker": "requirements",
+        "ci_cd.test_pytest.gitlab_docker": "testing:pytest",
+        "ci_cd.test_flake8.gitlab_docker": "linter:flake8",
+        "ci_cd.test_cli.gitlab_docker": "cli_script:yes",
+    },
+)
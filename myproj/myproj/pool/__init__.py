@@ -0,0 +1,128 @@
+"""
+Thread pool for blocking I/O within a phase of the generation pipeline.
+
+Independent blocking filesystem calls of a phase, such as copying template
+files or writing output files, are run in a bounded, process-wide thread
+pool (see `submit()` and `map_threads()`). Calls made from within a pool worker
+are run in place, so that nested use of the pool cannot exhaust it and
+deadlock. Callers wait for all calls they submit before returning, so that
+the work of a phase of the pipeline is completed within the phase.
+
+Calls are run in pool workers, in a copy of the context (see `contextvars`)
+of the submitting thread, but they are not seen by profilers enabled in it.
+Hooks registered with `hook()` wrap every call submitted while they are
+active, e.g., to profile it; see '.profiling.PhaseProfiler'.
+"""
+import contextlib
+import contextvars
+from concurrent.futures import (Future, ThreadPoolExecutor)
+import os
+import threading
+from typing import (Any, Callable, Iterable, Iterator, List, Optional,
+                    TypeVar)
+
+T = TypeVar("T")
+
+# Maximum number of concurrent blocking calls
+MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+_worker = threading.local()
+_hooks: List[Callable[[Callable], Callable]] = []
+
+
+def _mark_worker() -> None:
+    _worker.active = True
+
+
+def in_worker() -> bool:
+    """Return whether the current thread is a pool worker.
+
+    :returns: bool
+    """
+    return getattr(_worker, "active", False)
+
+
+def executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool, creating it on first use.
+
+    :returns: concurrent.futures.ThreadPoolExecutor
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_WORKERS,
+                thread_name_prefix="myproj-io",
+                initializer=_mark_worker,
+            )
+        return _executor
+
+
+@contextlib.contextmanager
+def hook(wrap: Callable[[Callable], Callable]) -> Iterator[None]:
+    """Context manager wrapping all calls submitted to the thread pool.
+
+    Calls run in place within pool workers are not wrapped, as they are part
+    of a call that is.
+
+    :param wrap: function taking the function to call and returning a
+            function with the same signature to call in its place.
+
+    :returns: None
+    """
+    with _lock:
+        _hooks.append(wrap)
+    try:
+        yield
+    finally:
+        with _lock:
+            _hooks.remove(wrap)
+
+
+def submit(func: Callable[..., T], *args: Any, **kwargs: Any) -> Future:
+    """Schedule a blocking call in the thread pool.
+
+    :param func: function to call.
+    :param args: positional arguments to `func`.
+    :param kwargs: keyword arguments to `func`.
+
+    :returns: future of the result of the call
+    """
+    if in_worker():
+        future: Future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    with _lock:
+        hooks = list(_hooks)
+    for wrap in hooks:
+        func = wrap(func)
+    return executor().submit(
+        contextvars.copy_context().run,
+        func,
+        *args,
+        **kwargs,
+    )
+
+
+def map_threads(func: Callable[..., T], *iterables: Iterable) -> List[T]:
+    """Call a function concurrently in the thread pool for each set of
+    arguments.
+
+    All calls are completed before returning, even if some of them fail.
+
+    :param func: function to call.
+    :param iterables: iterables of positional arguments to `func`, as for
+            builtin `map()`.
+
+    :returns: list of results, in the order of the arguments
+    :raises: re-raises the first exception raised by any call
+    """
+    futures = [submit(func, *args) for args in zip(*iterables)]
+    for future in futures:
+        future.exception()
+    return [future.result() for future in futures]
@@ -0,0 +1,216 @@
+"""
+Per-phase profiling of program runs.
+"""
+import collections
+import contextlib
+import cProfile
+import functools
+import logging
+import os
+import pathlib
+import pstats
+from typing import (Any, Callable, Dict, Iterator, List, Optional, Set,
+                    Tuple)
+
+from myproj import pool
+
+logger = logging.getLogger(__name__)
+
+# Function key as used by 'pstats': (file name, line number, function name)
+Func = Tuple[str, int, str]
+
+
+class PhaseProfiler:
+    """Profiles each phase of a program run with a dedicated profiler.
+
+    For every phase, statistics are dumped to file '<phase>.pstats' in the
+    output directory. In addition, the stacks of all phases can be written
+    to a single file in the collapsed stack format understood by flame graph
+    tools (e.g., 'flamegraph.pl', 'speedscope', 'inferno').
+
+    If no output directory is set, phases are not profiled.
+    """
+
+    def __init__(
+        self,
+        out_dir: Optional[str] = None,
+    ) -> None:
+        """Class constructor.
+
+        :param out_dir: directory to write profiles to; created if it does
+                not exist. Set to `None` to disable profiling.
+
+        :returns: None
+        """
+        self.out_dir = out_dir
+        self.stats: Dict[str, pstats.Stats] = {}
+        if self.out_dir is not None:
+            pathlib.Path(self.out_dir).mkdir(parents=True, exist_ok=True)
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Context manager profiling the enclosed code as a phase.
+
+        Calls submitted to the thread pool of '.pool' during the phase are
+        profiled as part of the phase; see `profiled()`.
+
+        :param name: name of phase; used as file name prefix and as root
+                frame in the collapsed stacks.
+
+        :returns: None
+        """
+        if self.out_dir is None:
+            yield
+            return
+        profile = cProfile.Profile()
+        workers: List[cProfile.Profile] = []
+        profile.enable()
+        try:
+            with pool.hook(functools.partial(
+                PhaseProfiler.profiled,
+                profiles=workers,
+            )):
+                yield
+        finally:
+            profile.disable()
+            pstats_file = os.path.join(self.out_dir, f"{name}.pstats")
+            stats = pstats.Stats(profile)
+            if workers:
+                stats.add(*workers)
+            stats.dump_stats(pstats_file)
+            self.stats[name] = stats
+            logger.debug(
+                f"Profile of phase '{name}' written to '{pstats_file}'."
+            )
+
+    @staticmethod
+    def profiled(
+        func: Callable,
+        profiles: List[cProfile.Profile],
+    ) -> Callable:
+        """Wrap a function to be profiled with a dedicated profiler.
+
+        Profilers only record the thread they are enabled in, so that calls
+        run in pool workers (see '.pool') need to be profiled separately.
+        Where a profiler records all threads (Python 3.12 and later), calls
+        are left to the profiler of the phase.
+
+        :param func: function to wrap.
+        :param profiles: list to append the profiler of each call to.
+
+        :returns: function with the same signature as `func`
+        """
+        @functools.wraps(func)
+        def call(*args: Any, **kwargs: Any) -> Any:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.disable()
+                profiles.append(profile)
+
+        return call
+
+    def write_collapsed(
+        self,
+        file_name: str = "profile.collapsed",
+    ) -> Optional[str]:
+        """Write collapsed stacks of all profiled phases to a single file.
+
+        Each line contains the semicolon-separated frames of a stack, rooted
+        at the name of the phase, followed by the time spent in the innermost
+        frame, in microseconds.
+
+        :param file_name: name of output file in the output directory.
+
+        :returns: path to output file, or `None` if profiling is disabled
+        """
+        if self.out_dir is None:
+            return None
+        collapsed_file = os.path.join(self.out_dir, file_name)
+        with open(collapsed_file, 'w') as fh:
+            for name, stats in self.stats.items():
+                for stack, usec in sorted(
+                    PhaseProfiler.collapse(stats=stats, root=name).items()
+                ):
+                    fh.write(f"{stack} {usec}\n")
+        logger.debug(f"Collapsed stacks written to '{collapsed_file}'.")
+        return collapsed_file
+
+    @staticmethod
+    def collapse(
+        stats: pstats.Stats,
+        root: str,
+        min_usec: float = 1.0,
+    ) -> Dict[str, int]:
+        """Reconstruct call stacks from profile statistics.
+
+        'cProfile' records caller-callee edges only, not full stacks. Stacks
+        are therefore rebuilt by walking the call graph from functions
+        without recorded callers; the time of a function that is reached via
+        several callers is split in proportion to the time spent in each of
+        the corresponding calls.
+
+        :param stats: profile statistics.
+        :param root: name of the root frame of all stacks.
+        :param min_usec: stacks whose share of the cumulative time of their
+                innermost frame falls below this value (in microseconds) are
+                not descended into.
+
+        :returns: dictionary of times in microseconds by stack
+        """
+        entries = stats.stats  # type: ignore
+        callees: Dict[Func, List[Func]] = collections.defaultdict(list)
+        for func, (_, _, _, _, callers) in entries.items():
+            for caller in callers:
+                callees[caller].append(func)
+        collapsed: Dict[str, int] = collections.defaultdict(int)
+
+        def walk(
+            func: Func,
+            stack: List[str],
+            share: float,
+            visiting: Set[Func],
+        ) -> None:
+            _, _, tt, ct, _ = entries[func]
+            stack = stack + [PhaseProfiler.label(func)]
+            usec = int(round(tt * share * 1e6))
+            if usec:
+                collapsed[';'.join(stack)] += usec
+            visiting.add(func)
+            for callee in callees.get(func, []):
+                if callee in visiting:
+                    continue
+                callee_ct = entries[callee][3]
+                edge_ct = entries[callee][4][func][3]
+                if not callee_ct:
+                    continue
+                callee_share = share * edge_ct / callee_ct
+                if callee_share * callee_ct * 1e6 < min_usec:
+                    continue
+                walk(callee, stack, callee_share, visiting)
+            visiting.discard(func)
+
+        for func, (_, _, _, _, callers) in entries.items():
+            if not callers:
+                walk(func, [root], 1.0, set())
+        return dict(collapsed)
+
+    @staticmethod
+    def label(func: Func) -> str:
+        """Build a human-readable frame label for a function.
+
+        :param func: function key as used by 'pstats'.
+
+        :returns: str
+        """
+        file_name, line, name = func
+        if file_name == '~':
+            label = name
+        else:
+            label = f"{name} ({os.path.basename(file_name)}:{line})"
+        return label.replace(';', ',')
@@ -1,21 +1,47 @@
 """
 Classes for project templating and rendering.
 """
+import atexit
+import functools
+import hashlib
 import json
 import logging
 import os
 import pathlib
+import re
 import shutil
 import tempfile
-from typing import Dict
+import threading
+from types import MappingProxyType
+from typing import (Dict, Iterator, List, Mapping, Optional, Sequence,
+                    Tuple, Union)
 
+import jinja2
+
+from myproj import (analysis, manifest, metrics, placeholders, plugins,
+                    pool, render, resources, streams)
 from myproj.config import ConfigParser
-from myproj.models import (
-    CI_CD, License, Linter, Parameters, TestSuite, YesNo
-)
+from myproj.dedup import OutputStore
+from myproj.models import (License, Parameters, YesNo, freeze, thaw)
+from myproj.pack import TemplatePack
+from myproj.placeholders import PlaceholderTemplate
+from myproj.results import ResultCache
+from myproj.resources import Traversable
 
 logger = logging.getLogger(__name__)
 
+# Root directory of template files in template trees
+TEMPLATE_ROOT = '{{cookiecutter.project.slug}}'
+
+# File in template trees listing template files without template markup,
+# with their manifest entries
+VERBATIM_MANIFEST = 'verbatim.json'
+
+# Replacement string value in the legacy quoted form, and escaped characters
+# therein; see `Project.decode_replacements()`
+QUOTED_VALUE = re.compile(r'"(.*)"', re.DOTALL)
+ESCAPED_CHAR = re.compile(r'\\(.)', re.DOTALL)
+
 
 class Project:
     """Generate Python package.
@@ -25,31 +51,34 @@ class Project:
     docs, packaging, containerization, publishing options and CI/CD.
     """
 
+    # Template trees staged in this process, by signature and cache directory
+    _template_trees: Dict[Tuple[str, Optional[str]], str] = {}
+    _template_trees_lock = threading.Lock()
+
     def __init__(
         self,
         params: Dict,
-        replacement_yaml: str = os.path.join(
-            os.path.dirname(__file__),
-            os.pardir,
-            os.pardir,
-            'config',
-            'replacement_strings.yaml',
-        )
+        replacement_yaml: Optional[str] = None,
     ) -> None:
         """Initialize Project instance with required parameters.
 
         :param params: dictionary of required project parameters.
         :param replacement_yaml: YAML file with values for context-dependent
-                string replacements.
+                string replacements; defaults to the packaged file.
 
         :returns: None
         :raises: TypeError
         """
         self.params = params
+        if replacement_yaml is None:
+            replacement_yaml = resources.path(
+                'config',
+                'replacement_strings.yaml',
+            )
         self.replacement_yaml = replacement_yaml
         if not ConfigParser.same_keys(
             query=self.params,
-            ref=Parameters().to_dict(),
+            ref=Parameters().as_mapping(),
             two_way=True,
         ):
             raise TypeError(
@@ -57,153 +86,765 @@ class Project:
             )
         self.project_dir = self.params['project']['path']
 
+    def plan_template(
+        self,
+        template_dir: Optional[Union[str, Traversable]] = None,
+    ) -> Dict:
+        """Resolve how the project template is assembled, without touching
+        the file system.
+
+        The returned plan lists the template files to be copied (as
+        '/'-separated paths relative to the template directory, with their
+        destinations relative to the project root), the software
+        requirements, the replacement string values and the replacement
+        strings that are blanked because the corresponding features are not
+        selected. Linters, test suites and CI/CD engines are resolved
+        through '.plugins'; only the selected ones are imported.
+
+        :param template_dir: directory containing the template files that
+                the project template is assembled from; defaults to the
+                packaged templates.
+
+        :returns: dict
+        :raises: KeyError
+        """
+        if template_dir is None:
+            template_dir = resources.data('templates')
+
+        # Initialize plan
+        files: List[Dict[str, str]] = []
+        requirements: List[str] = []
+        blanked: List[str] = []
+
+        # Add '.gitignore' file
+        files.append({
+            'src': 'version_control/.gitignore',
+            'dst': '.gitignore',
+        })
+
+        # Add license
+        license = self.params['project']['license']
+        if license != 'none':
+            files.append({
+                'src': f'licenses/{License[license].value}',
+                'dst': 'LICENSE',
+            })
+
+        # Add 'contributors.md' file
+        files.append({
+            'src': 'contributing/contributors.md',
+            'dst': 'contributors.md',
+        })
+
+        # Add packaging files
+        if YesNo[self.params['soft']['packaging']].value:
+            files.append({
+                'src': 'packaging/setup.py',
+                'dst': 'setup.py',
+            })
+            files.append({
+                'src': 'packaging/MANIFEST.in',
+                'dst': 'MANIFEST.in',
+            })
+            requirements.extend(['setuptools_git', 'twine'])
+
+        # Add `Dockerfile`
+        if YesNo[self.params['soft']['docker']].value:
+            files.append({
+                'src': 'containers/Dockerfile',
+                'dst': 'Dockerfile',
+            })
+
+        # Add optional features: linters and test suites first, so that
+        # conditions of CI/CD engines see their requirements
+        soft = self.params['soft']
+        features = [
+            feature
+            for kind in plugins.GROUPS
+            for feature in plugins.selected(kind=kind, soft=soft)
+        ]
+        for feature in features:
+            requirements.extend(feature.requirements)
+        overrides: Dict[str, str] = {}
+        for feature in features:
+            files.extend(
+                {'src': src, 'dst': dst} for src, dst in feature.files
+            )
+            overrides.update(feature.replace)
+            blanked.extend(
+                feature.blanked(soft=soft, requirements=requirements)
+            )
+
+        # Resolve replacement strings; shared between all projects with the
+        # same overrides and blanked strings
+        rep = Project.resolve_replacements(
+            replacement_yaml=self.replacement_yaml,
+            overrides=tuple(overrides.items()),
+            blanked=tuple(blanked),
+        )
+
+        logger.debug(f"Requirements: {requirements}")
+
+        return {
+            'template_dir': str(template_dir),
+            'license': license,
+            'files': files,
+            'requirements': requirements,
+            'replace': thaw(rep),
+            'blanked': blanked,
+        }
+
+    @staticmethod
+    def resolve_replacements(
+        replacement_yaml: str,
+        overrides: Tuple[Tuple[str, str], ...] = (),
+        blanked: Tuple[str, ...] = (),
+    ) -> Mapping:
+        """Resolve replacement string values.
+
+        Results are memoized by file, file modification time, overrides and
+        blanked strings, so that projects sharing a feature signature
+        resolve replacements only once. The replacement strings file is
+        parsed only once per modification.
+
+        :param replacement_yaml: YAML file with replacement string values.
+        :param overrides: pairs of '.'-separated key paths and values to
+                set.
+        :param blanked: '.'-separated key paths of values to blank.
+
+        :returns: read-only mapping of replacement string values; see
+                '.models.freeze()'
+        :raises: KeyError
+        """
+        return Project._resolve_replacements(
+            replacement_yaml,
+            os.stat(replacement_yaml).st_mtime_ns,
+            overrides,
+            blanked,
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _resolve_replacements(
+        replacement_yaml: str,
+        mtime_ns: int,
+        overrides: Tuple[Tuple[str, str], ...],
+        blanked: Tuple[str, ...],
+    ) -> Mapping:
+        rep = thaw(Project._load_replacements(replacement_yaml, mtime_ns))
+        for key_path, value in overrides + tuple(
+            (key_path, "") for key_path in blanked
+        ):
+            *keys, last = key_path.split('.')
+            d = rep
+            for key in keys:
+                d = d[key]
+            d[last] = value
+        logger.debug(
+            f"Resolved replacement strings with overrides {overrides} and "
+            f"blanked strings {blanked}."
+        )
+        return freeze(rep)
+
+    @staticmethod
+    def decode_replacements(replacements: Mapping) -> Dict:
+        """Decode replacement string values given in the legacy quoted form.
+
+        Values used to be written as double-quoted strings inside YAML block
+        scalars, e.g., `"ENTRYPOINT [\\"app.py\\"]"`, which YAML does not
+        decode. The wrapping quotes and the backslashes escaping characters
+        are removed from such values; line breaks are kept. Other values are
+        returned as they are.
+
+        :param replacements: replacement string values.
+
+        :returns: decoded replacement string values
+        """
+        decoded: Dict = {}
+        for key, value in replacements.items():
+            if isinstance(value, Mapping):
+                value = Project.decode_replacements(value)
+            elif isinstance(value, str):
+                match = QUOTED_VALUE.fullmatch(value)
+                if match is not None:
+                    value = ESCAPED_CHAR.sub(r'\1', match.group(1))
+            decoded[key] = value
+        return decoded
+
+    @staticmethod
+    def render_replacements(
+        replacements: Mapping,
+        params: Mapping,
+    ) -> Dict:
+        """Resolve template markup in replacement string values.
+
+        Replacement strings may themselves reference parameters and other
+        replacement strings. Each replacement string with template markup is
+        rendered exactly once, in dependency order (see
+        `replacement_order()`), so that template files referencing them are
+        rendered in a single pass.
+
+        :param replacements: replacement string values.
+        :param params: project parameters.
+
+        :returns: replacement string values without template markup
+        :raises: ValueError if replacement strings reference each other
+                cyclically
+        """
+        rep = thaw(replacements)
+        context = dict(params, replace=rep)
+        for path, compiled, template in Project.replacement_order(
+            Project.flatten(rep),
+        ):
+            *keys, last = path
+            d = rep
+            for key in keys:
+                d = d[key]
+            d[last] = None
+            if compiled is not None:
+                try:
+                    d[last] = compiled.render(context)
+                except KeyError:
+                    pass
+            if d[last] is None:
+                d[last] = template.render(cookiecutter=context)
+        return rep
+
+    @staticmethod
+    def flatten(
+        d: Mapping,
+        prefix: Tuple[str, ...] = (),
+    ) -> Tuple[Tuple[Tuple[str, ...], str], ...]:
+        """Flatten nested string values.
+
+        :param d: nested mapping of strings.
+        :param prefix: key path of `d`.
+
+        :returns: pairs of key paths and values, sorted by key path
+        """
+        items: List[Tuple[Tuple[str, ...], str]] = []
+        for key, value in d.items():
+            if isinstance(value, Mapping):
+                items.extend(Project.flatten(value, prefix + (key,)))
+            elif isinstance(value, str):
+                items.append((prefix + (key,), value))
+        return tuple(sorted(items))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def replacement_order(
+        flat: Tuple[Tuple[Tuple[str, ...], str], ...],
+    ) -> Tuple[Tuple[
+        Tuple[str, ...],
+        Optional[PlaceholderTemplate],
+        jinja2.Template,
+    ], ...]:
+        """Compile replacement strings with template markup in dependency
+        order.
+
+        :param flat: replacement string values; see `flatten()`.
+
+        :returns: key paths of replacement strings with template markup,
+                with their compiled templates (see '.placeholders', `None`
+                if not applicable) and template engine templates, such that
+                every replacement string comes after those it references
+        :raises: ValueError if replacement strings reference each other
+                cyclically
+        """
+        values = {
+            path: value for path, value in flat
+            if not analysis.is_verbatim(value.encode())
+        }
+        deps: Dict[Tuple[str, ...], List[Tuple[str, ...]]] = {}
+        for path, value in values.items():
+            deps[path] = []
+            for chain in analysis.references(value):
+                if chain[:2] != (analysis.CONTEXT_NAME,
+                                 analysis.REPLACE_SECTION):
+                    continue
+                ref = chain[2:]
+                deps[path].extend(
+                    other for other in values
+                    if other[:len(ref)] == ref or ref[:len(other)] == other
+                )
+        order: List[Tuple[str, ...]] = []
+        visiting: List[Tuple[str, ...]] = []
+
+        def visit(path: Tuple[str, ...]) -> None:
+            if path in order:
+                return
+            if path in visiting:
+                cycle = visiting[visiting.index(path):] + [path]
+                raise ValueError(
+                    "Replacement strings reference each other cyclically: "
+                    + " -> ".join('.'.join(item) for item in cycle)
+                )
+            visiting.append(path)
+            for dep in deps[path]:
+                visit(dep)
+            visiting.pop()
+            order.append(path)
+
+        for path in values:
+            visit(path)
+        env = jinja2.Environment(keep_trailing_newline=True)
+        return tuple(
+            (
+                path,
+                placeholders.compile(values[path]),
+                env.from_string(values[path]),
+            )
+            for path in order
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _load_replacements(replacement_yaml: str, mtime_ns: int) -> Mapping:
+        rep = Project.decode_replacements(
+            ConfigParser.yaml_to_dict(yaml_file=replacement_yaml),
+        )
+        ConfigParser.log_yaml(
+            header="=== REPLACEMENT STRING VALUES ===",
+            **rep,
+        )
+        return freeze(rep)
+
     def prepare_template(
         self,
-        root_dir: str = os.path.join(
-            os.path.dirname(__file__),
-            os.pardir,
-            os.pardir,
-            "tmp"
-        ),
+        root_dir: Optional[str] = None,
+        template_dir: Optional[Union[str, Traversable, TemplatePack]] = None,
+        cache_dir: Optional[str] = None,
+        cache: Optional[ResultCache] = None,
     ) -> None:
         """Set up temporary custom Cookiecutter with templates and default
         values according to project parameters.
 
+        Template files are staged concurrently in a thread pool; see
+        '.pool'.
+
+        The template tree depends only on which files are staged and on the
+        software requirements, not on the other parameters. Template trees
+        are therefore shared between all projects with the same signature
+        (see `signature()`): within a process, and, if a cache directory is
+        given, across runs. Only the replacement strings (see
+        `render_replacements()`) and the Cookiecutter context are resolved
+        and written per project.
+
+        If a result cache is given and it holds the project already, the
+        template tree is not staged; it is only staged by `render_project()`
+        if the cached project is evicted in between.
+
         :param root_dir: root directory for creating temporary Cookiecutter
-                project directories.
+                project directories; defaults to the system's directory for
+                temporary files.
+        :param template_dir: directory containing the template files that
+                the project template is assembled from, or a template pack
+                (see '.pack'), either opened or as a path; defaults to the
+                packaged templates.
+        :param cache_dir: directory to keep template trees in across runs;
+                if `None`, template trees are only shared within the current
+                process.
+        :param cache: cache of rendered projects; see '.results'.
 
         :returns: None
         :raises: IOError
         :raises: KeyError
         """
-        # Create template directory
+        pack: Optional[TemplatePack] = None
+        index: Optional[Mapping] = None
+        if template_dir is None:
+            template_dir = resources.data('templates')
+            index = analysis.packaged_index()
+        if isinstance(template_dir, TemplatePack):
+            pack = template_dir
+        elif isinstance(template_dir, str):
+            if TemplatePack.is_pack(template_dir):
+                with TemplatePack(template_dir) as pack:
+                    self.prepare_template(
+                        root_dir=root_dir,
+                        template_dir=pack,
+                        cache_dir=cache_dir,
+                        cache=cache,
+                    )
+                if self.template_dir is None:
+                    # The pack is closed by now; reopen it if the template
+                    # tree needs to be staged after all
+                    path = template_dir
+                    stage = self._stage_template
+
+                    def stage_from_pack() -> str:
+                        with TemplatePack(path) as pack:
+                            return stage(source=pack)
+
+                    self._stage_template = stage_from_pack
+                return
+            template_dir = pathlib.Path(template_dir)
+
+        # Create temporary project directory
         try:
-            pathlib.Path(root_dir).mkdir(parents=True, exist_ok=True)
+            if root_dir is not None:
+                pathlib.Path(root_dir).mkdir(parents=True, exist_ok=True)
             self.temp_dir = tempfile.mkdtemp(dir=root_dir)
         except Exception:
             raise IOError("Could not create temporary project directory.")
         logger.info(
-            f"Created project template directory at '{self.temp_dir}'."
+            f"Created temporary project directory at '{self.temp_dir}'."
         )
 
-        # Create destination directory
-        dst_dir = os.path.join(
-            self.temp_dir,
-            '{{cookiecutter.project.slug}}'
+        # Resolve template plan
+        plan = self.plan_template(
+            template_dir=template_dir if pack is None else pack.path,
         )
-        try:
-            pathlib.Path(dst_dir).mkdir(parents=False, exist_ok=False)
-        except Exception:
-            raise IOError("Could not create template directory.")
 
-        # Set source directory
-        src_dir = os.path.join(
-            os.path.dirname(__file__),
-            os.pardir,
-            os.pardir,
-            'templates',
+        # Resolve template markup in replacement strings
+        self.params['replace'] = Project.render_replacements(
+            replacements=plan['replace'],
+            params=self.params,
         )
 
-        # Get text replacement strings
-        self.params['replace'] = ConfigParser.yaml_to_dict(
-            yaml_file=self.replacement_yaml,
+        # Write cookiecutter config JSON to file
+        Project.write_file(
+            path=os.path.join(self.temp_dir, 'cookiecutter.json'),
+            contents=json.dumps(self.params, indent=2),
         )
-        ConfigParser.log_yaml(
-            header="=== REPLACEMENT STRING VALUES ===",
-            **self.params['replace'],
+
+        # Get shared template tree
+        source = template_dir if pack is None else pack
+        self.signature = Project.signature(
+            plan=plan,
+            fingerprint=Project.fingerprint(
+                source=source,
+                names=[item['src'] for item in plan['files']],
+            ),
+        )
+        self._stage_template = functools.partial(
+            Project.template_tree,
+            signature=self.signature,
+            plan=plan,
+            source=source,
+            root_dir=root_dir,
+            cache_dir=cache_dir,
+            index=index,
         )
-        rep = self.params['replace']
+        if cache is not None and ResultCache.key(
+            params=self.params,
+            signature=self.signature,
+        ) in cache:
+            logger.debug("Project is cached; not staging template tree.")
+            self.template_dir = None
+            return
+        self.template_dir = self._stage_template()
 
-        # Initialize requirements
-        requirements = []
+    @staticmethod
+    def fingerprint(
+        source: Union[Traversable, TemplatePack],
+        names: Sequence[str],
+    ) -> Dict[str, str]:
+        """Identify the versions of template files.
 
-        # Copy '.gitignore' file
-        file_src = os.path.join(src_dir, 'version_control', '.gitignore')
-        shutil.copy2(src=file_src, dst=dst_dir)
+        For template packs, the content hashes from the pack index are used;
+        for template directories, file sizes and modification times. Files of
+        other packaged templates (e.g., inside an archive) are hashed.
 
-        # Copy license
-        if self.params['project']['license'] != 'none':
-            file_src = os.path.join(
-                src_dir,
-                'licenses',
-                License[self.params['project']['license']].value
-            )
-            file_dst = os.path.join(dst_dir, 'LICENSE')
-            shutil.copy2(src=file_src, dst=file_dst)
+        :param source: template directory or template pack.
+        :param names: '/'-separated paths of template files.
 
-        # Copy 'contributors.md' file
-        file_src = os.path.join(src_dir, 'contributing', 'contributors.md')
-        shutil.copy2(src=file_src, dst=dst_dir)
+        :returns: dictionary of version identifiers by path
+        """
+        fingerprint = {}
+        for name in names:
+            if isinstance(source, TemplatePack):
+                token = source.index[name]['sha256']
+            else:
+                item = source / name
+                if isinstance(item, pathlib.Path):
+                    stat = item.stat()
+                    token = f"{stat.st_size}:{stat.st_mtime_ns}"
+                else:
+                    with item.open('rb') as fh:
+                        token = streams.sha256(fh)
+            fingerprint[name] = token
+        return fingerprint
 
-        # Copy packaging files
-        if YesNo[self.params['soft']['packaging']].value:
-            file_src = os.path.join(src_dir, 'packaging', 'setup.py')
-            shutil.copy2(src=file_src, dst=dst_dir)
-            file_src = os.path.join(src_dir, 'packaging', 'MANIFEST.in')
-            shutil.copy2(src=file_src, dst=dst_dir)
-            requirements.extend(['setuptools_git', 'twine'])
+    @staticmethod
+    def signature(
+        plan: Mapping,
+        fingerprint: Mapping[str, str],
+    ) -> str:
+        """Compute signature of a template tree.
 
-        # Copy `Dockerfile`
-        if YesNo[self.params['soft']['docker']].value:
-            file_src = os.path.join(src_dir, 'containers', 'Dockerfile')
-            shutil.copy2(src=file_src, dst=dst_dir)
+        Two projects with the same signature share the same template tree.
 
-        # Add linters
-        if 'none' not in self.params['soft']['linter']:
-            requirements.extend(
-                [Linter[item].value for item in self.params['soft']['linter']]
-            )
+        :param plan: template plan; see `plan_template()`.
+        :param fingerprint: versions of template files; see `fingerprint()`.
 
-        # Add test suites
-        if 'none' not in self.params['soft']['testing']:
-            requirements.extend(
-                [TestSuite[item].value for item in \
-                    self.params['soft']['testing']]
-            )
+        :returns: hexadecimal digest
+        """
+        key = json.dumps(
+            {
+                'files': plan['files'],
+                'requirements': plan['requirements'],
+                'fingerprint': fingerprint,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @staticmethod
+    def template_tree(
+        signature: str,
+        plan: Mapping,
+        source: Union[Traversable, TemplatePack],
+        root_dir: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        index: Optional[Mapping] = None,
+    ) -> str:
+        """Return template tree for a signature, staging it if needed.
+
+        Template trees staged in the current process are removed when the
+        interpreter exits, unless they are kept in a cache directory. Trees
+        are moved into the cache directory atomically once complete, so
+        that concurrent runs never see partial trees.
 
-        # Copy CI/CD configs
-        if 'none' not in self.params['soft']['ci_cd']:
-            for item in self.params['soft']['ci_cd']:
-                file_src = os.path.join(
-                    src_dir,
-                    'ci_cd',
-                    CI_CD[item].value,
+        :param signature: signature of template tree; see `signature()`.
+        :param plan: template plan; see `plan_template()`.
+        :param source: template directory or template pack.
+        :param root_dir: directory to stage template trees in if no cache
+                directory is given; defaults to the system's directory for
+                temporary files.
+        :param cache_dir: directory to keep template trees in across runs.
+        :param index: index of the template files; see `stage_template()`.
+
+        :returns: path to directory containing the template tree
+        :raises: IOError
+        """
+        with Project._template_trees_lock:
+            tree = Project._template_trees.get((signature, cache_dir))
+            if tree is not None and os.path.isdir(tree):
+                logger.debug(f"Reusing template tree '{tree}'.")
+                return tree
+            if cache_dir is not None:
+                tree = os.path.join(cache_dir, signature)
+                if not os.path.isdir(tree):
+                    pathlib.Path(cache_dir).mkdir(parents=True, exist_ok=True)
+                    staging_dir = tempfile.mkdtemp(
+                        prefix=f".{signature}.",
+                        dir=cache_dir,
+                    )
+                    Project.stage_template(
+                        plan=plan,
+                        source=source,
+                        tree=staging_dir,
+                        index=index,
+                    )
+                    try:
+                        os.rename(staging_dir, tree)
+                    except OSError:
+                        # Staged concurrently by another process
+                        shutil.rmtree(staging_dir, ignore_errors=True)
+                else:
+                    logger.debug(f"Reusing cached template tree '{tree}'.")
+            else:
+                try:
+                    tree = tempfile.mkdtemp(
+                        prefix="myproj_template_",
+                        dir=root_dir,
+                    )
+                except Exception:
+                    raise IOError("Could not create template directory.")
+                atexit.register(shutil.rmtree, tree, True)
+                Project.stage_template(
+                    plan=plan,
+                    source=source,
+                    tree=tree,
+                    index=index,
                 )
-                shutil.copy2(src=file_src, dst=dst_dir)
-            if not requirements:
-                rep['ci_cd']['install_requirements']['gitlab_docker'] = ""
-            if 'pytest' not in self.params['soft']['testing']:
-                rep['ci_cd']['test_pytest']['gitlab_docker'] = ""
-            if 'flake8' not in self.params['soft']['linter']:
-                rep['ci_cd']['test_flake8']['gitlab_docker'] = ""
-            if self.params['soft']['cli_script'] == "no":
-                rep['ci_cd']['test_cli']['gitlab_docker'] = ""
-
-        logger.warning(requirements)
-
-        # Write requirements to file
-        requirements_file = os.path.join(
-            dst_dir,
-            'requirements.txt',
+            Project._template_trees[(signature, cache_dir)] = tree
+            return tree
+
+    @staticmethod
+    def stage_template(
+        plan: Mapping,
+        source: Union[Traversable, TemplatePack],
+        tree: str,
+        index: Optional[Mapping] = None,
+    ) -> None:
+        """Stage template files and requirements in a template tree.
+
+        :param plan: template plan; see `plan_template()`.
+        :param source: template directory or template pack.
+        :param tree: directory to stage the template tree in.
+        :param index: index of the files of a template directory (see
+                '.analysis.packaged_index'); files whose hash matches their
+                index entry are classified from the index instead of being
+                scanned.
+
+        :returns: None
+        :raises: IOError
+        """
+        dst_dir = os.path.join(tree, TEMPLATE_ROOT)
+        try:
+            pathlib.Path(dst_dir).mkdir(parents=False, exist_ok=False)
+        except Exception:
+            raise IOError("Could not create template directory.")
+        logger.info(f"Staging template tree at '{tree}'.")
+
+        # Write requirements to file while template files are copied
+        requirements_written = pool.submit(
+            Project.write_file,
+            path=os.path.join(dst_dir, 'requirements.txt'),
+            contents='\n'.join(plan['requirements']),
         )
-        with open(requirements_file, 'w') as fh:
-            fh.write('\n'.join(requirements))
 
-        # Write cookiecutter config JSON to file
-        cookiecutter_config_file = os.path.join(
-            self.temp_dir,
-            'cookiecutter.json',
+        # Copy and classify template files; files are hashed while they are
+        # copied and only scanned if their hash is not indexed
+        def stage(item: Mapping) -> Optional[Dict]:
+            dst = os.path.join(dst_dir, item['dst'])
+            if isinstance(source, TemplatePack):
+                source.extract(name=item['src'], dst=dst)
+                entry = source.index[item['src']]
+                if not analysis.classify(
+                    digest=entry['sha256'],
+                    read=functools.partial(source.chunks, item['src']),
+                ):
+                    return None
+                return {'sha256': entry['sha256'], 'size': entry['size']}
+            entry = Project.copy_file(src=source / item['src'], dst=dst)
+            indexed = None if index is None else index['files'].get(
+                item['src']
+            )
+            if (
+                indexed is not None
+                and indexed['sha256'] == entry['sha256']
+            ):
+                verbatim = indexed['verbatim']
+            else:
+                verbatim = analysis.classify(
+                    digest=entry['sha256'],
+                    read=functools.partial(Project.read_file, dst),
+                )
+            return entry if verbatim else None
+
+        try:
+            verbatim = pool.map_threads(stage, plan['files'])
+        finally:
+            requirements = requirements_written.result()
+
+        # Record files without template markup
+        entries = {
+            item['dst'].replace(os.sep, '/'): entry
+            for item, entry in zip(plan['files'], verbatim)
+            if entry is not None
+        }
+        if analysis.is_verbatim('\n'.join(plan['requirements']).encode()):
+            entries['requirements.txt'] = requirements
+        Project.write_file(
+            path=os.path.join(tree, VERBATIM_MANIFEST),
+            contents=json.dumps(entries, indent=2, sort_keys=True),
         )
-        params_json = json.dumps(self.params, indent=2)
-        with open(cookiecutter_config_file, 'w') as fh:
-            fh.write(params_json)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def verbatim_files(tree: str) -> Mapping[str, Optional[Mapping]]:
+        """Return the files of a template tree that contain no template
+        markup.
+
+        :param tree: directory containing the template tree.
+
+        :returns: manifest entries (see '.manifest') by '/'-separated path
+                relative to the template root; empty if the template tree
+                was staged without recording verbatim files, and without
+                entries if it was staged without hashing them
+        """
+        try:
+            with open(os.path.join(tree, VERBATIM_MANIFEST)) as fh:
+                entries = json.load(fh)
+        except FileNotFoundError:
+            entries = {}
+        if isinstance(entries, list):
+            entries = dict.fromkeys(entries)
+        return MappingProxyType(entries)
+
+    @staticmethod
+    def copy_file(
+        src: Union[str, Traversable],
+        dst: str,
+    ) -> Dict:
+        """Copy file, including its metadata, hashing it while it is copied,
+        and record metrics.
+
+        :param src: path to source file; packaged data files that are not
+                available on the file system (e.g., inside an archive) are
+                copied without metadata.
+        :param dst: path to destination file.
+
+        :returns: manifest entry of file; see '.manifest'
+        """
+        h = hashlib.sha256()
+        if isinstance(src, (str, os.PathLike)):
+            src = pathlib.Path(src)
+        with src.open('rb') as fsrc, open(dst, 'wb') as fdst:
+            for chunk in streams.chunks(fsrc):
+                h.update(chunk)
+                fdst.write(chunk)
+            size = fdst.tell()
+        if isinstance(src, pathlib.Path):
+            shutil.copystat(src, dst)
+        metrics.count("files_copied")
+        metrics.count("bytes_written", size)
+        return {'sha256': h.hexdigest(), 'size': size}
+
+    @staticmethod
+    def read_file(path: str) -> Iterator[bytes]:
+        """Read file in chunks; see '.streams.chunks()'.
+
+        :param path: path to file.
+
+        :returns: iterator over bytes
+        """
+        with open(path, 'rb') as fh:
+            yield from streams.chunks(fh)
+
+    @staticmethod
+    def write_file(
+        path: str,
+        contents: str,
+    ) -> Dict:
+        """Write string to file and record metrics.
+
+        :param path: path to destination file.
+        :param contents: contents to write.
+
+        :returns: manifest entry of file; see '.manifest'
+        """
+        data = contents.encode()
+        with open(path, 'wb') as fh:
+            fh.write(data)
+        metrics.count("bytes_written", len(data))
+        return {'sha256': hashlib.sha256(data).hexdigest(), 'size': len(data)}
 
     def render_project(
         self,
+        store: Optional[OutputStore] = None,
+        cache: Optional[ResultCache] = None,
     ) -> None:
         """Render project template with user-defined parameters.
 
+        Each file of the template tree is rendered with the project
+        parameters as Cookiecutter context; see '.render'. Files are hashed
+        as they are written, so that the project's integrity manifest (see
+        '.manifest') is made without reading any file back.
+
+        :param store: if not `None`, rendered files are linked to identical
+                files of other projects in this store instead of being
+                written; see '.dedup'.
+        :param cache: if not `None`, a project rendered before with the same
+                parameters and template is materialized from this cache
+                instead of being rendered, and rendered projects are added
+                to it; see '.results'.
+
         :returns: None
+        :raises: FileExistsError
         """
         try:
             pathlib.Path(self.project_dir).mkdir(parents=True, exist_ok=False)
@@ -214,6 +855,26 @@ class Project:
                 "non-existing directory for the project path."
             )
             raise
+        if cache is not None:
+            key = ResultCache.key(params=self.params, signature=self.signature)
+            if cache.get(key=key, dst=self.project_dir):
+                return
+        if self.template_dir is None:
+            # Cached project was evicted after the template was prepared
+            self.template_dir = self._stage_template()
+        manifest.write(
+            project_dir=self.project_dir,
+            files=render.render_tree(
+                template_root=os.path.join(self.template_dir, TEMPLATE_ROOT),
+                project_dir=self.project_dir,
+                params=self.params,
+                verbatim=Project.verbatim_files(self.template_dir),
+                store=store,
+            ),
+        )
+        logger.info(f"Rendered project at '{self.project_dir}'.")
+        if cache is not None:
+            cache.put(key=key, src=self.project_dir)
 
     def clean_up(
         self,
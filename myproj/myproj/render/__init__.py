@@ -0,0 +1,226 @@
+"""
+Rendering of template trees into projects.
+
+Template trees (see '.project.Project.template_tree()') are rendered with
+the template engine directly, using the Cookiecutter context of a project,
+instead of through Cookiecutter. Cookiecutter copies and re-parses the whole
+template for every project it generates, so a template tree shared between
+projects would still be processed once per project. Here, one template
+environment, and the templates compiled by it, are kept per template tree
+(see `environment()`), so that each template file is parsed once per process
+however many projects are rendered from the tree. Files without template
+markup are copied as they are, and files with plain placeholders only are
+rendered by substitution (see '.placeholders').
+
+Files are written in a thread pool while the next files are rendered, and
+hashed as they are written; see `render_tree()`.
+"""
+import functools
+import hashlib
+import logging
+import os
+import pathlib
+from concurrent.futures import Future
+from typing import (Dict, Mapping, Optional)
+
+import jinja2
+
+from myproj import (metrics, placeholders, pool, streams)
+from myproj.dedup import (OutputStore, reflink)
+from myproj.placeholders import PlaceholderTemplate
+
+logger = logging.getLogger(__name__)
+
+
+def render_tree(
+    template_root: str,
+    project_dir: str,
+    params: Mapping,
+    verbatim: Mapping[str, Optional[Mapping]],
+    store: Optional[OutputStore] = None,
+) -> Dict[str, Dict]:
+    """Render all files of a template tree into a project directory.
+
+    :param template_root: root directory of template files.
+    :param project_dir: existing project directory.
+    :param params: project parameters, used as Cookiecutter context.
+    :param verbatim: files without template markup and their manifest
+            entries, if known; see '.project.Project.verbatim_files()'.
+    :param store: if not `None`, files are linked to identical files of
+            other projects in this store instead of being written; see
+            '.dedup'.
+
+    :returns: manifest entries (see '.manifest') by '/'-separated path
+    """
+    env = environment(template_root=template_root)
+    written: Dict[str, Future] = {}
+    for name in sorted(env.list_templates()):
+        path = os.path.join(project_dir, *name.split('/'))
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        if name in verbatim:
+            written[name] = pool.submit(
+                copy_output,
+                src=os.path.join(template_root, *name.split('/')),
+                path=path,
+                entry=verbatim[name],
+                store=store,
+            )
+            continue
+        contents = render_file(env=env, name=name, params=params)
+        written[name] = pool.submit(
+            write_output,
+            path=path,
+            contents=contents,
+            store=store,
+        )
+        metrics.count("files_rendered")
+    return {name: future.result() for name, future in written.items()}
+
+
+def render_file(
+    env: jinja2.Environment,
+    name: str,
+    params: Mapping,
+) -> str:
+    """Render a template file.
+
+    Templates consisting of plain placeholders only are rendered by
+    substitution (see '.placeholders'), all others by the template engine.
+
+    :param env: template environment; see `environment()`.
+    :param name: '/'-separated path of template file in environment.
+    :param params: project parameters.
+
+    :returns: str
+    """
+    compiled = compiled_template(
+        template_root=env.loader.searchpath[0],
+        name=name,
+    )
+    if compiled is not None:
+        try:
+            return compiled.render(params)
+        except KeyError:
+            pass
+    return env.get_template(name).render(cookiecutter=params)
+
+
+@functools.lru_cache(maxsize=1024)
+def compiled_template(
+    template_root: str,
+    name: str,
+) -> Optional[PlaceholderTemplate]:
+    """Return compiled template of a template file, if it consists of plain
+    placeholders only.
+
+    :param template_root: root directory of template files.
+    :param name: '/'-separated path of template file.
+
+    :returns: compiled template, or `None` if the file requires the template
+            engine
+    """
+    path = os.path.join(template_root, *name.split('/'))
+    with open(path, encoding='utf-8') as fh:
+        return placeholders.compile(fh.read())
+
+
+@functools.lru_cache(maxsize=64)
+def environment(template_root: str) -> jinja2.Environment:
+    """Return template environment for a template tree.
+
+    :param template_root: root directory of template files.
+
+    :returns: jinja2.Environment
+    """
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(template_root),
+        keep_trailing_newline=True,
+        auto_reload=False,
+    )
+
+
+def write_output(
+    path: str,
+    contents: str,
+    store: Optional[OutputStore] = None,
+) -> Dict:
+    """Write rendered file of a project.
+
+    :param path: path to destination file.
+    :param contents: contents to write.
+    :param store: if not `None`, the file is linked to identical files in
+            this store instead of being written; see '.dedup'.
+
+    :returns: manifest entry of file; see '.manifest'
+    """
+    data = contents.encode()
+    entry = {'sha256': hashlib.sha256(data).hexdigest(), 'size': len(data)}
+    if store is None:
+        with open(path, 'wb') as fh:
+            fh.write(data)
+        metrics.count("bytes_written", len(data))
+    else:
+        store.store(
+            digest=entry['sha256'],
+            path=path,
+            write=lambda fh: fh.write(data),
+        )
+    return entry
+
+
+def copy_output(
+    src: str,
+    path: str,
+    entry: Optional[Mapping] = None,
+    store: Optional[OutputStore] = None,
+) -> Dict:
+    """Copy verbatim file of a project.
+
+    :param src: path to file in template tree.
+    :param path: path to destination file.
+    :param entry: manifest entry of source file; hashed if `None`.
+    :param store: if not `None`, the file is linked to identical files in
+            this store instead of being copied; see '.dedup'.
+
+    :returns: manifest entry of file; see '.manifest'
+    """
+    if entry is None:
+        with open(src, 'rb') as fh:
+            entry = {
+                'sha256': streams.sha256(fh),
+                'size': os.fstat(fh.fileno()).st_size,
+            }
+    if store is None:
+        copy_verbatim(src=src, dst=path)
+    else:
+        store.store(
+            digest=entry['sha256'],
+            path=path,
+            write=functools.partial(streams.copy_file, src),
+        )
+    return dict(entry)
+
+
+def copy_verbatim(src: str, dst: str) -> None:
+    """Copy file contents without reading them into Python objects, and
+    record metrics.
+
+    The file is cloned where the file system supports it (see
+    '.dedup.reflink'), so that no data is copied at all; otherwise, it is
+    copied by the kernel (see '.streams'). Files are never hard linked to
+    the template tree, which is shared between projects.
+
+    :param src: path to source file.
+    :param dst: path to destination file.
+
+    :returns: None
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if reflink(src, dst):
+        size = os.path.getsize(dst)
+    else:
+        with open(dst, 'wb') as fh:
+            size = streams.copy_file(src=src, fdst=fh)
+    metrics.count("files_copied")
+    metrics.count("bytes_written", size)
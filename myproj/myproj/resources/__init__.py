@@ -0,0 +1,99 @@
+"""
+Access to data files shipped with the package.
+
+Configuration files and templates are read through 'importlib.resources' so
+that they are available both when the package is installed as a directory
+tree and when it is run from an archive, such as a zipapp.
+"""
+import atexit
+import functools
+import logging
+import os
+import pathlib
+from typing import (Dict, Tuple)
+
+try:
+    from importlib.resources import (as_file, files)
+    from importlib.abc import Traversable
+except ImportError:  # pragma: no cover; Python < 3.9
+    from importlib_resources import (as_file, files)  # type: ignore
+    from importlib_resources.abc import Traversable  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Paths of data files extracted from archives, by path components
+_extracted: Dict[Tuple[str, ...], str] = {}
+
+
+def data(*parts: str) -> Traversable:
+    """Return packaged data file or directory.
+
+    :param *parts: path components relative to the package root, e.g.,
+            `("config", "defaults.yaml")`.
+
+    :returns: importlib.abc.Traversable; a `pathlib.Path` if the package is
+            installed as a directory tree
+    """
+    return functools.reduce(
+        lambda resource, part: resource / part,
+        parts,
+        files("myproj"),
+    )
+
+
+def in_archive() -> bool:
+    """Return whether the package is run from an archive.
+
+    :returns: bool
+    """
+    return not isinstance(data(), pathlib.Path)
+
+
+def path(*parts: str) -> str:
+    """Return file system path to packaged data file.
+
+    Files inside archives are extracted to a temporary file on first access,
+    which is removed when the interpreter exits.
+
+    :param *parts: path components relative to the package root.
+
+    :returns: str
+    """
+    resource = data(*parts)
+    if isinstance(resource, pathlib.Path):
+        return str(resource)
+    if parts not in _extracted:
+        context = as_file(resource)
+        _extracted[parts] = str(context.__enter__())
+        atexit.register(context.__exit__, None, None, None)
+        logger.debug(
+            f"Extracted packaged file '{resource}' to '{_extracted[parts]}'."
+        )
+    return _extracted[parts]
+
+
+def user_config_file() -> str:
+    """Return path to the user-specific configuration file.
+
+    If the package is installed as a directory tree, the packaged file is
+    used. As archives are read-only, the file is otherwise kept in directory
+    'myproj' in the user's configuration directory (`$XDG_CONFIG_HOME` or
+    '~/.config'), where it is initialized from the packaged file on first
+    use.
+
+    :returns: str
+    """
+    resource = data("config", "user_config.yaml")
+    if isinstance(resource, pathlib.Path):
+        return str(resource)
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+        os.path.expanduser("~"),
+        ".config",
+    )
+    user_file = os.path.join(config_home, "myproj", "user_config.yaml")
+    if not os.path.isfile(user_file):
+        pathlib.Path(user_file).parent.mkdir(parents=True, exist_ok=True)
+        with open(user_file, 'wb') as fh:
+            fh.write(resource.read_bytes())
+        logger.debug(f"Initialized user config file '{user_file}'.")
+    return user_file
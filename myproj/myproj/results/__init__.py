@@ -0,0 +1,198 @@
+"""
+Cache of rendered projects.
+
+Projects generated again with identical parameters, template files and
+replacement strings (e.g., on retries or re-provisioning) by the same
+version of the renderer are materialized from a cache of previously
+rendered project trees instead of being rendered. Cached files are cloned
+into materialized projects where the file system supports it and copied
+otherwise, so that materialized files are independent and writable; see
+'.dedup.link()'. Like projects, cache entries have their manifest (see
+'.manifest') beside them. The least recently used entries are evicted once
+the cache holds more than a given number of projects.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Mapping
+
+import jinja2
+
+from myproj import (__version__, dedup, manifest, metrics, schema)
+
+logger = logging.getLogger(__name__)
+
+# Version of the code rendering projects; projects rendered by other
+# versions are not reused
+RENDERER_VERSION = f"myproj {__version__}; jinja2 {jinja2.__version__}"
+
+
+class ResultCache:
+    """Cache of rendered project trees, keyed by `key()`."""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_entries: int = 64,
+    ) -> None:
+        """Class constructor.
+
+        :param cache_dir: directory to keep rendered projects in; should be
+                on the same file system as the projects.
+        :param max_entries: maximum number of cached projects.
+
+        :returns: None
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+        self.method = (
+            dedup.REFLINK if dedup.supports_reflink(cache_dir) else dedup.COPY
+        )
+
+    @staticmethod
+    def key(
+        params: Mapping,
+        signature: str,
+        version: str = RENDERER_VERSION,
+    ) -> str:
+        """Compute canonical hash of a project.
+
+        Parameters that do not affect rendered files (see
+        '.schema.Field') are ignored.
+
+        :param params: complete project parameters, including replacement
+                strings.
+        :param signature: signature of the template tree; see
+                '.project.Project.signature()'.
+        :param version: version of the renderer.
+
+        :returns: hexadecimal digest
+        """
+        params = {
+            section: {
+                key: value for key, value in values.items()
+                if f"{section}.{key}" not in schema.UNRENDERED_FIELDS
+            } if isinstance(values, Mapping) else values
+            for section, values in params.items()
+        }
+        canonical = json.dumps(
+            {'params': params, 'signature': signature, 'version': version},
+            sort_keys=True,
+            separators=(',', ':'),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def __contains__(self, key: object) -> bool:
+        return os.path.isdir(self.entry_path(str(key)))
+
+    def entry_path(self, key: str) -> str:
+        """Return path of the cache entry for a key.
+
+        :param key: key of project; see `key()`.
+
+        :returns: str
+        """
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key: str, dst: str) -> bool:
+        """Materialize a cached project, if available.
+
+        :param key: key of project; see `key()`.
+        :param dst: existing, empty directory to materialize project in.
+
+        :returns: whether the project was cached
+        """
+        entry = self.entry_path(key)
+        if not os.path.isdir(entry):
+            metrics.count("cache_misses")
+            return False
+        os.utime(entry)
+        for dir_path, _, file_names in os.walk(entry):
+            rel_dir = os.path.relpath(dir_path, entry)
+            dst_dir = os.path.normpath(os.path.join(dst, rel_dir))
+            os.makedirs(dst_dir, exist_ok=True)
+            for file_name in file_names:
+                dedup.link(
+                    src=os.path.join(dir_path, file_name),
+                    dst=os.path.join(dst_dir, file_name),
+                    method=self.method,
+                )
+        if os.path.exists(manifest.path(entry)):
+            if os.path.lexists(manifest.path(dst)):
+                os.remove(manifest.path(dst))
+            dedup.link(
+                src=manifest.path(entry),
+                dst=manifest.path(dst),
+                method=self.method,
+            )
+        metrics.count("cache_hits")
+        logger.info(f"Materialized cached project '{key}' at '{dst}'.")
+        return True
+
+    def put(self, key: str, src: str) -> None:
+        """Add a rendered project to the cache and evict old entries.
+
+        The project is cloned or copied (see '.dedup.link()') into a
+        temporary directory that is moved into place once complete, so that
+        partial entries are never visible. The project's manifest, if any, is
+        added before.
+
+        :param key: key of project; see `key()`.
+        :param src: directory containing the rendered project.
+
+        :returns: None
+        """
+        entry = self.entry_path(key)
+        if os.path.isdir(entry):
+            return
+        staging_dir = tempfile.mkdtemp(prefix=f".{key}.", dir=self.cache_dir)
+        try:
+            for dir_path, _, file_names in os.walk(src):
+                rel_dir = os.path.relpath(dir_path, src)
+                dst_dir = os.path.normpath(os.path.join(staging_dir, rel_dir))
+                os.makedirs(dst_dir, exist_ok=True)
+                for file_name in file_names:
+                    dedup.link(
+                        src=os.path.join(dir_path, file_name),
+                        dst=os.path.join(dst_dir, file_name),
+                        method=self.method,
+                    )
+            if os.path.exists(manifest.path(src)):
+                if os.path.lexists(manifest.path(entry)):
+                    os.remove(manifest.path(entry))
+                dedup.link(
+                    src=manifest.path(src),
+                    dst=manifest.path(entry),
+                    method=self.method,
+                )
+            os.rename(staging_dir, entry)
+        except OSError as e:
+            logger.debug(f"Could not cache project '{key}': {e}")
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries in excess of `max_entries`.
+
+        :returns: None
+        """
+        entries = [
+            entry for entry in os.scandir(self.cache_dir)
+            if entry.is_dir() and not entry.name.startswith('.')
+        ]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+        for entry in entries[:len(entries) - self.max_entries]:
+            logger.debug(f"Evicting cached project '{entry.name}'.")
+            shutil.rmtree(entry.path, ignore_errors=True)
+            try:
+                os.remove(manifest.path(entry.path))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,656 @@
+"""
+Declarative schema of all project parameters.
+
+The schema is the single source of truth for the project parameters: the
+models in '.models', the packaged defaults file 'config/defaults.yaml', the
+description catalog 'config/descriptions.yaml' and the order in which
+'.params.GetParams' asks for missing parameters are all derived from it. To
+add a parameter, add a `Field` to `SCHEMA` and regenerate the defaults file
+and description catalog with 'scripts/generate_defaults.py'.
+"""
+import collections.abc
+from concurrent.futures import Future
+from datetime import date
+import logging
+import os
+import sys
+import threading
+from types import MappingProxyType
+from typing import (Any, Callable, Dict, FrozenSet, Iterator, List, Mapping,
+                    Optional, Set, Tuple)
+
+from myproj import utils
+
+logger = logging.getLogger(__name__)
+
+# Placeholder for default values that are inferred at runtime
+INFER = "<<<infer>>>"
+
+# Line width of descriptions in the description catalog and in user prompts
+DESCRIPTION_WIDTH = 76
+
+
+def _infer_user_email(p: Mapping, env: Mapping) -> str:
+    # Git reports unset variables as empty strings
+    try:
+        email = env['git_user_email']
+    except Exception:
+        email = ""
+    return email or f"{p['user']['slug']}@{p['org']['slug']}.com"
+
+
+# Lookups of the environment that inference rules depend on; as they do not
+# depend on any parameters, they can be performed ahead of time
+PROBES: Mapping[str, Callable[[], Any]] = MappingProxyType({
+    'git_user_name': lambda: utils.git_config("user.name"),
+    'git_user_email': lambda: utils.git_config("user.email"),
+    'cwd': os.getcwd,
+    'year': lambda: date.today().year,
+    'python_version': lambda: '.'.join(
+        str(i) for i in sys.version_info[0:3]
+    ),
+})
+
+
+class Probes(collections.abc.Mapping):
+    """Results of the environment lookups in `PROBES`.
+
+    Each lookup is performed at most once, on first access or, once
+    `start()` is called, in a background thread. Accessing a result that is
+    still being looked up waits for the lookup to finish; exceptions raised
+    by a lookup are re-raised on access.
+    """
+
+    def __init__(
+        self,
+        probes: Mapping[str, Callable[[], Any]] = PROBES,
+    ) -> None:
+        """Class constructor.
+
+        :param probes: lookup functions by name.
+
+        :returns: None
+        """
+        self._probes = probes
+        self._futures: Dict[str, Future] = {
+            name: Future() for name in probes
+        }
+        self._claimed: Set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def __getitem__(self, name: str) -> Any:
+        future = self._futures[name]
+        if self._claim(name):
+            self._look_up(name)
+        return future.result()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._probes)
+
+    def __len__(self) -> int:
+        return len(self._probes)
+
+    def start(self) -> "Probes":
+        """Perform all lookups in a background thread.
+
+        :returns: self
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._look_up_all,
+                    name="myproj-probes",
+                    daemon=True,
+                )
+                self._thread.start()
+        return self
+
+    def _claim(self, name: str) -> bool:
+        with self._lock:
+            if name in self._claimed:
+                return False
+            self._claimed.add(name)
+            return True
+
+    def _look_up(self, name: str) -> None:
+        future = self._futures[name]
+        try:
+            result = self._probes[name]()
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def _look_up_all(self) -> None:
+        for name in self._probes:
+            if self._claim(name):
+                self._look_up(name)
+
+
+class Field:
+    """Declaration of a single project parameter.
+
+    Fields are immutable; derived attributes, such as the key path and the
+    set of allowed values, are computed once on construction.
+    """
+    __slots__ = (
+        "section",
+        "key",
+        "value",
+        "description",
+        "choices",
+        "multiple",
+        "alternative",
+        "infer",
+        "rendered",
+        "path",
+        "allowed",
+    )
+
+    def __init__(
+        self,
+        section: str,
+        key: str,
+        value: Any,
+        description: str,
+        choices: Tuple[str, ...] = (),
+        multiple: bool = False,
+        alternative: Optional[str] = None,
+        infer: Optional[Callable[[Mapping, Mapping], Any]] = None,
+        rendered: bool = True,
+    ) -> None:
+        """Class constructor.
+
+        :param section: name of section the parameter belongs to, e.g.,
+                'org'.
+        :param key: name of parameter in section.
+        :param value: default value; `None` if the default is inferred at
+                runtime only.
+        :param description: human-readable description, shown when asking
+                the user for the parameter; see `descriptions()`.
+        :param choices: allowed values; any value is allowed if empty.
+        :param multiple: whether more than one of the choices can be picked;
+                values of such parameters are lists.
+        :param alternative: additional allowed value that opts out of all
+                choices, e.g., 'none'.
+        :param infer: function inferring a default value from the (partial)
+                parameters collected so far and the results of environment
+                lookups (see `Probes`); parameters are collected in the
+                order of `SCHEMA`.
+        :param rendered: whether the value may affect the contents of
+                rendered project files; if `False`, projects differing only
+                in the parameter are identical (see '.results').
+
+        :returns: None
+        """
+        set_ = object.__setattr__
+        set_(self, "section", section)
+        set_(self, "key", key)
+        set_(self, "value", value)
+        set_(self, "description", description)
+        set_(self, "choices", tuple(choices))
+        set_(self, "multiple", multiple)
+        set_(self, "alternative", alternative)
+        set_(self, "infer", infer)
+        set_(self, "rendered", rendered)
+        set_(self, "path", f"{section}.{key}")
+        allowed = frozenset(choices)
+        if alternative is not None:
+            allowed |= {alternative}
+        set_(self, "allowed", allowed)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("'Field' object is read-only")
+
+    def __repr__(self) -> str:
+        return f"Field('{self.path}')"
+
+    def to_defaults(self) -> Dict:
+        """Return the entry of the parameter in the defaults file.
+
+        :returns: dict
+        """
+        d: Dict = {
+            "value": INFER if self.value is None else self.value,
+        }
+        if self.choices:
+            d['choices'] = list(self.choices)
+            d['multiple'] = self.multiple
+            d['alternative'] = self.alternative
+        return d
+
+    def normalize(self, value: Any) -> Any:
+        """Bring a value into canonical form.
+
+        Values of parameters that allow multiple choices are split into
+        lists if they are given as comma-separated strings.
+
+        :param value: parameter value.
+
+        :returns: normalized value
+        """
+        if self.multiple and isinstance(value, str):
+            return [item.strip() for item in value.split(',')]
+        return value
+
+    def invalid(self, value: Any) -> List[str]:
+        """Return the items of a value that are not allowed.
+
+        :param value: normalized parameter value.
+
+        :returns: list of illegal items; empty if the value is valid
+        """
+        if not self.choices:
+            return []
+        items = value if self.multiple else [value]
+        return [item for item in items if item not in self.allowed]
+
+
+# All parameters, in the order in which they are collected
+SCHEMA: Tuple[Field, ...] = (
+    Field(
+        section='org',
+        key='name',
+        value='J Doe Org',
+        description=(
+            'Name of the organization that you are developing this project '
+            'for.'
+        ),
+    ),
+    Field(
+        section='org',
+        key='slug',
+        value=None,
+        description=(
+            'Machine-friendly short name of the organization used to build '
+            'reasonable defaults for organization spaces, e.g., at Docker '
+            'Hub.'
+        ),
+        infer=lambda p, env: utils.slugify(p['org']['name']),
+    ),
+    Field(
+        section='org',
+        key='copyright_owner',
+        value=None,
+        description=(
+            'Name of the copyright owner (most likey the organization that '
+            'you are developing the project for.'
+        ),
+        infer=lambda p, env: p['org']['name'],
+    ),
+    Field(
+        section='org',
+        key='git_host',
+        value=None,
+        description=(
+            "Your organization's space at a Git registry such as GitHub or "
+            'GitLab.'
+        ),
+        infer=lambda p, env: f"https://github.com/{p['org']['slug']}",
+    ),
+    Field(
+        section='org',
+        key='docker_host',
+        value=None,
+        description=(
+            "Your organization's space at a Docker registry such as Docker "
+            'Hub.'
+        ),
+        infer=lambda p, env: "registry.hub.docker.com/" + utils.slugify(
+            p['org']['name'],
+            whitespace_replace="",
+        ),
+    ),
+    Field(
+        section='user',
+        key='name',
+        value='J Doe',
+        description=(
+            'Your name as you would like to have it added to the project. You '
+            'will be listed as the maintainer of the project. If you are '
+            "creating the project on someone else's behalf, please add their "
+            'desired name.'
+        ),
+        infer=lambda p, env: env['git_user_name'],
+    ),
+    Field(
+        section='user',
+        key='slug',
+        value=None,
+        description=(
+            'Machine-friendly short user name or handle used to build '
+            'reasonable defaults for user spaces, e.g., at GitHub.'
+        ),
+        infer=lambda p, env: utils.slugify(p['user']['name']),
+    ),
+    Field(
+        section='user',
+        key='email',
+        value='j.doe@email.com',
+        description=(
+            'A single email address at which you would like to be contacted '
+            'with requests or questions regarding the project. If you are '
+            "creating the project on someone else's behalf, please add their "
+            'desired email address.'
+        ),
+        infer=_infer_user_email,
+    ),
+    Field(
+        section='user',
+        key='affiliation',
+        value=None,
+        description=(
+            'One or more organizations that you are affiliated with and that '
+            'you would like to be added to the project. Separate multiple '
+            'entries by the pipe or forward slash characters (|/). If you are '
+            "creating the project on someone else's behalf, please add their "
+            'desired affiliation(s).'
+        ),
+        infer=lambda p, env: p['org']['name'],
+    ),
+    Field(
+        section='user',
+        key='url',
+        value=None,
+        description=(
+            'A single personal URL that you would like to associate with the '
+            'project, such as your GitHub or LinkedIn URL. If you are '
+            "creating the project on someone else's behalf, please add their "
+            'desired URL.'
+        ),
+        infer=lambda p, env: f"https://github.com/{p['user']['slug']}",
+    ),
+    Field(
+        section='project',
+        key='name',
+        value='my project',
+        description=(
+            'Name of the project. Only used in human-readable documents.'
+        ),
+    ),
+    Field(
+        section='project',
+        key='slug',
+        value=None,
+        description=(
+            'Machine-friendly short descriptive name of the project. Only '
+            'lowercase characters and the underscore are allowed. NOTE: If '
+            'you enable any of the available facilitated publishing options '
+            '(e.g., Docker image or package registry), ideally this "project '
+            'slug" should still be available at the desired services, unless '
+            'you wish (and have the permissions) to upload and replace any '
+            'exisiting projects that use the same project slug. If naming '
+            'clashes cannot be avoided, the targets for each publishing '
+            'service can be modified further below, but note that '
+            'inconsistent naming of your project across different impedes '
+            'user experience.'
+        ),
+        infer=lambda p, env: utils.slugify(p['project']['name']),
+    ),
+    Field(
+        section='project',
+        key='path',
+        value=None,
+        description=(
+            'Desired root directory of the project. For safety reason, the '
+            'project will *not* be created if the directory exists.'
+        ),
+        infer=lambda p, env: f"{env['cwd']}{os.sep}{p['project']['slug']}",
+        rendered=False,
+    ),
+    Field(
+        section='project',
+        key='synopsis',
+        value='Changes the world given a YAML config file.',
+        description='Short description of what the project does.',
+    ),
+    Field(
+        section='project',
+        key='version',
+        value='0.1.0',
+        description=(
+            'Initial or current (for existing projects) version of the '
+            'project.'
+        ),
+    ),
+    Field(
+        section='project',
+        key='tags',
+        value='some tag, some other tag',
+        description=(
+            'List of relevant tags for the projects. Facilitates finding of '
+            'the project upon publication.'
+        ),
+    ),
+    Field(
+        section='project',
+        key='license',
+        value='apache2',
+        choices=('apache2', 'gplv3', 'mit', 'mozilla2'),
+        alternative='none',
+        description=(
+            'License to be added to the project root and to any relevant '
+            'metadata section.'
+        ),
+    ),
+    Field(
+        section='project',
+        key='copyright_year',
+        value=None,
+        description='Year for copyright notice.',
+        infer=lambda p, env: env['year'],
+    ),
+    Field(
+        section='project',
+        key='original_author',
+        value=None,
+        description=(
+            'Only enter if the original author is different from you (or the '
+            'person the project is created for).'
+        ),
+        infer=lambda p, env: p['user']['name'],
+    ),
+    Field(
+        section='project',
+        key='git_repo',
+        value=None,
+        description=(
+            'Remote URL where the project will be hosted (or is already '
+            'hosted, for existing projects). A remote origin targeting the '
+            'supplied URL will be added to the project. Make sure that the '
+            'provided repository exists and that you and any other authors '
+            'have the necessary permissions to push commits.'
+        ),
+        infer=lambda p, env: (
+            f"{p['org']['git_host']}{os.sep}{p['project']['slug']}"
+        ),
+    ),
+    Field(
+        section='project',
+        key='docker_image_name',
+        value=None,
+        description=(
+            'Docker image name for publishing a built Docker image to a '
+            'registry. Mind the rules that govern Docker image names. In '
+            'particular, note that if you desire to push to a registry that '
+            "is *not* Docker Hub, the target registry's URL needs to be added "
+            'to the beginning of the image name.'
+        ),
+        infer=lambda p, env: (
+            f"{p['org']['docker_host']}{os.sep}{p['project']['slug']}"
+        ),
+    ),
+    Field(
+        section='soft',
+        key='python_version',
+        value=None,
+        description='Python version to be used for development.',
+        infer=lambda p, env: env['python_version'],
+    ),
+    Field(
+        section='soft',
+        key='docs',
+        value='yes',
+        choices=('yes', 'no'),
+        description=(
+            'Should a basic documentation template be added to the project '
+            'root directory in file README.md?'
+        ),
+    ),
+    Field(
+        section='soft',
+        key='docker',
+        value='yes',
+        choices=('yes', 'no'),
+        description=(
+            'Should a Dockerfile template be added to the project root? This '
+            'allows the project to be built with all its dependencies in an '
+            'image that can then be used to execute the project reproducibly '
+            'in isolated "containers" which do not require installation and '
+            'are therefore particularly amenable to be run in the cloud or as '
+            'part of analysis workflows by workflow managers that support '
+            'containers. It further facilitates publishing and distribution '
+            'of the project via registries such as Docker Hub.'
+        ),
+    ),
+    Field(
+        section='soft',
+        key='packaging',
+        value='yes',
+        choices=('yes', 'no'),
+        description=(
+            'Should standard Python packaging files and software dependencies '
+            'be added to the project? This facilitates publishing and '
+            'distribution of the project, e.g., via the Python Package Index '
+            '(PyPI), as well as installation of the project via package '
+            'managers such as pip.'
+        ),
+    ),
+    Field(
+        section='soft',
+        key='cli_script',
+        value='yes',
+        choices=('yes', 'no'),
+        description=(
+            'Should a CLI script template be added to the source code '
+            'directory?'
+        ),
+    ),
+    Field(
+        section='soft',
+        key='linter',
+        value='flake8',
+        choices=('black', 'flake8', 'pylint', 'pyright'),
+        multiple=True,
+        alternative='none',
+        description=(
+            'Should one or more linters be added to the project? Selected '
+            'supported linters (separate multiple entries by commas) will be '
+            'added to the software requirements in file requirements.txt in '
+            'the project root.'
+        ),
+    ),
+    Field(
+        section='soft',
+        key='testing',
+        value='pytest',
+        choices=('pytest',),
+        multiple=True,
+        alternative='none',
+        description=(
+            'Should one or more testing frameworks be added to the project? '
+            'Selected supported testing frameworks (separate multiple entries '
+            'by commas) will be added to the software requirements in file '
+            'requirements.txt in the project root.'
+        ),
+    ),
+    Field(
+        section='soft',
+        key='ci_cd',
+        value='gitlab_docker',
+        choices=('gitlab_docker',),
+        multiple=True,
+        alternative='none',
+        description=(
+            'Should a CI/CD pipeline template file be added to the project? '
+            'This will enable easy configuration of automated testing and '
+            'publishing. By default, the running of tests (if selected) will '
+            'be added for every commit. Commands required for publishing the '
+            'project at hosting services (select below) will be added only '
+            'for pushes to the master branch. However, these will be '
+            'commented out in the generated template so that nothing is going '
+            'to be published unless you specifically opt in!'
+        ),
+    ),
+    Field(
+        section='soft',
+        key='auto_version_bump',
+        value='yes',
+        choices=('yes', 'no'),
+        description=(
+            'Include a pre-commit Git hook that automatically increases the '
+            'version number for each push to (or merges of feature branches '
+            'into) the master branch (only one version increase per '
+            'push/merge, not per commit). Note that this requires adherence '
+            'to semantic versioning (https://semver.org/). By default, only '
+            'the build number, based on the timestamp of the push/merge '
+            '(YYYYMMDDHHMMSS) is increased (or added, if previously absent). '
+            'Please add the following directives inside any of your commit '
+            'messages to increase the patch, minor or major version number '
+            'instead: [bump patch], [bump minor], [bump major]. In case of '
+            'multiple matching directives, only the highest priority '
+            'directive is considered.'
+        ),
+    ),
+)
+
+# Fields by key path, e.g., 'org.name'
+FIELDS: Mapping[str, Field] = MappingProxyType({
+    field.path: field for field in SCHEMA
+})
+
+# Field names by section, in the order of `SCHEMA`
+SECTIONS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    section: tuple(field.key for field in SCHEMA if field.section == section)
+    for section in dict.fromkeys(field.section for field in SCHEMA)
+})
+
+# Key paths of fields whose values do not affect rendered project files
+UNRENDERED_FIELDS: FrozenSet[str] = frozenset(
+    field.path for field in SCHEMA if not field.rendered
+)
+
+# Key paths of fields whose values are picked from a set of choices
+CHOICE_FIELDS: FrozenSet[str] = frozenset(
+    field.path for field in SCHEMA if field.choices
+)
+
+
+def defaults() -> Dict:
+    """Return the contents of the defaults file as nested dictionary.
+
+    :returns: dict
+    """
+    d: Dict = {section: {} for section in SECTIONS}
+    for field in SCHEMA:
+        d[field.section][field.key] = field.to_defaults()
+    return d
+
+
+def descriptions() -> Dict:
+    """Return the contents of the description catalog as nested dictionary.
+
+    Descriptions are wrapped to `DESCRIPTION_WIDTH`.
+
+    :returns: dict
+    """
+    import textwrap
+
+    d: Dict = {section: {} for section in SECTIONS}
+    for field in SCHEMA:
+        d[field.section][field.key] = textwrap.fill(
+            field.description,
+            width=DESCRIPTION_WIDTH,
+        )
+    return d
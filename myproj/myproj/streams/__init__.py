@@ -0,0 +1,134 @@
+"""
+Streaming of file contents.
+
+Templates may ship assets of any size, such as logos, sample datasets or
+prebuilt fixtures. Where file contents are only copied, hashed or scanned,
+they are therefore never read into memory as a whole: copies are made by
+the kernel, with `os.copy_file_range()` or `os.sendfile()`, and everything
+else reads files in chunks of fixed size, so that memory use does not grow
+with file sizes.
+"""
+import functools
+import hashlib
+import logging
+import os
+from typing import (BinaryIO, Callable, Iterator, List)
+
+logger = logging.getLogger(__name__)
+
+# Size of chunks in which file contents are read
+CHUNK_SIZE = 1 << 16
+
+
+def chunks(fh: BinaryIO, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Iterate over the contents of a file in chunks.
+
+    :param fh: file opened in binary mode.
+    :param size: maximum size of chunks.
+
+    :returns: iterator over bytes
+    """
+    return iter(functools.partial(fh.read, size), b"")
+
+
+def sha256(fh: BinaryIO) -> str:
+    """Hash the contents of a file.
+
+    :param fh: file opened in binary mode.
+
+    :returns: hexadecimal SHA-256 digest
+    """
+    h = hashlib.sha256()
+    for chunk in chunks(fh):
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def _copy_file_range(
+    fd_src: int,
+    fd_dst: int,
+    count: int,
+    offset: int,
+) -> int:
+    return os.copy_file_range(fd_src, fd_dst, count, offset)
+
+
+def _sendfile(fd_src: int, fd_dst: int, count: int, offset: int) -> int:
+    return os.sendfile(fd_dst, fd_src, offset, count)
+
+
+def _pread(fd_src: int, fd_dst: int, count: int, offset: int) -> int:
+    data = os.pread(fd_src, min(count, CHUNK_SIZE), offset)
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd_dst, view):]
+    return len(data)
+
+
+# Copy functions, in order of preference
+_COPY: List[Callable[[int, int, int, int], int]] = [
+    copy for name, copy in (
+        ('copy_file_range', _copy_file_range),
+        ('sendfile', _sendfile),
+        ('pread', _pread),
+    )
+    if hasattr(os, name)
+]
+
+
+def copy_range(
+    fd_src: int,
+    fd_dst: int,
+    count: int,
+    offset: int = 0,
+) -> int:
+    """Copy a range of bytes between files in the kernel.
+
+    Bytes are written at the current position of the destination file. The
+    position of the source file is not changed, so that ranges of the same
+    source file can be copied concurrently. Falls back to the next copy
+    function if a copy function fails, e.g., because it is not supported
+    for the file systems involved.
+
+    :param fd_src: file descriptor of source file.
+    :param fd_dst: file descriptor of destination file.
+    :param count: number of bytes to copy.
+    :param offset: offset of range in source file.
+
+    :returns: number of bytes copied; less than `count` if the end of the
+            source file is reached before
+    :raises: OSError if no copy function succeeds
+    """
+    copied = 0
+    for i, copy in enumerate(_COPY):
+        try:
+            while copied < count:
+                n = copy(fd_src, fd_dst, count - copied, offset + copied)
+                if not n:
+                    return copied
+                copied += n
+            return copied
+        except OSError as e:
+            if i == len(_COPY) - 1:
+                raise
+            logger.debug(f"Could not copy with '{copy.__name__}': {e}")
+    return copied
+
+
+def copy_file(src: str, fdst: BinaryIO) -> int:
+    """Copy the contents of a file into an open file in the kernel.
+
+    :param src: path to source file.
+    :param fdst: destination file opened in binary mode; contents are
+            written at its current position.
+
+    :returns: number of bytes copied
+    :raises: OSError
+    """
+    fdst.flush()
+    with open(src, 'rb') as fsrc:
+        return copy_range(
+            fd_src=fsrc.fileno(),
+            fd_dst=fdst.fileno(),
+            count=os.fstat(fsrc.fileno()).st_size,
+        )
@@ -13,7 +13,7 @@ setup(
     author="{{cookiecutter.project.original_author}}",
     maintainer="{{cookiecutter.user.name}}",
     maintainer_email="{{cookiecutter.user.email}}",
-{{cookiecutter.replace.packaging.entry_points_argument}}
+{{cookiecutter.replace.packaging.entry_points_arguments}}
     keywords=(
         '{{cookiecutter.project.tags}}'
     ),
@@ -0,0 +1,99 @@
+"""
+Helper functions shared by parameter handling modules.
+
+Kept separate from '.params' so that modules that '.params' depends on
+(e.g., '.schema') can use them without importing it.
+"""
+import os
+import string
+
+from myproj import metrics
+
+
+def git_config(key: str) -> str:
+    """Get value of a Git configuration variable.
+
+    :param key: name of configuration variable, e.g., 'user.name'.
+
+    :returns: str
+    :raises: re-raises any Exception from spawning the Git process
+    """
+    metrics.count("subprocesses")
+    return os.popen(f'git config --get {key}').read().rstrip()
+
+
+def slugify(
+    s: str,
+    allowed_start: str = string.ascii_lowercase,
+    allowed_end: str = string.ascii_lowercase + string.digits,
+    allowed_rest: str = string.ascii_lowercase + string.digits + "_",
+    lower: bool = True,
+    whitespace_replace: str = "_",
+) -> str:
+    """Transforms string into 'machine-readable' slugs.
+
+    :param s: string to be processed.
+    :param allowed_start: string of characters allowed in the first
+            position of the output string. The beginning of the input
+            string will be trimmed until the first allowed character.
+    :param allowed_end: string of characters allowed in the last
+            position of the output string. The end of the input string
+            will be trimmed from the last allowed character.
+    :param allowed_rest: string of characters allowed in all but the first
+            and last positions of the output string. Any characters that
+            are not allowed will be removed from the input string.
+    :param lower: whether uppercase characters should be transformed to
+            lower case.
+    :param whitespace_replace: string to replace all whitespace
+            characters. Runs of whitespace characters will be replaced by
+            a single instance of the string. Note that whitespace
+            replacement occurs before checking of allowed characters takes
+            place, so if this string contains characters not in the
+            allowed characters, these characters will be removed.
+
+    :returns: str
+    :raises: TypeError
+    """
+    if not type(s) is str:
+        raise TypeError(
+            f"Type 'str' expected, got '{type(s)}'"
+        )
+    if not type(allowed_start) is str:
+        raise TypeError(
+            f"Type 'str' expected, got '{type(allowed_start)}'"
+        )
+    if not type(allowed_end) is str:
+        raise TypeError(
+            f"Type 'str' expected, got '{type(allowed_end)}'"
+        )
+    if not type(allowed_rest) is str:
+        raise TypeError(
+            f"Type 'str' expected, got '{type(allowed_rest)}'"
+        )
+    if not type(lower) is bool:
+        raise TypeError(
+            f"Type 'bool' expected, got '{type(lower)}'"
+        )
+    if not type(whitespace_replace) is str:
+        raise TypeError(
+            f"Type 'str' expected, got '{type(whitespace_replace)}'"
+        )
+    if lower:
+        s = s.lower()
+    s = whitespace_replace.join(s.split())
+    c = 0
+    for c in range(0, len(s)):
+        if s[c] in allowed_start:
+            break
+    else:
+        c += 1
+    s = s[c:]
+    d = len(s)
+    for d in reversed(range(0, len(s))):
+        if s[d] in allowed_end:
+            break
+    else:
+        d -= 1
+    s = s[:d+1]
+    s = ''.join([c for c in s if c in allowed_rest])
+    return s
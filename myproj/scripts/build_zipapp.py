@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+"""
+Build a self-contained zipapp distribution of 'myproj'.
+
+The archive bundles the 'myproj' package, including its configuration files
+and templates, and (unless disabled) the pure-Python parts of all
+dependencies listed in 'requirements.txt'. All modules are precompiled, so
+that no bytecode needs to be generated when the archive is first run.
+"""
+
+import argparse
+import compileall
+import logging
+import os
+import py_compile
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipapp
+from typing import (Optional, Sequence)
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir,
+)
+PACKAGE_DIR = os.path.join(ROOT_DIR, "myproj")
+REQUIREMENTS_FILE = os.path.join(ROOT_DIR, "requirements.txt")
+ENTRY_POINT = "myproj.cli:run"
+# Compiled extensions cannot be imported from archives; packages that ship
+# them are expected to fall back to their pure-Python implementations
+EXTENSION_SUFFIXES = (".so", ".pyd", ".dylib")
+# Packaged templates are data files, even where they look like modules
+TEMPLATES_RX = re.compile(r"[/\\]myproj[/\\]templates[/\\]")
+
+
+def vendor_dependencies(
+    staging_dir: str,
+    requirements_file: str = REQUIREMENTS_FILE,
+) -> None:
+    """Install dependencies into staging directory.
+
+    :param staging_dir: directory the archive is built from.
+    :param requirements_file: pip requirements file.
+
+    :returns: None
+    :raises: subprocess.CalledProcessError
+    """
+    subprocess.run(
+        [
+            sys.executable, "-m", "pip", "install",
+            "--target", staging_dir,
+            "--no-compile",
+            "--disable-pip-version-check",
+            "--quiet",
+            "-r", requirements_file,
+        ],
+        check=True,
+    )
+    shutil.rmtree(os.path.join(staging_dir, "bin"), ignore_errors=True)
+    for dir_path, _, file_names in os.walk(staging_dir):
+        for file_name in file_names:
+            if file_name.endswith(EXTENSION_SUFFIXES):
+                os.remove(os.path.join(dir_path, file_name))
+
+
+def precompile(
+    staging_dir: str,
+    strip_sources: bool = False,
+) -> None:
+    """Compile all modules in staging directory to bytecode.
+
+    Bytecode files are written next to their sources, as 'zipimport' does not
+    look into '__pycache__' directories. Hash-based, unchecked bytecode files
+    are used, so that the interpreter does not compare them against the
+    modification times of their sources.
+
+    :param staging_dir: directory the archive is built from.
+    :param strip_sources: whether to remove sources of compiled modules.
+
+    :returns: None
+    :raises: RuntimeError
+    """
+    if not compileall.compile_dir(
+        staging_dir,
+        quiet=1,
+        legacy=True,
+        invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        rx=TEMPLATES_RX,
+    ):
+        raise RuntimeError("Modules could not be compiled.")
+    if strip_sources:
+        for dir_path, _, file_names in os.walk(staging_dir):
+            for file_name in file_names:
+                path = os.path.join(dir_path, file_name)
+                if TEMPLATES_RX.search(path):
+                    continue
+                if file_name.endswith(".py") and os.path.isfile(path + "c"):
+                    os.remove(path)
+
+
+def build(
+    output: str,
+    interpreter: Optional[str] = "/usr/bin/env python3",
+    vendor: bool = True,
+    strip_sources: bool = False,
+    compress: bool = False,
+) -> str:
+    """Build zipapp archive.
+
+    :param output: path to output archive.
+    :param interpreter: interpreter for the shebang line; no shebang line is
+            written if `None`.
+    :param vendor: whether to bundle dependencies.
+    :param strip_sources: whether to remove sources of compiled modules.
+    :param compress: whether to compress archive members; uncompressed
+            archives are larger but faster to start.
+
+    :returns: path to output archive
+    """
+    staging_dir = tempfile.mkdtemp(prefix="myproj_zipapp_")
+    try:
+        shutil.copytree(
+            PACKAGE_DIR,
+            os.path.join(staging_dir, "myproj"),
+            ignore=shutil.ignore_patterns("__pycache__", "*.pyc"),
+        )
+        if vendor:
+            logger.info("Vendoring dependencies...")
+            vendor_dependencies(staging_dir=staging_dir)
+        logger.info("Compiling modules...")
+        precompile(staging_dir=staging_dir, strip_sources=strip_sources)
+        zipapp.create_archive(
+            staging_dir,
+            target=output,
+            interpreter=interpreter,
+            main=ENTRY_POINT,
+            compressed=compress,
+        )
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    logger.info(f"Archive written to '{output}'.")
+    return output
+
+
+def parse_cli_args(args: Optional[Sequence[str]]) -> argparse.Namespace:
+    """Parse CLI arguments.
+
+    :param args: iterable containing command line parameters and arguments.
+
+    :returns: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--output', '-o',
+        default="myproj.pyz",
+        help="Path of the archive to build.",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        '--python',
+        default="/usr/bin/env python3",
+        help="Interpreter to write to the shebang line of the archive.",
+    )
+    parser.add_argument(
+        '--no-deps',
+        action='store_true',
+        default=False,
+        help=(
+            "Do not bundle dependencies; these then need to be installed "
+            "wherever the archive is run."
+        ),
+    )
+    parser.add_argument(
+        '--strip-sources',
+        action='store_true',
+        default=False,
+        help=(
+            "Remove module sources for which bytecode is available. Reduces "
+            "archive size at the cost of source lines in tracebacks."
+        ),
+    )
+    parser.add_argument(
+        '--compress',
+        action='store_true',
+        default=False,
+        help="Compress archive members.",
+    )
+    return parser.parse_args(args)
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    """Build archive as per CLI arguments.
+
+    :param args: iterable containing command line parameters and arguments.
+
+    :returns: exit status
+    """
+    args_parsed = parse_cli_args(args)
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    build(
+        output=args_parsed.output,
+        interpreter=args_parsed.python,
+        vendor=not args_parsed.no_deps,
+        strip_sources=args_parsed.strip_sources,
+        compress=args_parsed.compress,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
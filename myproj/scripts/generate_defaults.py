@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Generate the packaged defaults file 'myproj/config/defaults.yaml' and the
+description catalog 'myproj/config/descriptions.yaml' from the parameter
+schema in 'myproj.schema'.
+"""
+
+import argparse
+import os
+import sys
+from typing import (Callable, Dict, Optional, Sequence)
+
+import yaml
+
+ROOT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir,
+)
+# Import the package from the source tree only when run as a script, so that
+# importing this module does not shadow an installed package
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT_DIR)
+
+from myproj import schema  # noqa: E402
+
+DEFAULTS_FILE = os.path.join(ROOT_DIR, "myproj", "config", "defaults.yaml")
+DESCRIPTIONS_FILE = os.path.join(
+    ROOT_DIR,
+    "myproj",
+    "config",
+    "descriptions.yaml",
+)
+HEADER = (
+    "# THIS FILE IS GENERATED FROM 'myproj/schema/__init__.py' BY\n"
+    "# 'scripts/generate_defaults.py'. DO NOT EDIT IT DIRECTLY!\n"
+)
+
+
+class Dumper(yaml.SafeDumper):
+    """YAML dumper writing multi-line strings as literal blocks."""
+
+
+def _represent_str(dumper: yaml.SafeDumper, data: str) -> yaml.Node:
+    style = '|' if '\n' in data else None
+    return dumper.represent_scalar('tag:yaml.org,2002:str', data, style=style)
+
+
+Dumper.add_representer(str, _represent_str)
+
+
+def render(contents: Callable[[], Dict] = schema.defaults) -> str:
+    """Render file contents.
+
+    :param contents: function returning the file contents as nested
+            dictionary, by section; `schema.defaults()` for the defaults
+            file, `schema.descriptions()` for the description catalog.
+
+    :returns: str
+    """
+    sections = [
+        yaml.dump(
+            {section: values},
+            Dumper=Dumper,
+            default_flow_style=False,
+            sort_keys=False,
+            width=1000,
+        )
+        for section, values in contents().items()
+    ]
+    return HEADER + '\n'.join(sections)
+
+
+def parse_cli_args(args: Optional[Sequence[str]]) -> argparse.Namespace:
+    """Parse CLI arguments.
+
+    :param args: iterable containing command line parameters and arguments.
+
+    :returns: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--output', '-o',
+        default=DEFAULTS_FILE,
+        help="Path of the defaults file to write.",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        '--descriptions',
+        default=DESCRIPTIONS_FILE,
+        help="Path of the description catalog to write.",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        default=False,
+        help=(
+            "Do not write the file, but exit with a non-zero status if it is "
+            "not up to date."
+        ),
+    )
+    return parser.parse_args(args)
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    """Write or check defaults file and description catalog as per CLI
+    arguments.
+
+    :param args: iterable containing command line parameters and arguments.
+
+    :returns: exit status
+    """
+    args_parsed = parse_cli_args(args)
+    files = {
+        args_parsed.output: render(schema.defaults),
+        args_parsed.descriptions: render(schema.descriptions),
+    }
+    status = 0
+    for path, contents in files.items():
+        if args_parsed.check:
+            with open(path) as fh:
+                if fh.read() != contents:
+                    sys.stderr.write(
+                        f"'{path}' is out of date; run "
+                        f"'{os.path.basename(__file__)}' to regenerate it.\n"
+                    )
+                    status = 1
+            continue
+        with open(path, 'w') as fh:
+            fh.write(contents)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
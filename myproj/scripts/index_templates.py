@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Analyse the packaged templates in 'myproj/templates' and write the template
+index 'myproj/config/template_index.json', listing the parameters each
+template file references and the hash, size and classification used to
+classify it without scanning it when its hash matches (see
+'myproj.analysis.packaged_index()'). Malformed markup and references to
+undefined parameters or replacement strings are reported. Regenerate the
+index whenever the templates change.
+"""
+
+import argparse
+import os
+import sys
+from typing import (Dict, Optional, Sequence)
+
+import yaml
+
+ROOT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir,
+)
+# Import the package from the source tree only when run as a script, so that
+# importing this module does not shadow an installed package
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT_DIR)
+
+from myproj import (analysis, resources)  # noqa: E402
+
+INDEX_FILE = os.path.join(
+    ROOT_DIR, "myproj", "config", "template_index.json"
+)
+REPLACEMENTS_FILE = os.path.join(
+    ROOT_DIR, "myproj", "config", "replacement_strings.yaml"
+)
+
+
+def build() -> Dict:
+    """Build index of packaged templates.
+
+    :returns: dict
+    """
+    with open(REPLACEMENTS_FILE) as fh:
+        replacements = yaml.safe_load(fh)
+    return analysis.build_index(
+        template_dir=resources.data('templates'),
+        replacements=replacements,
+    )
+
+
+def parse_cli_args(args: Optional[Sequence[str]]) -> argparse.Namespace:
+    """Parse CLI arguments.
+
+    :param args: iterable containing command line parameters and arguments.
+
+    :returns: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--output', '-o',
+        default=INDEX_FILE,
+        help="Path of the index file to write.",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        default=False,
+        help=(
+            "Do not write the file, but exit with a non-zero status if it is "
+            "not up to date."
+        ),
+    )
+    parser.add_argument(
+        '--strict',
+        action='store_true',
+        default=False,
+        help="Exit with a non-zero status if any problems are found.",
+    )
+    return parser.parse_args(args)
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    """Write or check index file as per CLI arguments.
+
+    :param args: iterable containing command line parameters and arguments.
+
+    :returns: exit status
+    """
+    args_parsed = parse_cli_args(args)
+    index = build()
+    contents = analysis.dumps(index)
+    problems = analysis.problems(index)
+    for problem in problems:
+        sys.stderr.write(f"{problem}\n")
+    status = 1 if args_parsed.strict and problems else 0
+    if args_parsed.check:
+        with open(args_parsed.output) as fh:
+            if fh.read() != contents:
+                sys.stderr.write(
+                    f"'{args_parsed.output}' is out of date; run "
+                    f"'{os.path.basename(__file__)}' to regenerate it.\n"
+                )
+                return 1
+        return status
+    with open(args_parsed.output, 'w') as fh:
+        fh.write(contents)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,5 +11,7 @@ setup(
     packages=find_packages(),
     #packages=['myproj'],
     install_requires=install_requires,
+    # Data files are listed in 'MANIFEST.in'
+    include_package_data=True,
 )
 
@@ -0,0 +1,75 @@
+"""
+Smoke tests for the benchmark suite in 'benchmarks/'.
+"""
+import importlib.util
+import json
+import os
+import sys
+
+# test parameters
+BENCHMARK_DIR = os.path.join(
+    os.path.dirname(__file__),
+    os.pardir,
+    "benchmarks",
+)
+BENCHMARK_FILE = os.path.join(BENCHMARK_DIR, "pipeline.py")
+SUBSTITUTION_FILE = os.path.join(BENCHMARK_DIR, "substitution.py")
+SCENARIO = "small"
+PHASES = [
+    "defaults",
+    "config",
+    "validate",
+    "params",
+    "prepare",
+    "render",
+    "cleanup",
+]
+
+spec = importlib.util.spec_from_file_location("pipeline", BENCHMARK_FILE)
+pipeline = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(pipeline)
+
+
+def test_import_leaves_sys_path():
+    path = list(sys.path)
+    spec = importlib.util.spec_from_file_location("pipeline", BENCHMARK_FILE)
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
+    assert sys.path == path
+
+
+def test_run_scenario():
+    res = pipeline.run_scenario(name=SCENARIO, repeat=1)
+    assert list(res) == PHASES
+    for stats in res.values():
+        assert stats['runs'] == 1
+        assert stats['min'] <= stats['median'] <= stats['max']
+
+
+def test_main_writes_json(tmpdir):
+    output = os.path.join(str(tmpdir), "results.json")
+    assert pipeline.main([
+        "--scenario", SCENARIO, "--repeat", "1", "--output", output,
+    ]) == 0
+    with open(output) as fh:
+        res = json.load(fh)
+    assert list(res['scenarios']) == [SCENARIO]
+
+
+def test_compare_detects_regression():
+    results = {'scenarios': {SCENARIO: {"prepare": {"median": 2.0}}}}
+    baseline = {'scenarios': {SCENARIO: {"prepare": {"median": 1.0}}}}
+    assert pipeline.compare(results, baseline) == [f"{SCENARIO}/prepare"]
+    assert pipeline.compare(baseline, baseline) == []
+
+
+def test_substitution_run(monkeypatch):
+    monkeypatch.syspath_prepend(BENCHMARK_DIR)
+    spec = importlib.util.spec_from_file_location(
+        "substitution",
+        SUBSTITUTION_FILE,
+    )
+    substitution = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(substitution)
+    res = substitution.run(repeat=1)
+    assert res['templates']
+    assert res['total']['speedup'] > 0
@@ -0,0 +1,60 @@
+"""
+Smoke tests for the zipapp build script in 'scripts/'.
+"""
+import importlib.util
+import os
+import subprocess
+import sys
+import zipfile
+
+from myproj.cli import __version__
+
+# test parameters
+SCRIPT_FILE = os.path.join(
+    os.path.dirname(__file__),
+    os.pardir,
+    "scripts",
+    "build_zipapp.py",
+)
+TEMPLATE_MEMBER = "myproj/templates/licenses/mit"
+CONFIG_MEMBER = "myproj/config/defaults.yaml"
+COMPILED_MEMBER = "myproj/cli.pyc"
+
+spec = importlib.util.spec_from_file_location("build_zipapp", SCRIPT_FILE)
+build_zipapp = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(build_zipapp)
+
+
+def test_build(tmpdir):
+    output = os.path.join(str(tmpdir), "myproj.pyz")
+    res = build_zipapp.build(output=output, vendor=False)
+    assert res == output
+    with zipfile.ZipFile(output) as zf:
+        names = zf.namelist()
+    assert "__main__.py" in names
+    assert TEMPLATE_MEMBER in names
+    assert CONFIG_MEMBER in names
+    assert COMPILED_MEMBER in names
+    assert not any("__pycache__" in name for name in names)
+
+
+def test_build_strip_sources(tmpdir):
+    output = os.path.join(str(tmpdir), "myproj.pyz")
+    build_zipapp.build(output=output, vendor=False, strip_sources=True)
+    with zipfile.ZipFile(output) as zf:
+        names = zf.namelist()
+    assert COMPILED_MEMBER in names
+    assert "myproj/cli.py" not in names
+    assert TEMPLATE_MEMBER in names
+
+
+def test_run_archive(tmpdir):
+    output = os.path.join(str(tmpdir), "myproj.pyz")
+    build_zipapp.main(["--output", output, "--no-deps"])
+    res = subprocess.run(
+        [sys.executable, output, "--version"],
+        capture_output=True,
+        text=True,
+    )
+    assert res.returncode == 0
+    assert __version__ in res.stdout
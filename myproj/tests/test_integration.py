@@ -1,8 +1,12 @@
 #!/usr/bin/env python
+import ast
 import importlib.util
 import os
 
 import pytest
+import yaml
+
+from myproj.cli import run
 
 # test parameters
 CLI_FILE = os.path.join(
@@ -17,30 +21,121 @@ MAIN_FILE = os.path.join(
     "myproj",
     "__main__.py",
 )
-USER_INPUT = "user_input"
+USER_CONFIG = {
+    "org": {
+        "name": "J Doe Org",
+        "slug": "j_doe_org",
+        "copyright_owner": "J Doe Org",
+        "git_host": "https://github.com/j_doe_org",
+        "docker_host": "registry.hub.docker.com/jdoeorg",
+    },
+    "user": {
+        "name": "J Doe",
+        "slug": "j_doe",
+        "email": "j.doe@email.com",
+        "affiliation": "J Doe Org",
+        "url": "https://github.com/j_doe",
+    },
+    "soft": {
+        "python_version": "3.8.1",
+        "docs": "yes",
+        "docker": "yes",
+        "packaging": "yes",
+        "cli_script": "yes",
+        "linter": ["flake8"],
+        "testing": ["pytest"],
+        "ci_cd": ["gitlab_docker"],
+        "auto_version_bump": "yes",
+    },
+}
+PROJECT_CONFIG = {
+    "project": {
+        "name": "my project",
+        "slug": "my_project",
+        "synopsis": "Changes the world given a YAML config file.",
+        "version": "0.1.0",
+        "tags": "some tag, some other tag",
+        "license": "mit",
+        "copyright_year": "2020",
+        "original_author": "J Doe",
+        "git_repo": "https://github.com/j_doe_org/my_project",
+        "docker_image_name": "jdoeorg/my_project",
+    },
+}
+CI_SCRIPT = [
+    "python src/my_project.py --help",
+    "flake8 my_project/",
+    "pytest",
+]
 
 
-def test_cli(monkeypatch):
+@pytest.fixture
+def config_args(tmpdir, monkeypatch):
+    """Arguments for a non-interactive run with a complete config, creating
+    the project in a temporary directory. The user config is read from and
+    saved to a temporary file."""
+    user_config = os.path.join(str(tmpdir), "user_config.yaml")
+    with open(user_config, 'w') as fh:
+        yaml.safe_dump(USER_CONFIG, fh)
     monkeypatch.setattr(
-        'builtins.input',
-        lambda description: USER_INPUT,
+        'myproj.resources.user_config_file',
+        lambda: user_config,
     )
+    config = os.path.join(str(tmpdir), "project.yaml")
+    project_dir = os.path.join(str(tmpdir), "my_project")
+    with open(config, 'w') as fh:
+        yaml.safe_dump(
+            {"project": dict(PROJECT_CONFIG['project'], path=project_dir)},
+            fh,
+        )
+    return ["--config", config, "--no-input"], project_dir
+
+
+def test_cli(monkeypatch, config_args):
+    args, project_dir = config_args
+    monkeypatch.setattr('sys.argv', [CLI_FILE] + args)
+    monkeypatch.setattr('builtins.input', None)
     with pytest.raises(SystemExit) as error:
         fl = os.path.join(os.path.dirname(__file__), CLI_FILE)
         spec = importlib.util.spec_from_file_location('__main__', fl)
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
     assert error.value.code == 0
+    assert os.path.isdir(project_dir)
 
 
-def test_main(monkeypatch):
-    monkeypatch.setattr(
-        'builtins.input',
-        lambda description: USER_INPUT,
-    )
+def test_main(monkeypatch, config_args):
+    args, project_dir = config_args
+    monkeypatch.setattr('sys.argv', [MAIN_FILE] + args)
+    monkeypatch.setattr('builtins.input', None)
     with pytest.raises(SystemExit) as error:
         fl = os.path.join(os.path.dirname(__file__), MAIN_FILE)
         spec = importlib.util.spec_from_file_location('__main__', fl)
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
     assert error.value.code == 0
+    assert os.path.isdir(project_dir)
+
+
+def test_cli_renders_valid_project(config_args):
+    args, project_dir = config_args
+    with pytest.raises(SystemExit) as error:
+        run(args)
+    assert error.value.code == 0
+    for name in os.listdir(project_dir):
+        with open(os.path.join(project_dir, name)) as fh:
+            contents = fh.read()
+        assert "{{" not in contents
+        assert not any(line.startswith('"') for line in contents.split("\n"))
+    with open(os.path.join(project_dir, "setup.py")) as fh:
+        ast.parse(fh.read())
+    with open(os.path.join(project_dir, ".gitlab-ci.yml")) as fh:
+        ci = yaml.safe_load(fh)
+    assert ci['before_script'] == ["pip install -r requirements.txt"]
+    assert ci['test']['script'] == CI_SCRIPT
+    with open(os.path.join(project_dir, "Dockerfile")) as fh:
+        entrypoints = [
+            line for line in fh.read().splitlines()
+            if line.startswith("ENTRYPOINT")
+        ]
+    assert entrypoints == ['ENTRYPOINT ["src/my_project.py"]']
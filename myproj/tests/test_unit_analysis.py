@@ -0,0 +1,142 @@
+"""
+Unit tests for '.analysis'.
+"""
+import os
+
+import pytest
+
+from myproj import (analysis, resources)
+from myproj.config import ConfigParser
+
+# Test parameters
+INDEX = os.path.join(
+    os.path.dirname(__file__),
+    os.pardir,
+    "myproj",
+    "config",
+    "template_index.json",
+)
+REPLACEMENTS = ConfigParser.yaml_to_dict(
+    yaml_file=os.path.join(
+        os.path.dirname(__file__),
+        os.pardir,
+        "myproj",
+        "config",
+        "replacement_strings.yaml",
+    ),
+)
+TEMPLATE = (
+    "{{ cookiecutter.project.slug }} {{ cookiecutter['user']['name'] }}\n"
+    "{% for tag in cookiecutter.project.tags %}{{ tag }}{% endfor %}\n"
+)
+TEMPLATE_VARIABLES = ["project.slug", "project.tags", "user.name"]
+MALFORMED = b'LABEL software.license="{{cookiecutter.project.license"\n'
+UNDEFINED = (
+    b"{{cookiecutter.python_version}} "
+    b"{{cookiecutter.replace.packaging.entry_points_argument}} "
+    b"{{cookiecutter.soft.python_version}} {{other}}"
+)
+UNUSED_TEMPLATES = "LATER/"
+DIGEST = "f" * 64
+BINARY = b"\x89PNG\r\n\x1a\n\x00{{\xff"
+
+
+# is_verbatim() / scan() / classify()
+def test_is_verbatim():
+    assert analysis.is_verbatim(b"*.pyc\n") is True
+    assert analysis.is_verbatim(MALFORMED) is False
+    assert analysis.is_verbatim(b"{# comment #}") is False
+    assert analysis.is_verbatim(BINARY) is True
+
+
+def test_scan_markup_across_chunks():
+    assert analysis.scan([b"a{", b"{b"]) is False
+    assert analysis.scan([b"a{", b"", b"#b"]) is False
+    assert analysis.scan([b"a{", b"b{"]) is True
+    assert analysis.scan([MALFORMED[:3], MALFORMED[3:], BINARY]) is True
+
+
+def test_classify_cached_by_digest():
+    reads = []
+
+    def read():
+        reads.append(1)
+        return [TEMPLATE.encode()]
+
+    assert analysis.classify(digest=DIGEST, read=read) is False
+    assert analysis.classify(digest=DIGEST, read=read) is False
+    assert reads == [1]
+
+
+# references()
+def test_references():
+    chains = analysis.references(TEMPLATE)
+    assert ['.'.join(chain[1:]) for chain in chains] == TEMPLATE_VARIABLES
+
+
+# analyse_file()
+def test_analyse_file_malformed():
+    entry = analysis.analyse_file(data=MALFORMED, replacements=REPLACEMENTS)
+    assert len(entry['problems']) == 1
+    assert entry['problems'][0].startswith("line 1: unexpected char")
+
+
+def test_analyse_file_undefined():
+    entry = analysis.analyse_file(data=UNDEFINED, replacements=REPLACEMENTS)
+    assert entry['problems'] == [
+        "undefined parameter 'cookiecutter.python_version'",
+        "undefined replacement string "
+        "'cookiecutter.replace.packaging.entry_points_argument'",
+        "undefined variable 'other'",
+    ]
+
+
+def test_analyse_file_binary():
+    entry = analysis.analyse_file(data=b"\xff\xfe", replacements={})
+    assert entry['binary'] is True
+    assert entry['verbatim'] is True
+    assert entry['size'] == 2
+
+
+# build_index()
+def test_packaged_templates_have_no_problems():
+    index = analysis.build_index(
+        template_dir=resources.data('templates'),
+        replacements=REPLACEMENTS,
+    )
+    assert not [
+        problem for problem in analysis.problems(index)
+        if not problem.startswith(UNUSED_TEMPLATES)
+    ]
+
+
+def test_index_file_in_sync():
+    index = analysis.build_index(
+        template_dir=resources.data('templates'),
+        replacements=REPLACEMENTS,
+    )
+    assert analysis.load_index(INDEX) == index
+
+
+# load_index()
+def test_load_index_wrong_version(tmpdir):
+    path = os.path.join(str(tmpdir), "index.json")
+    with open(path, 'w') as fh:
+        fh.write(analysis.dumps({'version': 0, 'files': {}}))
+    with pytest.raises(ValueError):
+        analysis.load_index(path)
+
+
+# packaged_index()
+def test_packaged_index():
+    assert analysis.packaged_index() == analysis.load_index(INDEX)
+
+
+# affected()
+def test_affected():
+    index = analysis.load_index(INDEX)
+    assert analysis.affected(index, ["soft.python_version"]) == [
+        "ci_cd/.gitlab-ci.yml",
+        "containers/Dockerfile",
+    ]
+    assert "licenses/mit" in analysis.affected(index, ["org"])
@@ -1,12 +1,16 @@
 """
 Unit tests for module '.cli'.
 """
+import json
 import logging
 import os
+import subprocess
+import sys
 
 import pytest
 
-from myproj.cli import (main, parse_cli_args, setup_logging)
+from myproj import logs
+from myproj.cli import (main, parse_cli_args, run, setup_logging)
 
 # test parameters
 CONFIG_FILE = os.path.join(
@@ -17,6 +21,7 @@ CONFIG_FILE = os.path.join(
 DEFAULTS = os.path.join(
     os.path.dirname(__file__),
     os.pardir,
+    "myproj",
     "config",
     "defaults.yaml",
 )
@@ -44,24 +49,63 @@ VERBOSE_LOG_LEVEL = logging.INFO
 DEBUG_LOG_LEVEL = logging.DEBUG
 USER_INPUT = "user_input"
 DEFAULT_DICT_GENERIC = {'value': "", 'description': ""}
+ROOT_DIR = os.path.join(
+    os.path.dirname(__file__),
+    os.pardir,
+)
+FAST_PATH_OPTIONS = [["--help"], ["--version"], [INVALID_OPTION]]
+HEAVY_MODULES = {"addict", "cookiecutter", "jinja2", "yaml"}
+IMPORT_TIME_BUDGET_US = 60000
+PROFILE_OPTION = "profile"
+METRICS_OPTION = "metrics"
+PLAN_OPTION = "plan"
+TEMPLATES_OPTION = "templates"
+CACHE_DIR_OPTION = "cache-dir"
+NO_INPUT_OPTION = "no-input"
+LOG_FILE_OPTION = "log-file"
+PACK_COMMAND = "pack-templates"
+VERIFY_COMMAND = "verify"
+PROFILED_PHASES = ["defaults", "config", "params", "user_config"]
+
+
+def import_times(*args):
+    """Run interpreter with '-X importtime' and return a dictionary of
+    cumulative import times (in microseconds) by module name."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
 
 
 # main()
-def test_main_with_default_args(monkeypatch):
+def test_main_with_default_args(monkeypatch, tmpdir):
+    monkeypatch.chdir(tmpdir)
     monkeypatch.setattr(
         'builtins.input',
         lambda description: USER_INPUT,
     )
+    monkeypatch.setattr(sys.stdin, 'isatty', lambda: True)
     with pytest.raises(SystemExit) as e:
         main()
     assert e.value.code == 0
 
 
-def test_main_with_no_config_files(monkeypatch):
+def test_main_with_no_config_files(monkeypatch, tmpdir):
+    monkeypatch.chdir(tmpdir)
     monkeypatch.setattr(
         'builtins.input',
         lambda description: USER_INPUT,
     )
+    monkeypatch.setattr(sys.stdin, 'isatty', lambda: True)
     with pytest.raises(SystemExit) as e:
         main(
             config_files=None,
@@ -69,11 +113,13 @@ def test_main_with_no_config_files(monkeypatch):
     assert e.value.code == 0
 
 
-def test_main_with_explicit_args(monkeypatch):
+def test_main_with_explicit_args(monkeypatch, tmpdir):
+    monkeypatch.chdir(tmpdir)
     monkeypatch.setattr(
         'builtins.input',
         lambda description: USER_INPUT,
     )
+    monkeypatch.setattr(sys.stdin, 'isatty', lambda: True)
     with pytest.raises(SystemExit) as e:
         main(
             defaults_file=DEFAULTS,
@@ -98,13 +144,164 @@ def test_main_with_corrupt_defaults():
     assert e.value.code == 1
 
 
-def test_main_with_defaults_and_complete_config_list():
+def test_main_with_defaults_and_complete_config_list(monkeypatch, tmpdir):
+    monkeypatch.chdir(tmpdir)
+    with pytest.raises(SystemExit) as e:
+        main(
+            defaults_file=DEFAULTS,
+            config_files=[PARAMS],
+        )
+    assert e.value.code == 0
+
+
+def test_main_with_profile(monkeypatch, tmpdir):
+    monkeypatch.chdir(tmpdir)
+    with pytest.raises(SystemExit):
+        main(
+            defaults_file=DEFAULTS,
+            config_files=[PARAMS],
+            profile_dir=str(tmpdir),
+        )
+    for phase in PROFILED_PHASES:
+        assert os.path.isfile(os.path.join(str(tmpdir), f"{phase}.pstats"))
+    assert os.path.isfile(os.path.join(str(tmpdir), "profile.collapsed"))
+
+
+def test_main_with_metrics(monkeypatch, tmpdir):
+    monkeypatch.chdir(tmpdir)
+    metrics_file = os.path.join(str(tmpdir), "metrics.json")
+    with pytest.raises(SystemExit):
+        main(
+            defaults_file=DEFAULTS,
+            config_files=[PARAMS],
+            metrics_file=metrics_file,
+        )
+    with open(metrics_file) as fh:
+        phases = json.load(fh)['phases']
+    for phase in PROFILED_PHASES:
+        assert phase in phases
+
+
+def test_main_with_unwritable_metrics(monkeypatch, tmpdir):
+    monkeypatch.chdir(tmpdir)
+    metrics_file = os.path.join(str(tmpdir), "missing", "metrics.json")
     with pytest.raises(SystemExit) as e:
         main(
             defaults_file=DEFAULTS,
             config_files=[PARAMS],
+            plan=True,
+            metrics_file=metrics_file,
+        )
+    assert e.value.code == 0
+    assert not os.path.exists(metrics_file)
+
+
+def test_main_with_project_log_dir(monkeypatch, tmpdir):
+    monkeypatch.chdir(tmpdir)
+    log_dir = os.path.join(str(tmpdir), "logs")
+    setup_logging(LOGGER)
+    with pytest.raises(SystemExit) as e:
+        main(
+            defaults_file=DEFAULTS,
+            config_files=[PARAMS],
+            project_log_dir=log_dir,
+        )
+    assert e.value.code == 0
+    log_files = os.listdir(log_dir)
+    assert len(log_files) == 1
+    assert log_files[0].endswith(".log")
+    with open(os.path.join(log_dir, log_files[0])) as fh:
+        assert "Re-activate cleanup" in fh.read()
+
+
+def test_main_with_plan(tmpdir, capsys):
+    plan_config = os.path.join(str(tmpdir), "plan.yaml")
+    with open(PARAMS) as fh:
+        contents = fh.read()
+    with open(plan_config, 'w') as fh:
+        fh.write(
+            contents
+            .replace("linter: flake8", "linter: [flake8]")
+            .replace("testing: pytest", "testing: [pytest]")
+            .replace("ci_cd: gitlab_docker", "ci_cd: [gitlab_docker]")
+            .replace("path: <<<infer>>>", f"path: {tmpdir}/project")
+        )
+    with pytest.raises(SystemExit) as e:
+        main(
+            defaults_file=DEFAULTS,
+            config_files=[plan_config],
+            plan=True,
+        )
+    assert e.value.code == 0
+    res = json.loads(capsys.readouterr().out)
+    assert list(res) == ['params', 'template']
+    assert res['template']['files']
+    assert not os.path.exists(os.path.join(str(tmpdir), "project"))
+
+
+def test_main_with_template_pack(tmpdir, capsys):
+    pack_file = os.path.join(str(tmpdir), "templates.mptpk")
+    with pytest.raises(SystemExit) as e:
+        run([PACK_COMMAND, "--output", pack_file])
+    assert e.value.code == 0
+    with pytest.raises(SystemExit) as e:
+        main(
+            defaults_file=DEFAULTS,
+            config_files=[PARAMS],
+            plan=True,
+            template_dir=pack_file,
+        )
+    assert e.value.code == 0
+    res = json.loads(capsys.readouterr().out)
+    assert res['template']['template_dir'] == pack_file
+
+
+def test_verify_command(tmpdir, capsys):
+    project_dir = os.path.join(str(tmpdir), "project")
+    with open(PARAMS) as fh:
+        contents = fh.read()
+    config = os.path.join(str(tmpdir), "config.yaml")
+    with open(config, 'w') as fh:
+        fh.write(contents.replace("path: <<<infer>>>", f"path: {project_dir}"))
+    with pytest.raises(SystemExit) as e:
+        main(
+            defaults_file=DEFAULTS,
+            config_files=[config],
         )
     assert e.value.code == 0
+    with pytest.raises(SystemExit) as e:
+        run([VERIFY_COMMAND, project_dir])
+    assert e.value.code == 0
+    with open(os.path.join(project_dir, "LICENSE"), 'a') as fh:
+        fh.write("modified")
+    with pytest.raises(SystemExit) as e:
+        run([VERIFY_COMMAND, project_dir])
+    assert e.value.code == 1
+    assert "LICENSE: size mismatch" in capsys.readouterr().out
+
+
+def test_main_non_interactive_with_missing_params(monkeypatch, tmpdir):
+    monkeypatch.chdir(tmpdir)
+    monkeypatch.setattr('builtins.input', None)
+    with pytest.raises(SystemExit) as e:
+        main(
+            config_files=None,
+            interactive=False,
+        )
+    assert e.value.code == 1
+    assert not os.listdir(str(tmpdir))
+
+
+def test_main_without_terminal_is_non_interactive(monkeypatch, tmpdir):
+    monkeypatch.chdir(tmpdir)
+    monkeypatch.setattr('builtins.input', None)
+    monkeypatch.setattr(sys.stdin, 'isatty', lambda: False)
+    with pytest.raises(SystemExit) as e:
+        main(
+            config_files=None,
+        )
+    assert e.value.code == 1
+    assert not os.listdir(str(tmpdir))
 
 
 # parse_cli_args()
@@ -145,6 +342,57 @@ def test_multi_file_returns_list_of_strings():
         assert type(arg) is str
 
 
+def test_profile_option():
+    ret = parse_cli_args(["--" + PROFILE_OPTION, VALID_FILE])
+    assert vars(ret)[PROFILE_OPTION] == VALID_FILE
+    assert vars(parse_cli_args([]))[PROFILE_OPTION] is None
+
+
+def test_metrics_option():
+    ret = parse_cli_args(["--" + METRICS_OPTION, VALID_FILE])
+    assert vars(ret)[METRICS_OPTION] == VALID_FILE
+
+
+def test_plan_option():
+    ret = parse_cli_args(["--" + PLAN_OPTION])
+    assert vars(ret)[PLAN_OPTION] is True
+
+
+def test_templates_option():
+    ret = parse_cli_args(["--" + TEMPLATES_OPTION, VALID_FILE])
+    assert vars(ret)[TEMPLATES_OPTION] == VALID_FILE
+    assert vars(ret)['command'] is None
+
+
+def test_cache_dir_option():
+    ret = parse_cli_args(["--" + CACHE_DIR_OPTION, VALID_FILE])
+    assert ret.cache_dir == VALID_FILE
+    assert parse_cli_args([]).cache_dir is None
+
+
+def test_no_input_option():
+    assert vars(parse_cli_args(["--" + NO_INPUT_OPTION]))['no_input'] is True
+    assert vars(parse_cli_args([]))['no_input'] is False
+
+
+def test_log_file_option():
+    ret = parse_cli_args(["--" + LOG_FILE_OPTION, VALID_FILE])
+    assert ret.log_file == VALID_FILE
+
+
+def test_pack_templates_command():
+    ret = parse_cli_args([PACK_COMMAND, "--output", VALID_FILE])
+    assert ret.command == PACK_COMMAND
+    assert ret.output == VALID_FILE
+    assert ret.template_dir is None
+
+
+def test_verify_command_args():
+    ret = parse_cli_args([VERIFY_COMMAND, VALID_FILE])
+    assert ret.command == VERIFY_COMMAND
+    assert ret.project_dir == VALID_FILE
+
+
 def test_action_open_invalid_file():
     with pytest.raises(SystemExit):
         assert parse_cli_args(["--" + FILE_OPTION, INVALID_FILE])
@@ -155,6 +403,20 @@ def test_no_arg():
         assert parse_cli_args(["--" + FILE_OPTION])
 
 
+# import time
+def test_fast_path_does_not_import_heavy_modules():
+    for options in FAST_PATH_OPTIONS:
+        times = import_times("-m", "myproj.cli", *options)
+        assert times
+        imported = {module.split(".")[0] for module in times}
+        assert not imported & HEAVY_MODULES
+
+
+def test_import_time_budget():
+    times = import_times("-c", "import myproj.cli")
+    assert times["myproj.cli"] < IMPORT_TIME_BUDGET_US
+
+
 # setup_logging()
 def test_default_log_level():
     setup_logging(LOGGER)
@@ -176,5 +438,22 @@ def test_log_level_precedence():
     assert LOGGER.level == DEBUG_LOG_LEVEL
 
 
+def test_setup_logging_idempotent():
+    setup_logging(LOGGER)
+    handlers = list(LOGGER.handlers)
+    setup_logging(LOGGER, verbose=True)
+    assert LOGGER.handlers == handlers
+
+
+def test_setup_logging_log_file(tmpdir):
+    log_file = os.path.join(str(tmpdir), "myproj.log")
+    logger = logging.getLogger("test_setup_logging_log_file")
+    setup_logging(logger, log_file=log_file)
+    logger.warning("message")
+    logs.shutdown()
+    with open(log_file) as fh:
+        assert "message" in fh.read()
+
+
 def test_missing_logger():
     assert setup_logging() is None
@@ -0,0 +1,123 @@
+"""
+Unit tests for '.dedup'.
+"""
+import os
+import stat
+
+import pytest
+
+from myproj import dedup
+from myproj.dedup import OutputStore
+
+# Test parameters
+CONTENTS = "contents\n"
+OTHER_CONTENTS = b"other contents\n"
+
+
+# supports_reflink()
+def test_supports_reflink(tmpdir):
+    assert isinstance(dedup.supports_reflink(str(tmpdir)), bool)
+    assert os.listdir(str(tmpdir)) == []
+
+
+# link()
+def test_link_hardlink(tmpdir):
+    src = os.path.join(str(tmpdir), "src")
+    dst = os.path.join(str(tmpdir), "dst")
+    with open(src, 'w') as fh:
+        fh.write(CONTENTS)
+    assert dedup.link(src=src, dst=dst, method=dedup.HARDLINK) == \
+        dedup.HARDLINK
+    assert os.path.samefile(src, dst)
+
+
+def test_link_unknown_method(tmpdir):
+    with pytest.raises(ValueError):
+        dedup.link(src="src", dst="dst", method="symlink")
+
+
+# OutputStore()
+def test_init_chooses_method_once(tmpdir, monkeypatch):
+    monkeypatch.setattr(dedup, 'supports_reflink', lambda directory: False)
+    store = OutputStore(root_dir=str(tmpdir))
+    assert store.method == dedup.COPY
+    store.write(path=os.path.join(str(tmpdir), "a"), contents=CONTENTS)
+    assert store.method == dedup.COPY
+
+
+def test_init_unknown_method(tmpdir):
+    with pytest.raises(ValueError):
+        OutputStore(root_dir=str(tmpdir), method="symlink")
+
+
+# OutputStore.write()
+@pytest.mark.parametrize("method", [None, dedup.COPY])
+def test_write_identical_files(tmpdir, method):
+    store = OutputStore(root_dir=str(tmpdir), method=method)
+    paths = [os.path.join(str(tmpdir), name) for name in ("a", "b")]
+    store.write(path=paths[0], contents=CONTENTS)
+    stored = store.write(path=paths[1], contents=CONTENTS)
+    assert stored is (store.method == dedup.REFLINK)
+    for path in paths:
+        with open(path) as fh:
+            assert fh.read() == CONTENTS
+    assert not os.path.samefile(*paths)
+
+
+@pytest.mark.parametrize("method", [None, dedup.COPY])
+def test_write_independent_files(tmpdir, method):
+    store = OutputStore(root_dir=str(tmpdir), method=method)
+    paths = [os.path.join(str(tmpdir), name) for name in ("a", "b")]
+    for path in paths:
+        store.write(path=path, contents=CONTENTS)
+    with open(paths[0], 'a') as fh:
+        fh.write(CONTENTS)
+    with open(paths[1]) as fh:
+        assert fh.read() == CONTENTS
+    for path in paths:
+        assert os.stat(path).st_mode & stat.S_IWUSR
+
+
+def test_write_hardlinks(tmpdir):
+    store = OutputStore(root_dir=str(tmpdir), method=dedup.HARDLINK)
+    paths = [os.path.join(str(tmpdir), name) for name in ("a", "b")]
+    assert store.write(path=paths[0], contents=CONTENTS) is False
+    assert store.write(path=paths[1], contents=CONTENTS) is True
+    assert os.path.samefile(*paths)
+    assert not os.stat(paths[0]).st_mode & stat.S_IWUSR
+
+
+@pytest.mark.parametrize("method", [None, dedup.HARDLINK, dedup.COPY])
+def test_write_distinct_files(tmpdir, method):
+    store = OutputStore(root_dir=str(tmpdir), method=method)
+    store.write(path=os.path.join(str(tmpdir), "a"), contents=CONTENTS)
+    store.write(path=os.path.join(str(tmpdir), "b"), contents=OTHER_CONTENTS)
+    objects = [
+        name
+        for _, _, names in os.walk(store.objects_dir)
+        for name in names
+    ]
+    assert len(objects) == (0 if store.method == dedup.COPY else 2)
+
+
+def test_write_existing_file(tmpdir):
+    store = OutputStore(root_dir=str(tmpdir))
+    path = os.path.join(str(tmpdir), "a")
+    store.write(path=path, contents=CONTENTS)
+    with pytest.raises(FileExistsError):
+        store.write(path=path, contents=CONTENTS)
+
+
+# OutputStore.copy()
+def test_copy(tmpdir):
+    store = OutputStore(root_dir=str(tmpdir))
+    src = os.path.join(str(tmpdir), "src")
+    with open(src, 'wb') as fh:
+        fh.write(OTHER_CONTENTS)
+    assert store.copy(src=src, path=os.path.join(str(tmpdir), "a")) is False
+    assert store.write(
+        path=os.path.join(str(tmpdir), "b"),
+        contents=OTHER_CONTENTS,
+    ) is (store.method == dedup.REFLINK)
+    with open(os.path.join(str(tmpdir), "a"), 'rb') as fh:
+        assert fh.read() == OTHER_CONTENTS
@@ -0,0 +1,147 @@
+"""
+Unit tests for '.logs'.
+"""
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import sys
+import threading
+
+import pytest
+
+from myproj import (logs, pool)
+
+# Test parameters
+MESSAGE = "message from worker"
+PROJECTS = ["project_a", "project_b"]
+
+
+def log_from_worker(queue):
+    logs.setup_worker(queue=queue)
+    logging.getLogger("worker").warning(MESSAGE)
+
+
+# setup()
+def test_setup_adds_single_queue_handler():
+    logger = logging.getLogger("test_setup_adds_single_queue_handler")
+    queue = logs.setup(logger=logger)
+    assert logs.setup(logger=logger, level=logging.INFO) is queue
+    handlers = [
+        handler for handler in logger.handlers
+        if isinstance(handler, logging.handlers.QueueHandler)
+    ]
+    assert len(handlers) == 1
+    assert logger.level == logging.INFO
+
+
+def test_setup_writes_to_current_stderr(capsys):
+    logger = logging.getLogger("test_setup_writes_to_current_stderr")
+    logs.setup(logger=logger)
+    logger.warning("message")
+    logs.shutdown()
+    assert "message" in capsys.readouterr().err
+
+
+def test_setup_switches_mode(capsys):
+    logger = logging.getLogger("test_setup_switches_mode")
+    queue = logs.setup(logger=logger)
+    try:
+        mp_queue = logs.setup(logger=logger, multiprocessing=True)
+        assert mp_queue is not queue
+        assert logs._queue_handler(logger).queue is mp_queue
+        logger.warning("message")
+        logs.shutdown()
+        assert "message" in capsys.readouterr().err
+    finally:
+        logs.setup(logger=logger)
+    assert logs._queue_handler(logger).queue is not mp_queue
+
+
+# project_log()
+def test_project_log(tmpdir):
+    logger = logging.getLogger("test_project_log")
+    logs.setup(logger=logger)
+    paths = [os.path.join(str(tmpdir), f"{p}.log") for p in PROJECTS]
+    barrier = threading.Barrier(len(PROJECTS))
+
+    def generate(project, path):
+        with logs.project_log(path):
+            barrier.wait()
+            logger.warning(project)
+            pool.map_threads(logger.warning, [f"{project} in pool"])
+            barrier.wait()
+
+    threads = [
+        threading.Thread(target=generate, args=args)
+        for args in zip(PROJECTS, paths)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logger.warning("outside")
+    logs.shutdown()
+    for project, path in zip(PROJECTS, paths):
+        with open(path) as fh:
+            lines = fh.read().splitlines()
+        assert len(lines) == 2
+        assert lines[0].endswith(f"] {project}")
+        assert lines[1].endswith(f"] {project} in pool")
+
+
+def test_project_log_shares_file(tmpdir):
+    logger = logging.getLogger("test_project_log_shares_file")
+    logs.setup(logger=logger)
+    listener = logs._listener
+    path = os.path.join(str(tmpdir), "project.log")
+    barrier = threading.Barrier(len(PROJECTS))
+
+    def generate(project):
+        with logs.project_log(path):
+            barrier.wait()
+            logger.warning(project)
+            barrier.wait()
+
+    threads = [
+        threading.Thread(target=generate, args=(project,))
+        for project in PROJECTS
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert logs._listener is listener
+    logs.shutdown()
+    with open(path) as fh:
+        lines = fh.read().splitlines()
+    assert sorted(line.rsplit("] ", 1)[1] for line in lines) == PROJECTS
+
+
+def test_project_log_requires_setup(tmpdir):
+    logs.shutdown()
+    with pytest.raises(RuntimeError):
+        with logs.project_log(os.path.join(str(tmpdir), "project.log")):
+            pass
+
+
+# setup_worker()
+def test_setup_worker(tmpdir):
+    log_file = os.path.join(str(tmpdir), "batch.log")
+    queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(
+        queue,
+        logging.FileHandler(log_file),
+    )
+    listener.start()
+    try:
+        context = multiprocessing.get_context(
+            "fork" if sys.platform != "win32" else "spawn"
+        )
+        process = context.Process(target=log_from_worker, args=(queue,))
+        process.start()
+        process.join(timeout=10)
+    finally:
+        listener.stop()
+    with open(log_file) as fh:
+        assert MESSAGE in fh.read()
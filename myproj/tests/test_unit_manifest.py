@@ -0,0 +1,93 @@
+"""
+Unit tests for '.manifest'.
+"""
+import hashlib
+import json
+import os
+
+import pytest
+
+from myproj import manifest
+
+# Test parameters
+FILES = {
+    "README.md": b"# project\n",
+    "src/main.py": b"print('hello')\n",
+}
+
+
+@pytest.fixture
+def project_dir(tmpdir):
+    project_dir = os.path.join(str(tmpdir), "project")
+    for name, data in FILES.items():
+        path = os.path.join(project_dir, *name.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fh:
+            fh.write(data)
+    manifest.write(
+        project_dir=project_dir,
+        files={
+            name: {
+                'sha256': hashlib.sha256(data).hexdigest(),
+                'size': len(data),
+            }
+            for name, data in FILES.items()
+        },
+    )
+    return project_dir
+
+
+# path()
+def test_path(tmpdir):
+    assert manifest.path(os.path.join(str(tmpdir), "project", "")) == \
+        os.path.join(str(tmpdir), "project.manifest.json")
+
+
+# write() / load()
+def test_write_beside_project(project_dir):
+    assert os.path.isfile(project_dir + ".manifest.json")
+    assert not os.path.exists(os.path.join(project_dir, ".manifest.json"))
+
+
+def test_load(project_dir):
+    res = manifest.load(project_dir)
+    assert list(res) == sorted(FILES)
+    assert res["README.md"]['size'] == len(FILES["README.md"])
+
+
+def test_load_unsupported_version(project_dir):
+    with open(manifest.path(project_dir), 'w') as fh:
+        json.dump({'version': 0, 'files': {}}, fh)
+    with pytest.raises(ValueError):
+        manifest.load(project_dir)
+
+
+# files()
+def test_files(project_dir):
+    assert manifest.files(project_dir) == sorted(FILES)
+
+
+# verify()
+def test_verify(project_dir):
+    assert manifest.verify(project_dir) == []
+
+
+def test_verify_problems(project_dir):
+    with open(os.path.join(project_dir, "README.md"), 'wb') as fh:
+        fh.write(b"# PROJECT\n")
+    with open(os.path.join(project_dir, "extra"), 'wb') as fh:
+        fh.write(b"")
+    os.remove(os.path.join(project_dir, "src", "main.py"))
+    assert manifest.verify(project_dir) == [
+        "README.md: hash mismatch",
+        "extra: not in manifest",
+        "src/main.py: missing",
+    ]
+    with open(os.path.join(project_dir, "README.md"), 'wb') as fh:
+        fh.write(b"")
+    assert "README.md: size mismatch" in manifest.verify(project_dir)
+
+
+def test_verify_without_manifest(tmpdir):
+    with pytest.raises(FileNotFoundError):
+        manifest.verify(str(tmpdir))
@@ -0,0 +1,100 @@
+"""
+Unit tests for '.metrics'.
+"""
+import json
+import os
+
+from myproj import metrics
+from myproj.metrics import (COUNTERS, PhaseMetrics, count, peak_rss)
+
+# Test parameters
+PHASE = "phase"
+OTHER_PHASE = "other_phase"
+COUNTER = "files_copied"
+INCREMENT = 3
+METRICS = [
+    "wall_seconds",
+    "cpu_seconds",
+    "process_peak_rss_bytes",
+    "peak_rss_increase_bytes",
+    *COUNTERS,
+]
+
+
+# count()
+def test_count():
+    before = metrics.counters[COUNTER]
+    count(COUNTER, INCREMENT)
+    assert metrics.counters[COUNTER] == before + INCREMENT
+
+
+# peak_rss()
+def test_peak_rss():
+    res = peak_rss()
+    assert res is None or res > 0
+
+
+# phase()
+def test_phase_records_metrics():
+    m = PhaseMetrics()
+    with m.phase(PHASE):
+        count(COUNTER, INCREMENT)
+    assert list(m.phases[PHASE]) == METRICS
+    assert m.phases[PHASE][COUNTER] == INCREMENT
+    assert m.phases[PHASE]["wall_seconds"] >= 0
+    increase = m.phases[PHASE]["peak_rss_increase_bytes"]
+    assert increase is None or increase >= 0
+
+
+def test_phase_records_metrics_on_exception():
+    m = PhaseMetrics()
+    try:
+        with m.phase(PHASE):
+            raise ValueError
+    except ValueError:
+        pass
+    assert PHASE in m.phases
+
+
+# to_dict()
+def test_to_dict_totals():
+    m = PhaseMetrics()
+    with m.phase(PHASE):
+        count(COUNTER, INCREMENT)
+    with m.phase(OTHER_PHASE):
+        count(COUNTER, INCREMENT)
+    res = m.to_dict()
+    assert list(res['phases']) == [PHASE, OTHER_PHASE]
+    assert res['total'][COUNTER] == 2 * INCREMENT
+
+
+# to_openmetrics()
+def test_to_openmetrics():
+    m = PhaseMetrics()
+    with m.phase(PHASE):
+        count(COUNTER, INCREMENT)
+    res = m.to_openmetrics().splitlines()
+    assert res[-1] == "# EOF"
+    assert f'myproj_phase_{COUNTER}{{phase="{PHASE}"}} {INCREMENT}' in res
+    assert "# UNIT myproj_phase_wall_seconds seconds" in res
+
+
+# write()
+def test_write_json(tmpdir):
+    path = os.path.join(str(tmpdir), "metrics.json")
+    m = PhaseMetrics()
+    with m.phase(PHASE):
+        pass
+    m.write(path=path)
+    with open(path) as fh:
+        assert list(json.load(fh)['phases']) == [PHASE]
+
+
+def test_write_openmetrics(tmpdir):
+    path = os.path.join(str(tmpdir), "metrics.prom")
+    m = PhaseMetrics()
+    with m.phase(PHASE):
+        pass
+    m.write(path=path)
+    with open(path) as fh:
+        assert fh.read().endswith("# EOF\n")
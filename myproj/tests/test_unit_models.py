@@ -1,6 +1,8 @@
 """
 Unit tests for '.models'.
 """
+import pytest
+
 from myproj.models import (Defaults, Parameters)
 
 
@@ -22,3 +24,44 @@ def test_Defaults_init():
 def test_Defaults_to_dict():
     res = Defaults().to_dict()
     assert type(res) is dict
+
+
+def test_Parameters_singleton():
+    assert Parameters() is Parameters()
+    assert Defaults() is Defaults()
+    assert Defaults() is not Parameters()
+
+
+def test_Parameters_read_only():
+    res = Parameters()
+    with pytest.raises(AttributeError):
+        res.org = {}
+    with pytest.raises(TypeError):
+        res.org['name'] = "name"
+
+
+def test_Parameters_to_dict_is_copy():
+    res = Parameters().to_dict()
+    res['org']['name'] = "name"
+    assert Parameters().to_dict()['org']['name'] == ""
+
+
+def test_Parameters_as_mapping():
+    res = Parameters().as_mapping()
+    assert list(res) == ["org", "user", "project", "soft"]
+    assert res['soft']['linter'] == ""
+
+
+def test_Defaults_fields_not_shared():
+    res = Defaults().to_dict()
+    res['org']['name']['value'] = "name"
+    res['soft']['linter']['choices'].append("choice")
+    assert res['org']['slug']['value'] == "<<<infer>>>"
+    assert "choice" not in res['soft']['testing']['choices']
+    assert "choice" not in Defaults().to_dict()['soft']['linter']['choices']
+
+
+def test_Defaults_choice_fields():
+    res = Defaults().as_mapping()
+    assert set(res['org']['name']) == {"value"}
+    assert "choices" in res['project']['license']
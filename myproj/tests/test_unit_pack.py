@@ -0,0 +1,130 @@
+"""
+Unit tests for '.pack'.
+"""
+import hashlib
+import os
+
+import pytest
+
+from myproj import resources
+from myproj.pack import (MAGIC, TemplatePack)
+
+# Test parameters
+TEMPLATE_DIR = os.path.join(
+    os.path.dirname(__file__),
+    os.pardir,
+    "myproj",
+    "templates",
+)
+FILE = "licenses/mit"
+HIDDEN_FILE = "version_control/.gitignore"
+PACK_FILE = "templates.mptpk"
+
+
+@pytest.fixture
+def pack_file(tmpdir):
+    return TemplatePack.build(
+        template_dir=TEMPLATE_DIR,
+        output=os.path.join(str(tmpdir), PACK_FILE),
+    )
+
+
+def read(name):
+    with open(os.path.join(TEMPLATE_DIR, *name.split('/')), 'rb') as fh:
+        return fh.read()
+
+
+# files()
+def test_files():
+    res = [name for name, _ in TemplatePack.files(TEMPLATE_DIR)]
+    assert FILE in res
+    assert HIDDEN_FILE in res
+    assert res == sorted(res)
+
+
+def test_files_traversable():
+    res = TemplatePack.files(resources.data('templates'))
+    assert [name for name, _ in res] == [
+        name for name, _ in TemplatePack.files(TEMPLATE_DIR)
+    ]
+
+
+# build()
+def test_build(pack_file):
+    with open(pack_file, 'rb') as fh:
+        assert fh.read(len(MAGIC)) == MAGIC
+
+
+# is_pack()
+def test_is_pack(pack_file):
+    assert TemplatePack.is_pack(pack_file)
+    assert not TemplatePack.is_pack(__file__)
+    assert not TemplatePack.is_pack(TEMPLATE_DIR)
+    assert not TemplatePack.is_pack("/xyz/zyx/125")
+
+
+# __init__()
+def test_init_not_a_pack():
+    with pytest.raises(ValueError):
+        TemplatePack(__file__)
+
+
+def test_init_index(pack_file):
+    with TemplatePack(pack_file) as pack:
+        assert set(pack) == {
+            name for name, _ in TemplatePack.files(TEMPLATE_DIR)
+        }
+        assert pack.index[FILE]['size'] == len(read(FILE))
+        assert pack.index[FILE]['sha256'] == (
+            hashlib.sha256(read(FILE)).hexdigest()
+        )
+
+
+# read()
+def test_read(pack_file):
+    with TemplatePack(pack_file) as pack:
+        for name in pack:
+            assert pack.read(name, verify=True) == read(name)
+
+
+def test_read_missing(pack_file):
+    with TemplatePack(pack_file) as pack:
+        with pytest.raises(KeyError):
+            pack.read("missing")
+
+
+def test_read_corrupt(pack_file):
+    with TemplatePack(pack_file) as pack:
+        offset = pack._data_start + pack.index[FILE]['offset']
+    with open(pack_file, 'r+b') as fh:
+        fh.seek(offset)
+        fh.write(b"X")
+    with TemplatePack(pack_file) as pack:
+        assert pack.read(FILE) != read(FILE)
+        with pytest.raises(ValueError):
+            pack.read(FILE, verify=True)
+
+
+# chunks()
+def test_chunks(pack_file):
+    with TemplatePack(pack_file) as pack:
+        res = list(pack.chunks(FILE, size=100))
+    assert b"".join(res) == read(FILE)
+    assert max(len(chunk) for chunk in res) == 100
+
+
+# extract()
+def test_extract(pack_file, tmpdir):
+    with TemplatePack(pack_file) as pack:
+        res = pack.extract(name=HIDDEN_FILE, dst=str(tmpdir))
+    assert res == os.path.join(str(tmpdir), ".gitignore")
+    with open(res, 'rb') as fh:
+        assert fh.read() == read(HIDDEN_FILE)
+
+
+def test_extract_to_file(pack_file, tmpdir):
+    dst = os.path.join(str(tmpdir), "LICENSE")
+    with TemplatePack(pack_file) as pack:
+        assert pack.extract(name=FILE, dst=dst) == dst
+    with open(dst, 'rb') as fh:
+        assert fh.read() == read(FILE)
@@ -1,10 +1,12 @@
 """
 Unit tests for '.params'.
 """
+import copy
 from string import (ascii_lowercase, ascii_uppercase, digits)
 
 import pytest
 
+from myproj import schema
 from myproj.params import GetParams
 from myproj.models import (Defaults, Parameters)
 
@@ -22,6 +24,10 @@ DEFAULTS_DICT_GENERIC = {
     "value": "value",
     "description": "description",
 }
+DEFAULTS_DICT_NO_DEFAULT = {
+    "value": "",
+    "description": "description",
+}
 DEFAULTS_DICT_CHOICES = {
     "value": "value",
     "choices": ['a', 'b', 'c'],
@@ -43,6 +49,8 @@ DEFAULTS_DICT_CHOICES_NO_ALT = {
     "alternative": None,
     "description": "description",
 }
+NON_INFERABLE = ["org.name", "project.license"]
+DESCRIPTION = "Name of the organization"
 USER_INPUT_GENERIC = "user_input"
 USER_INPUT_CHOICES = "a"
 USER_INPUT_CHOICES_INVALID = "not_a_choice"
@@ -55,6 +63,13 @@ CHOICES_MULTI_SPLIT = ["a & b", "c &  d | e"]
 CHOICES_MULTI_SPLIT_MULTI_SEP = ["a", "b", "c", "d", "e"]
 
 
+class NoProbes(dict):
+    """Environment without any lookups, so that inferences fail."""
+
+    def start(self):
+        return self
+
+
 # __init__()
 def test_init_no_args():
     with pytest.raises(TypeError):
@@ -139,6 +154,129 @@ def test_get_params_no_soft(monkeypatch):
     assert p.get_params(retries=1) is None
 
 
+def test_get_params_multiple_choice_fallback_is_list(monkeypatch):
+    monkeypatch.setattr(
+        'builtins.input',
+        lambda description: USER_INPUT_GENERIC,
+    )
+    p = GetParams(
+        defaults=DEFAULTS,
+        params=PARAMS,
+    )
+    del p.params['soft']
+    p.get_params(retries=0)
+    assert p.params['soft']['linter'] == [DEFAULTS['soft']['linter']['value']]
+
+
+def test_get_params_normalizes_given_values():
+    p = GetParams(
+        defaults=DEFAULTS,
+        params=PARAMS,
+    )
+    p.params['soft']['linter'] = "flake8, pylint"
+    p.get_params()
+    assert p.params['soft']['linter'] == ["flake8", "pylint"]
+
+
+def test_get_params_does_not_modify_defaults(monkeypatch):
+    monkeypatch.setattr(
+        'builtins.input',
+        lambda description: "",
+    )
+    defaults = Defaults().to_dict()
+    p = GetParams(
+        defaults=defaults,
+        params={},
+    )
+    assert defaults == DEFAULTS
+    assert p.params['org']['slug'] == "j_doe_org"
+
+
+def test_get_params_non_interactive_reports_all_missing(monkeypatch):
+    monkeypatch.setattr('builtins.input', None)
+    params = Parameters().to_dict()
+    del params['org']
+    del params['project']['license']
+    with pytest.raises(ValueError) as e:
+        GetParams(
+            defaults=DEFAULTS,
+            params=params,
+            interactive=False,
+        )
+    for path in NON_INFERABLE:
+        assert f"  - {path}" in str(e.value)
+    assert "org.slug" in str(e.value)
+
+
+def test_get_params_non_interactive_infers(monkeypatch):
+    monkeypatch.setattr('builtins.input', None)
+    params = Parameters().to_dict()
+    params['org'] = {"name": "My Org"}
+    p = GetParams(
+        defaults=DEFAULTS,
+        params=params,
+        interactive=False,
+    )
+    assert p.params['org']['slug'] == "my_org"
+    assert p.params['org']['git_host'] == "https://github.com/my_org"
+
+
+def test_get_params_non_interactive_skips_descriptions(monkeypatch):
+    monkeypatch.setattr('builtins.input', None)
+    GetParams.descriptions.cache_clear()
+    params = Parameters().to_dict()
+    params['org'] = {"name": "My Org"}
+    GetParams(
+        defaults=DEFAULTS,
+        params=params,
+        interactive=False,
+    )
+    assert GetParams.descriptions.cache_info().currsize == 0
+
+
+def test_get_params_prompts_with_catalog_descriptions(monkeypatch):
+    prompts = []
+
+    def query(prompt):
+        prompts.append(prompt)
+        return ""
+
+    monkeypatch.setattr('builtins.input', query)
+    params = Parameters().to_dict()
+    del params['org']['name']
+    GetParams(
+        defaults=DEFAULTS,
+        params=params,
+    )
+    assert prompts == [
+        f"\n{GetParams.description(section='org', key='name')}\n"
+        f"(default: '{DEFAULTS['org']['name']['value']}')\n> "
+    ]
+    assert DESCRIPTION in prompts[0]
+
+
+@pytest.mark.parametrize("user_input", ["", USER_INPUT_GENERIC])
+def test_get_params_failed_inference_has_no_default(monkeypatch, user_input):
+    prompts = []
+
+    def query(prompt):
+        prompts.append(prompt)
+        return user_input
+
+    monkeypatch.setattr('builtins.input', query)
+    monkeypatch.setattr(schema, 'Probes', NoProbes)
+    params = Parameters().to_dict()
+    del params['project']['path']
+    p = GetParams(
+        defaults=DEFAULTS,
+        params=params,
+    )
+    assert p.params['project']['path'] == user_input
+    assert len(prompts) == 1
+    assert "no default" in prompts[0]
+    assert schema.INFER not in prompts[0]
+
+
 # query_user()
 def test_query_user_no_args(monkeypatch):
     monkeypatch.setattr(
@@ -195,6 +333,17 @@ def test_query_user_defaults_dict_generic_no_input(monkeypatch):
     ) == DEFAULTS_DICT_GENERIC['value']
 
 
+def test_query_user_no_default_no_input(monkeypatch):
+    monkeypatch.setattr(
+        'builtins.input',
+        lambda description: "",
+    )
+    assert GetParams.query_user(
+        d=DEFAULTS_DICT_NO_DEFAULT,
+        retries=RETRIES,
+    ) == ""
+
+
 def test_query_user_defaults_dict_choices(monkeypatch):
     monkeypatch.setattr(
         'builtins.input',
@@ -249,6 +398,17 @@ def test_query_user_defaults_dict_choices_multi_wrong_input(monkeypatch):
         ) == USER_INPUT_CHOICES
 
 
+def test_query_user_retries_iteratively(monkeypatch):
+    inputs = iter([USER_INPUT_CHOICES_INVALID] * 3 + [USER_INPUT_CHOICES])
+    monkeypatch.setattr(
+        'builtins.input',
+        lambda description: next(inputs),
+    )
+    d = copy.deepcopy(DEFAULTS_DICT_CHOICES)
+    assert GetParams.query_user(d=d, retries=-1) == USER_INPUT_CHOICES
+    assert d == DEFAULTS_DICT_CHOICES
+
+
 def test_query_user_raise_keyboard_interrupt(monkeypatch):
     monkeypatch.setattr(
         'builtins.input',
@@ -0,0 +1,103 @@
+"""
+Unit tests for '.placeholders'.
+"""
+import os
+
+import jinja2
+import pytest
+
+from myproj import placeholders
+
+# Test parameters
+TEMPLATE_DIR = os.path.join(
+    os.path.dirname(__file__),
+    os.pardir,
+    "myproj",
+    "templates",
+)
+PARAMS = {
+    'project': {'slug': "my_project", 'version': "0.1.0", 'tags': ["a"]},
+    'user': {'name': "Jane Doe"},
+    'soft': {'docs': True, 'python_version': None},
+}
+TEMPLATE = (
+    "# {{cookiecutter.project.slug}}\n"
+    "{{ cookiecutter.user.name }} ({{cookiecutter.project.version}})\n"
+    "{{cookiecutter.project.tags}} {{ cookiecutter.soft.docs }} "
+    "{{cookiecutter.soft.python_version}}{{cookiecutter.soft.missing}}\n"
+)
+RENDERED = (
+    "# my_project\n"
+    "Jane Doe (0.1.0)\n"
+    "['a'] True None\n"
+)
+NOT_COMPILED = [
+    "{% if cookiecutter.soft.docs %}docs{% endif %}\n",
+    "{# comment #}\n",
+    "{{ cookiecutter.project.slug | upper }}\n",
+    "{{ cookiecutter['project']['slug'] }}\n",
+    "{{- cookiecutter.project.slug }}\n",
+    "{{ cookiecutter.project.items }}\n",
+    "{{cookiecutter.project.slug}}\r\n",
+]
+MISSING_SECTION = "{{cookiecutter.replace.packaging}}"
+
+
+# compile()
+def test_compile():
+    template = placeholders.compile(TEMPLATE)
+    assert template.paths[0] == ("project", "slug")
+    assert len(template.literals) == len(template.paths) + 1
+    assert template.render(PARAMS) == RENDERED
+
+
+def test_compile_without_placeholders():
+    assert placeholders.compile("plain\n").render(PARAMS) == "plain\n"
+
+
+@pytest.mark.parametrize("source", NOT_COMPILED)
+def test_compile_other_markup(source):
+    assert placeholders.compile(source) is None
+
+
+# PlaceholderTemplate.render()
+def test_render_missing_intermediate_key():
+    with pytest.raises(KeyError):
+        placeholders.compile(MISSING_SECTION).render(PARAMS)
+
+
+def test_render_same_as_template_engine():
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+        keep_trailing_newline=True,
+    )
+    params = dict(PARAMS, replace={'packaging': {}})
+    compiled = 0
+    for name in env.list_templates():
+        with open(os.path.join(TEMPLATE_DIR, name), encoding='utf-8') as fh:
+            try:
+                template = placeholders.compile(fh.read())
+            except UnicodeDecodeError:
+                continue
+        if template is None:
+            continue
+        compiled += 1
+        try:
+            expected = env.get_template(name).render(cookiecutter=params)
+        except jinja2.UndefinedError:
+            with pytest.raises(KeyError):
+                template.render(params)
+            continue
+        assert template.render(params) == expected
+    assert compiled
+
+
+# lookup()
+def test_lookup():
+    assert placeholders.lookup(PARAMS, ("user", "name")) == "Jane Doe"
+    assert placeholders.lookup(PARAMS, ("user", "email")) == ""
+    with pytest.raises(KeyError):
+        placeholders.lookup(PARAMS, ("org", "name"))
+    with pytest.raises(KeyError):
+        placeholders.lookup(PARAMS, ("project", "slug", "upper"))
+    assert placeholders.lookup(PARAMS, ("project", "slug", "other")) == ""
@@ -0,0 +1,132 @@
+"""
+Unit tests for '.plugins'.
+"""
+import sys
+
+import pytest
+
+from myproj import plugins
+from myproj.plugins import Feature
+
+# Test parameters
+BUILTIN_MODULE = "myproj.plugins.builtin"
+SOFT = {
+    "linter": ["flake8", "pylint"],
+    "testing": ["none"],
+    "ci_cd": "gitlab_docker",
+    "cli_script": "no",
+}
+REQUIREMENTS = ["flake8"]
+EXTERNAL_FEATURE = Feature(name="external", requirements=["external"])
+
+
+class EntryPoint:
+    def __init__(self, name, obj):
+        self.name = name
+        self.obj = obj
+
+    def load(self):
+        return self.obj
+
+
+# load()
+def test_load_builtin_lazily(monkeypatch):
+    monkeypatch.setattr(plugins, "_loaded", {})
+    monkeypatch.delitem(sys.modules, BUILTIN_MODULE, raising=False)
+    assert BUILTIN_MODULE not in sys.modules
+    res = plugins.load(kind="linter", name="flake8")
+    assert res.requirements == ("flake8",)
+    assert BUILTIN_MODULE in sys.modules
+
+
+def test_load_cached():
+    res = plugins.load(kind="testing", name="pytest")
+    assert plugins.load(kind="testing", name="pytest") is res
+
+
+def test_load_entry_point(monkeypatch):
+    monkeypatch.setattr(plugins, "_loaded", {})
+    monkeypatch.setattr(
+        plugins,
+        "_entry_points",
+        lambda kind: {"external": EntryPoint("external", EXTERNAL_FEATURE)},
+    )
+    assert plugins.load(kind="linter", name="external") is EXTERNAL_FEATURE
+
+
+def test_load_unknown(monkeypatch):
+    monkeypatch.setattr(plugins, "_entry_points", lambda kind: {})
+    with pytest.raises(KeyError):
+        plugins.load(kind="linter", name="unknown")
+
+
+def test_load_wrong_type(monkeypatch):
+    monkeypatch.setattr(plugins, "_loaded", {})
+    monkeypatch.setattr(
+        plugins,
+        "_entry_points",
+        lambda kind: {"external": EntryPoint("external", object())},
+    )
+    with pytest.raises(TypeError):
+        plugins.load(kind="linter", name="external")
+
+
+# available()
+def test_available(monkeypatch):
+    monkeypatch.setattr(
+        plugins,
+        "_entry_points",
+        lambda kind: {"external": EntryPoint("external", EXTERNAL_FEATURE)},
+    )
+    res = plugins.available(kind="linter")
+    assert "external" in res
+    assert "flake8" in res
+    assert res == sorted(res)
+
+
+# selected()
+def test_selected():
+    res = plugins.selected(kind="linter", soft=SOFT)
+    assert [feature.name for feature in res] == ["flake8", "pylint"]
+
+
+def test_selected_none():
+    assert plugins.selected(kind="testing", soft=SOFT) == []
+
+
+def test_selected_str():
+    res = plugins.selected(kind="ci_cd", soft=SOFT)
+    assert [feature.name for feature in res] == ["gitlab_docker"]
+
+
+# Feature.compile_condition()
+def test_compile_condition():
+    def holds(condition, soft=SOFT, requirements=REQUIREMENTS):
+        return Feature.compile_condition(condition)(soft, requirements)
+
+    assert holds("requirements")
+    assert holds("linter:flake8")
+    assert not holds("testing:pytest")
+    assert not holds("cli_script:yes")
+    assert not holds("requirements", requirements=[])
+
+
+def test_compile_condition_invalid():
+    with pytest.raises(ValueError):
+        Feature.compile_condition("linter")
+
+
+def test_compile_condition_cached():
+    res = Feature.compile_condition("linter:flake8")
+    assert Feature.compile_condition("linter:flake8") is res
+    assert res(SOFT, REQUIREMENTS)
+
+
+# Feature.blanked()
+def test_blanked():
+    feature = plugins.load(kind="ci_cd", name="gitlab_docker")
+    res = feature.blanked(soft=SOFT, requirements=REQUIREMENTS)
+    assert res == [
+        "ci_cd.test_pytest.gitlab_docker",
+        "ci_cd.test_cli.gitlab_docker",
+    ]
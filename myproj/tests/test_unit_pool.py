@@ -0,0 +1,71 @@
+"""
+Unit tests for '.pool'.
+"""
+import threading
+
+import pytest
+
+from myproj import pool
+
+# Test parameters
+ARGS = [1, 2, 3]
+RESULTS = [2, 4, 6]
+
+
+def double(i):
+    return 2 * i
+
+
+def fail(i):
+    raise ValueError(i)
+
+
+# submit()
+def test_submit_runs_in_pool():
+    future = pool.submit(threading.current_thread)
+    assert future.result() is not threading.current_thread()
+    assert not pool.in_worker()
+
+
+def test_submit_in_worker_runs_in_place():
+    def nested():
+        return pool.submit(threading.current_thread).result() is (
+            threading.current_thread()
+        )
+    assert pool.submit(nested).result() is True
+
+
+# hook()
+def test_hook_wraps_submitted_calls():
+    calls = []
+
+    def wrap(func):
+        def call(*args):
+            calls.append(args)
+            return func(*args)
+        return call
+
+    with pool.hook(wrap):
+        assert pool.submit(double, 1).result() == 2
+    assert pool.submit(double, 2).result() == 4
+    assert calls == [(1,)]
+
+
+# map_threads()
+def test_map_threads():
+    assert pool.map_threads(double, ARGS) == RESULTS
+
+
+def test_map_threads_overlaps_calls():
+    barrier = threading.Barrier(len(ARGS), timeout=5)
+
+    def wait(i):
+        barrier.wait()
+        return double(i)
+
+    assert pool.map_threads(wait, ARGS) == RESULTS
+
+
+def test_map_threads_reraises():
+    with pytest.raises(ValueError):
+        pool.map_threads(fail, ARGS)
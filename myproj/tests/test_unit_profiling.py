@@ -0,0 +1,114 @@
+"""
+Unit tests for '.profiling'.
+"""
+import os
+import pstats
+
+from myproj import pool
+from myproj.profiling import PhaseProfiler
+
+# Test parameters
+PHASE = "phase"
+OTHER_PHASE = "other_phase"
+COLLAPSED_FILE = "profile.collapsed"
+BUILTIN_FUNC = ('~', 0, "<built-in method builtins.sorted>")
+FUNC = ("/path/to/module.py", 10, "func")
+FUNC_LABEL = "func (module.py:10)"
+
+
+def busy(n: int = 20000) -> int:
+    return sum(sorted(range(n), reverse=True))
+
+
+def busy_in_worker() -> int:
+    return busy()
+
+
+# __init__()
+def test_init_no_args():
+    res = PhaseProfiler()
+    assert res.out_dir is None
+
+
+def test_init_creates_out_dir(tmpdir):
+    out_dir = os.path.join(str(tmpdir), "a", "b")
+    PhaseProfiler(out_dir=out_dir)
+    assert os.path.isdir(out_dir)
+
+
+# phase()
+def test_phase_disabled():
+    profiler = PhaseProfiler()
+    with profiler.phase(PHASE):
+        busy()
+    assert profiler.stats == {}
+
+
+def test_phase_writes_pstats(tmpdir):
+    profiler = PhaseProfiler(out_dir=str(tmpdir))
+    with profiler.phase(PHASE):
+        busy()
+    with profiler.phase(OTHER_PHASE):
+        busy()
+    assert list(profiler.stats) == [PHASE, OTHER_PHASE]
+    assert os.path.isfile(os.path.join(str(tmpdir), f"{PHASE}.pstats"))
+    assert os.path.isfile(os.path.join(str(tmpdir), f"{OTHER_PHASE}.pstats"))
+
+
+def test_phase_writes_pstats_on_exception(tmpdir):
+    profiler = PhaseProfiler(out_dir=str(tmpdir))
+    try:
+        with profiler.phase(PHASE):
+            raise ValueError
+    except ValueError:
+        pass
+    assert os.path.isfile(os.path.join(str(tmpdir), f"{PHASE}.pstats"))
+
+
+def test_phase_includes_pool_workers(tmpdir):
+    profiler = PhaseProfiler(out_dir=str(tmpdir))
+    with profiler.phase(PHASE):
+        pool.map_threads(lambda _: busy_in_worker(), range(2))
+    stats = pstats.Stats(os.path.join(str(tmpdir), f"{PHASE}.pstats"))
+    names = [func[2] for func in stats.stats]  # type: ignore
+    assert "busy_in_worker" in names
+
+
+# write_collapsed()
+def test_write_collapsed_disabled():
+    assert PhaseProfiler().write_collapsed() is None
+
+
+def test_write_collapsed(tmpdir):
+    profiler = PhaseProfiler(out_dir=str(tmpdir))
+    with profiler.phase(PHASE):
+        busy()
+    res = profiler.write_collapsed()
+    assert res == os.path.join(str(tmpdir), COLLAPSED_FILE)
+    with open(res) as fh:
+        lines = fh.read().splitlines()
+    assert lines
+    for line in lines:
+        stack, usec = line.rsplit(' ', 1)
+        assert stack.split(';')[0] == PHASE
+        assert int(usec) > 0
+    assert any("busy" in line for line in lines)
+
+
+# collapse()
+def test_collapse_root(tmpdir):
+    profiler = PhaseProfiler(out_dir=str(tmpdir))
+    with profiler.phase(PHASE):
+        busy()
+    res = PhaseProfiler.collapse(stats=profiler.stats[PHASE], root=PHASE)
+    assert res
+    assert all(stack.startswith(f"{PHASE};") for stack in res)
+
+
+# label()
+def test_label_builtin():
+    assert PhaseProfiler.label(BUILTIN_FUNC) == BUILTIN_FUNC[2]
+
+
+def test_label_func():
+    assert PhaseProfiler.label(FUNC) == FUNC_LABEL
@@ -0,0 +1,558 @@
+"""
+Unit tests for '.project'.
+"""
+import ast
+import copy
+import filecmp
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import stat
+import tracemalloc
+
+import pytest
+
+from myproj import (analysis, manifest, metrics, plugins, resources)
+from myproj.dedup import OutputStore
+from myproj.pack import TemplatePack
+from myproj.results import ResultCache
+from myproj.project import (Project, TEMPLATE_ROOT)
+
+# Test parameters
+PARAMS = {
+    "org": {
+        "name": "J Doe Org",
+        "slug": "j_doe_org",
+        "copyright_owner": "J Doe Org",
+        "git_host": "https://github.com/j_doe_org",
+        "docker_host": "registry.hub.docker.com/jdoeorg",
+    },
+    "user": {
+        "name": "J Doe",
+        "slug": "j_doe",
+        "email": "j.doe@email.com",
+        "affiliation": "J Doe Org",
+        "url": "https://github.com/j_doe",
+    },
+    "project": {
+        "name": "my project",
+        "slug": "my_project",
+        "path": "my_project",
+        "synopsis": "Changes the world given a YAML config file.",
+        "version": "0.1.0",
+        "tags": "some tag, some other tag",
+        "license": "mit",
+        "copyright_year": "2020",
+        "original_author": "J Doe",
+        "git_repo": "https://github.com/j_doe_org/my_project",
+        "docker_image_name": "jdoeorg/my_project",
+    },
+    "soft": {
+        "python_version": "3.8.1",
+        "docs": "yes",
+        "docker": "yes",
+        "packaging": "yes",
+        "cli_script": "no",
+        "linter": ["flake8"],
+        "testing": ["none"],
+        "ci_cd": ["gitlab_docker"],
+        "auto_version_bump": "yes",
+    },
+}
+PLAN_KEYS = [
+    'template_dir', 'license', 'files', 'requirements', 'replace', 'blanked',
+]
+FILES = [
+    ".gitignore",
+    "LICENSE",
+    "contributors.md",
+    "setup.py",
+    "MANIFEST.in",
+    "Dockerfile",
+    ".gitlab-ci.yml",
+]
+REQUIREMENTS = ['setuptools_git', 'twine', 'flake8']
+VERBATIM = {'.gitignore', 'requirements.txt'}
+ASSETS = {
+    "assets/logo.png": b"\x89PNG\r\n\x1a\n\x00{{" + bytes(range(256)),
+    "assets/data.csv": b"id,value\n" + b"1,2\n" * 64,
+}
+ASSET_SCALE = 1 << 14
+ASSET_MEMORY_BUDGET = 1 << 21
+REPLACEMENTS = {
+    'a': {
+        'first': (
+            "run {{cookiecutter.replace.b.cmd}} "
+            "{{cookiecutter.replace.b.plain}}"
+        ),
+    },
+    'b': {
+        'cmd': "{{ cookiecutter.project.slug }} --help",
+        'plain': "in {{cookiecutter.org.name | trim}}",
+    },
+    'c': "",
+}
+BLANKED = [
+    'ci_cd.test_pytest.gitlab_docker',
+    'ci_cd.test_cli.gitlab_docker',
+]
+QUOTED_REPLACEMENTS = {
+    'a': {'b': '"ENTRYPOINT [\\"{{cookiecutter.project.slug}}.py\\"]"'},
+    'c': '"x = 1\ny = \\"\\:\\""',
+    'd': '"unbalanced',
+}
+DECODED_REPLACEMENTS = {
+    'a': {'b': 'ENTRYPOINT ["{{cookiecutter.project.slug}}.py"]'},
+    'c': 'x = 1\ny = ":"',
+    'd': '"unbalanced',
+}
+QUOTED_REPLACEMENTS_FILE = os.path.join(
+    os.path.dirname(__file__),
+    "files",
+    "replacement_strings_quoted",
+)
+
+
+@pytest.fixture
+def asset_params(tmpdir, monkeypatch):
+    """Parameters selecting large binary and text assets, which are added to
+    a copy of the packaged templates."""
+    template_dir = os.path.join(str(tmpdir), "templates")
+    shutil.copytree(str(resources.data('templates')), template_dir)
+    for name, chunk in ASSETS.items():
+        path = os.path.join(template_dir, *name.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fh:
+            for _ in range(ASSET_SCALE):
+                fh.write(chunk)
+    feature = plugins.Feature(
+        name="assets",
+        files=[(name, os.path.basename(name)) for name in ASSETS],
+    )
+    monkeypatch.setitem(plugins._loaded, ("linter", "assets"), feature)
+    params = copy.deepcopy(PARAMS)
+    params['soft']['linter'] = ['assets']
+    params['project']['path'] = os.path.join(str(tmpdir), "my_project")
+    return params, template_dir
+
+
+# __init__()
+def test_init_incomplete_params():
+    with pytest.raises(TypeError):
+        Project(params={})
+
+
+def test_init():
+    res = Project(params=copy.deepcopy(PARAMS))
+    assert res.project_dir == PARAMS['project']['path']
+
+
+# plan_template()
+def test_plan_template():
+    project = Project(params=copy.deepcopy(PARAMS))
+    res = project.plan_template()
+    assert list(res) == PLAN_KEYS
+    assert [item['dst'] for item in res['files']] == FILES
+    assert res['requirements'] == REQUIREMENTS
+    assert res['blanked'] == BLANKED
+    assert res['replace']['ci_cd']['test_pytest']['gitlab_docker'] == ""
+    assert res['replace']['ci_cd']['test_flake8']['gitlab_docker']
+    for item in res['files']:
+        assert os.path.isfile(os.path.join(res['template_dir'], item['src']))
+
+
+def test_plan_template_no_features():
+    params = copy.deepcopy(PARAMS)
+    params['project']['license'] = 'none'
+    params['soft'].update({
+        'docker': 'no',
+        'packaging': 'no',
+        'linter': ['none'],
+        'ci_cd': ['none'],
+    })
+    res = Project(params=params).plan_template()
+    assert [item['dst'] for item in res['files']] == [
+        ".gitignore", "contributors.md",
+    ]
+    assert res['requirements'] == []
+    assert res['blanked'] == []
+
+
+def test_plan_template_plugin_feature(monkeypatch):
+    feature = plugins.Feature(
+        name="external",
+        files=[("contributing/contributors.md", "EXTERNAL.md")],
+        requirements=["external"],
+        replace={"soft.docker_entrypoint": "external"},
+    )
+    monkeypatch.setitem(plugins._loaded, ("linter", "external"), feature)
+    params = copy.deepcopy(PARAMS)
+    params['soft']['linter'] = ['external']
+    res = Project(params=params).plan_template()
+    assert "external" in res['requirements']
+    assert "EXTERNAL.md" in [item['dst'] for item in res['files']]
+    assert res['replace']['soft']['docker_entrypoint'] == "external"
+    assert 'ci_cd.test_flake8.gitlab_docker' in res['blanked']
+
+
+def test_plan_template_does_not_modify_params():
+    project = Project(params=copy.deepcopy(PARAMS))
+    project.plan_template()
+    assert project.params == PARAMS
+
+
+# prepare_template()
+def test_prepare_template(tmpdir):
+    project = Project(params=copy.deepcopy(PARAMS))
+    project.prepare_template(root_dir=str(tmpdir))
+    dst_dir = os.path.join(project.template_dir, TEMPLATE_ROOT)
+    assert sorted(os.listdir(dst_dir)) == sorted(FILES + ['requirements.txt'])
+    with open(os.path.join(project.temp_dir, 'cookiecutter.json')) as fh:
+        assert json.load(fh) == project.params
+    assert 'replace' in project.params
+
+
+def test_prepare_template_from_pack(tmpdir):
+    pack_file = TemplatePack.build(
+        template_dir=resources.data('templates'),
+        output=os.path.join(str(tmpdir), "templates.mptpk"),
+    )
+    project = Project(params=copy.deepcopy(PARAMS))
+    project.prepare_template(root_dir=str(tmpdir), template_dir=pack_file)
+    dst_dir = os.path.join(project.template_dir, TEMPLATE_ROOT)
+    assert sorted(os.listdir(dst_dir)) == sorted(FILES + ['requirements.txt'])
+    with open(os.path.join(dst_dir, '.gitignore'), 'rb') as fh:
+        assert fh.read() == resources.data(
+            'templates', 'version_control', '.gitignore'
+        ).read_bytes()
+
+
+def test_prepare_template_shares_template_trees(tmpdir):
+    params = copy.deepcopy(PARAMS)
+    params['project']['name'] = "other project"
+    project = Project(params=copy.deepcopy(PARAMS))
+    project.prepare_template(root_dir=str(tmpdir))
+    other = Project(params=params)
+    other.prepare_template(root_dir=str(tmpdir))
+    assert other.template_dir == project.template_dir
+    assert other.temp_dir != project.temp_dir
+    params = copy.deepcopy(PARAMS)
+    params['soft']['linter'] = ["pylint"]
+    other = Project(params=params)
+    other.prepare_template(root_dir=str(tmpdir))
+    assert other.template_dir != project.template_dir
+
+
+def test_prepare_template_with_cache_dir(tmpdir, monkeypatch):
+    cache_dir = os.path.join(str(tmpdir), "cache")
+    project = Project(params=copy.deepcopy(PARAMS))
+    project.prepare_template(root_dir=str(tmpdir), cache_dir=cache_dir)
+    assert os.path.dirname(project.template_dir) == cache_dir
+    assert os.listdir(cache_dir) == [os.path.basename(project.template_dir)]
+    # A new process only finds the trees in the cache directory
+    monkeypatch.setattr(Project, '_template_trees', {})
+    monkeypatch.setattr(Project, 'stage_template', None)
+    other = Project(params=copy.deepcopy(PARAMS))
+    other.prepare_template(root_dir=str(tmpdir), cache_dir=cache_dir)
+    assert other.template_dir == project.template_dir
+
+
+def test_prepare_template_records_verbatim_files(tmpdir):
+    project = Project(params=copy.deepcopy(PARAMS))
+    project.prepare_template(root_dir=str(tmpdir))
+    entries = Project.verbatim_files(project.template_dir)
+    assert set(entries) == VERBATIM
+    path = os.path.join(project.template_dir, TEMPLATE_ROOT, '.gitignore')
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    assert entries['.gitignore'] == {
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'size': len(data),
+    }
+
+
+def test_prepare_template_uses_packaged_index(tmpdir, monkeypatch):
+    def classify(digest, read):
+        raise AssertionError("indexed file scanned")
+
+    monkeypatch.setattr(analysis, 'classify', classify)
+    project = Project(params=copy.deepcopy(PARAMS))
+    project.prepare_template(
+        root_dir=str(tmpdir),
+        cache_dir=os.path.join(str(tmpdir), "cache"),
+    )
+    entries = Project.verbatim_files(project.template_dir)
+    assert set(entries) == VERBATIM
+    path = os.path.join(project.template_dir, TEMPLATE_ROOT, '.gitignore')
+    with open(path, 'rb') as fh:
+        assert entries['.gitignore']['sha256'] == hashlib.sha256(
+            fh.read()
+        ).hexdigest()
+
+
+@pytest.mark.parametrize("edit,verbatim", [
+    (b"#edit", True),
+    (b"{#x#}", False),
+])
+def test_stage_template_detects_same_size_edit(tmpdir, edit, verbatim):
+    template_dir = pathlib.Path(str(tmpdir), "templates")
+    shutil.copytree(str(resources.data('templates')), str(template_dir))
+    path = template_dir / 'version_control' / '.gitignore'
+    data = edit + path.read_bytes()[len(edit):]
+    path.write_bytes(data)
+    project = Project(params=copy.deepcopy(PARAMS))
+    tree = os.path.join(str(tmpdir), "tree")
+    os.mkdir(tree)
+    Project.stage_template(
+        plan=project.plan_template(template_dir=template_dir),
+        source=template_dir,
+        tree=tree,
+        index=analysis.packaged_index(),
+    )
+    entries = Project.verbatim_files(tree)
+    if verbatim:
+        assert entries['.gitignore'] == {
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'size': len(data),
+        }
+    else:
+        assert '.gitignore' not in entries
+
+
+# render_project()
+def test_render_project(tmpdir):
+    params = copy.deepcopy(PARAMS)
+    params['project']['path'] = os.path.join(str(tmpdir), "my_project")
+    project = Project(params=params)
+    project.prepare_template(root_dir=str(tmpdir))
+    project.render_project()
+    assert sorted(os.listdir(project.project_dir)) == sorted(
+        FILES + ['requirements.txt']
+    )
+    assert os.path.isfile(
+        os.path.join(str(tmpdir), "my_project.manifest.json")
+    )
+    assert manifest.verify(project.project_dir) == []
+    with open(os.path.join(project.project_dir, 'LICENSE')) as fh:
+        contents = fh.read()
+    assert "{{" not in contents
+    assert PARAMS['org']['copyright_owner'] in contents
+    with pytest.raises(FileExistsError):
+        project.render_project()
+
+
+@pytest.mark.parametrize("pack", [False, True])
+def test_render_project_large_assets_flat_memory(tmpdir, asset_params, pack):
+    params, template_dir = asset_params
+    if pack:
+        template_dir = TemplatePack.build(
+            template_dir=template_dir,
+            output=os.path.join(str(tmpdir), "templates.mptpk"),
+        )
+    project = Project(params=params)
+    tracemalloc.start()
+    try:
+        project.prepare_template(
+            root_dir=str(tmpdir),
+            template_dir=template_dir,
+        )
+        project.render_project()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < ASSET_MEMORY_BUDGET
+    assert Project.verbatim_files(project.template_dir).keys() >= {
+        os.path.basename(name) for name in ASSETS
+    }
+    for name in ASSETS:
+        assert filecmp.cmp(
+            os.path.join(asset_params[1], *name.split('/')),
+            os.path.join(project.project_dir, os.path.basename(name)),
+            shallow=False,
+        )
+    assert manifest.verify(project.project_dir) == []
+
+
+def test_render_projects_with_store(tmpdir):
+    store = OutputStore(root_dir=str(tmpdir))
+    project_dirs = []
+    for name in ("a", "b"):
+        params = copy.deepcopy(PARAMS)
+        params['project']['path'] = os.path.join(str(tmpdir), name)
+        project = Project(params=params)
+        project.prepare_template(root_dir=str(tmpdir))
+        project.render_project(store=store)
+        assert manifest.verify(project.project_dir) == []
+        project_dirs.append(project.project_dir)
+    for name in FILES + ['requirements.txt']:
+        paths = [os.path.join(path, name) for path in project_dirs]
+        with open(paths[0], 'rb') as fh_a, open(paths[1], 'rb') as fh_b:
+            assert fh_a.read() == fh_b.read()
+        assert not os.path.samefile(*paths)
+        assert all(os.stat(path).st_mode & stat.S_IWUSR for path in paths)
+
+
+def test_render_project_with_result_cache(tmpdir):
+    cache = ResultCache(cache_dir=os.path.join(str(tmpdir), "cache"))
+    hits = []
+    for name in ("a", "b"):
+        params = copy.deepcopy(PARAMS)
+        params['project']['path'] = os.path.join(str(tmpdir), name)
+        project = Project(params=params)
+        project.prepare_template(root_dir=str(tmpdir), cache=cache)
+        hits.append(metrics.counters['cache_hits'])
+        project.render_project(cache=cache)
+        hits[-1] = metrics.counters['cache_hits'] - hits[-1]
+        assert sorted(os.listdir(project.project_dir)) == sorted(
+            FILES + ['requirements.txt']
+        )
+        assert manifest.verify(project.project_dir) == []
+    assert hits == [0, 1]
+    assert project.template_dir is None
+
+
+@pytest.mark.parametrize("pack", [False, True])
+def test_render_project_with_evicted_result(tmpdir, pack):
+    template_dir = None
+    if pack:
+        template_dir = TemplatePack.build(
+            template_dir=resources.data('templates'),
+            output=os.path.join(str(tmpdir), "templates.mptpk"),
+        )
+    cache = ResultCache(cache_dir=os.path.join(str(tmpdir), "cache"))
+    projects = []
+    for name in ("a", "b"):
+        params = copy.deepcopy(PARAMS)
+        params['project']['path'] = os.path.join(str(tmpdir), name)
+        projects.append(Project(params=params))
+        projects[-1].prepare_template(
+            root_dir=str(tmpdir),
+            template_dir=template_dir,
+            cache=cache,
+        )
+        if name == "a":
+            projects[-1].render_project(cache=cache)
+    assert projects[1].template_dir is None
+    cache.max_entries = 0
+    cache.evict()
+    projects[1].render_project(cache=cache)
+    assert projects[1].template_dir == projects[0].template_dir
+    assert manifest.verify(projects[1].project_dir) == []
+
+
+# decode_replacements()
+def test_decode_replacements():
+    assert Project.decode_replacements(
+        QUOTED_REPLACEMENTS
+    ) == DECODED_REPLACEMENTS
+
+
+def test_render_project_with_quoted_replacements(tmpdir):
+    project_dirs = []
+    for name, replacement_yaml in (
+        ("quoted", QUOTED_REPLACEMENTS_FILE),
+        ("packaged", None),
+    ):
+        params = copy.deepcopy(PARAMS)
+        params['project']['path'] = os.path.join(str(tmpdir), name)
+        project = Project(params=params, replacement_yaml=replacement_yaml)
+        project.prepare_template(root_dir=str(tmpdir))
+        project.render_project()
+        project_dirs.append(project.project_dir)
+    with open(os.path.join(project_dirs[0], "setup.py")) as fh:
+        setup_py = fh.read()
+    ast.parse(setup_py)
+    assert "'my_project = src.my_project:main'," in setup_py
+    assert 'long_description_content_type="text/markdown",' in setup_py
+    with open(os.path.join(project_dirs[0], "Dockerfile")) as fh:
+        assert 'ENTRYPOINT ["src/my_project.py"]' in fh.read().splitlines()
+    for name in FILES:
+        with open(os.path.join(project_dirs[0], name)) as fh:
+            contents = fh.read()
+        assert '\\"' not in contents
+        with open(os.path.join(project_dirs[1], name)) as fh:
+            assert contents == fh.read()
+
+
+# render_replacements()
+def test_render_replacements():
+    res = Project.render_replacements(
+        replacements=REPLACEMENTS,
+        params=PARAMS,
+    )
+    assert res == {
+        'a': {'first': "run my_project --help in J Doe Org"},
+        'b': {'cmd': "my_project --help", 'plain': "in J Doe Org"},
+        'c': "",
+    }
+    assert REPLACEMENTS['b']['cmd'].startswith("{{")
+
+
+def test_render_replacements_cyclic():
+    with pytest.raises(ValueError):
+        Project.render_replacements(
+            replacements={
+                'a': "{{cookiecutter.replace.b}}",
+                'b': "{{cookiecutter.replace.a}}",
+            },
+            params=PARAMS,
+        )
+
+
+def test_render_project_resolves_replacements(tmpdir):
+    params = copy.deepcopy(PARAMS)
+    params['project']['path'] = os.path.join(str(tmpdir), "my_project")
+    project = Project(params=params)
+    project.prepare_template(root_dir=str(tmpdir))
+    project.render_project()
+    for name in os.listdir(project.project_dir):
+        with open(os.path.join(project.project_dir, name)) as fh:
+            assert "{{" not in fh.read()
+    with open(os.path.join(project.project_dir, "Dockerfile")) as fh:
+        assert 'ENTRYPOINT ["src/my_project.py"]' in fh.read()
+
+
+# resolve_replacements()
+def test_resolve_replacements_memoized():
+    replacement_yaml = Project(params=copy.deepcopy(PARAMS)).replacement_yaml
+    res = Project.resolve_replacements(
+        replacement_yaml=replacement_yaml,
+        blanked=tuple(BLANKED),
+    )
+    assert Project.resolve_replacements(
+        replacement_yaml=replacement_yaml,
+        blanked=tuple(BLANKED),
+    ) is res
+    assert Project.resolve_replacements(
+        replacement_yaml=replacement_yaml,
+    ) is not res
+    assert res['ci_cd']['test_pytest']['gitlab_docker'] == ""
+    with pytest.raises(TypeError):
+        res['ci_cd']['test_pytest']['gitlab_docker'] = "value"
+
+
+def test_resolve_replacements_file_modified(tmpdir):
+    replacement_yaml = os.path.join(str(tmpdir), "replacements.yaml")
+    with open(replacement_yaml, 'w') as fh:
+        fh.write("a:\n  b: value\n")
+    res = Project.resolve_replacements(
+        replacement_yaml=replacement_yaml,
+        overrides=(("a.b", "override"),),
+    )
+    assert res['a']['b'] == "override"
+    with open(replacement_yaml, 'w') as fh:
+        fh.write("a:\n  b: value\n  c: other\n")
+    os.utime(replacement_yaml, ns=(0, 0))
+    res = Project.resolve_replacements(replacement_yaml=replacement_yaml)
+    assert dict(res['a']) == {"b": "value", "c": "other"}
+
+
+def test_plan_template_replacements_not_shared():
+    res = Project(params=copy.deepcopy(PARAMS)).plan_template()
+    res['replace']['ci_cd']['test_flake8']['gitlab_docker'] = "modified"
+    res = Project(params=copy.deepcopy(PARAMS)).plan_template()
+    assert res['replace']['ci_cd']['test_flake8']['gitlab_docker'] != (
+        "modified"
+    )
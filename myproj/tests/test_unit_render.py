@@ -0,0 +1,71 @@
+"""
+Unit tests for '.render'.
+"""
+import hashlib
+import os
+
+from myproj import (render, resources)
+
+# Test parameters
+PARAMS = {"project": {"slug": "my_project"}}
+FILES = {
+    "plain": "{{cookiecutter.project.slug}}\n",
+    "markup": "{{cookiecutter.project.slug | upper}}\n",
+    "verbatim": "no markup\n",
+}
+RENDERED = {
+    "plain": "my_project\n",
+    "markup": "MY_PROJECT\n",
+    "verbatim": "no markup\n",
+}
+
+
+# render_tree()
+def test_render_tree(tmpdir):
+    template_root = os.path.join(str(tmpdir), "templates")
+    os.makedirs(os.path.join(template_root, "sub"))
+    for name, contents in FILES.items():
+        with open(os.path.join(template_root, "sub", name), 'w') as fh:
+            fh.write(contents)
+    project_dir = os.path.join(str(tmpdir), "project")
+    os.mkdir(project_dir)
+    entries = render.render_tree(
+        template_root=template_root,
+        project_dir=project_dir,
+        params=PARAMS,
+        verbatim={"sub/verbatim": None},
+    )
+    assert sorted(entries) == sorted(f"sub/{name}" for name in FILES)
+    for name, contents in RENDERED.items():
+        with open(os.path.join(project_dir, "sub", name), 'rb') as fh:
+            data = fh.read()
+        assert data == contents.encode()
+        assert entries[f"sub/{name}"] == {
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'size': len(data),
+        }
+
+
+# render_file()
+def test_render_file_falls_back_to_template_engine(tmpdir):
+    for name in ("plain", "markup"):
+        with open(os.path.join(str(tmpdir), name), 'w') as fh:
+            fh.write(FILES[name])
+    env = render.environment(str(tmpdir))
+    assert render.compiled_template(str(tmpdir), "plain") is not None
+    assert render.compiled_template(str(tmpdir), "markup") is None
+    for name in ("plain", "markup"):
+        assert render.render_file(
+            env=env,
+            name=name,
+            params=PARAMS,
+        ) == RENDERED[name]
+
+
+# copy_verbatim()
+def test_copy_verbatim(tmpdir):
+    src = resources.path('templates', 'version_control', '.gitignore')
+    dst = os.path.join(str(tmpdir), '.gitignore')
+    render.copy_verbatim(src=src, dst=dst)
+    with open(src, 'rb') as fh_src, open(dst, 'rb') as fh_dst:
+        assert fh_src.read() == fh_dst.read()
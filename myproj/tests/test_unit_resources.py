@@ -0,0 +1,90 @@
+"""
+Unit tests for '.resources'.
+"""
+import os
+import pathlib
+import zipfile
+
+from myproj import resources
+
+# Test parameters
+DEFAULTS_PARTS = ("config", "defaults.yaml")
+PACKAGE_DIR = os.path.join(
+    os.path.dirname(__file__),
+    os.pardir,
+    "myproj",
+)
+DEFAULTS = os.path.join(PACKAGE_DIR, "config", "defaults.yaml")
+USER_CONFIG = "user_config.yaml"
+
+
+# data()
+def test_data_package_root():
+    res = resources.data()
+    assert res.is_dir()
+    assert res.joinpath("__init__.py").is_file()
+
+
+def test_data_file():
+    res = resources.data(*DEFAULTS_PARTS)
+    assert res.read_bytes() == pathlib.Path(DEFAULTS).read_bytes()
+
+
+def test_data_template_dir():
+    res = resources.data("templates", "licenses")
+    assert "mit" in [item.name for item in res.iterdir()]
+
+
+# in_archive()
+def test_in_archive():
+    assert resources.in_archive() is False
+
+
+# path()
+def test_path():
+    res = resources.path(*DEFAULTS_PARTS)
+    assert os.path.samefile(res, DEFAULTS)
+
+
+def test_path_from_archive(monkeypatch, tmpdir):
+    archive = os.path.join(str(tmpdir), "archive.zip")
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.write(DEFAULTS, "/".join(DEFAULTS_PARTS))
+    monkeypatch.setattr(
+        resources,
+        "data",
+        lambda *parts: zipfile.Path(archive, "/".join(parts)),
+    )
+    monkeypatch.setattr(resources, "_extracted", {})
+    res = resources.path(*DEFAULTS_PARTS)
+    assert res != DEFAULTS
+    assert pathlib.Path(res).read_bytes() == pathlib.Path(DEFAULTS).read_bytes()
+    assert resources.path(*DEFAULTS_PARTS) == res
+
+
+# user_config_file()
+def test_user_config_file():
+    res = resources.user_config_file()
+    assert os.path.samefile(
+        res,
+        os.path.join(PACKAGE_DIR, "config", USER_CONFIG),
+    )
+
+
+def test_user_config_file_from_archive(monkeypatch, tmpdir):
+    archive = os.path.join(str(tmpdir), "archive.zip")
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr(f"config/{USER_CONFIG}", "user: {}\n")
+    monkeypatch.setattr(
+        resources,
+        "data",
+        lambda *parts: zipfile.Path(archive, "/".join(parts)),
+    )
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmpdir))
+    res = resources.user_config_file()
+    assert res == os.path.join(str(tmpdir), "myproj", USER_CONFIG)
+    assert pathlib.Path(res).read_text() == "user: {}\n"
+    pathlib.Path(res).write_text("user: {name: me}\n")
+    assert pathlib.Path(resources.user_config_file()).read_text() == (
+        "user: {name: me}\n"
+    )
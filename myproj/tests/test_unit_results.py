@@ -0,0 +1,105 @@
+"""
+Unit tests for '.results'.
+"""
+import os
+import stat
+
+from myproj import manifest
+from myproj.results import ResultCache
+
+# Test parameters
+PARAMS = {
+    "project": {"name": "my project", "path": "/some/path"},
+    "replace": {"a": {"b": "c"}},
+}
+OTHER_PATH = {
+    "project": {"name": "my project", "path": "/other/path"},
+    "replace": {"a": {"b": "c"}},
+}
+OTHER_REPLACE = {
+    "project": {"name": "my project", "path": "/some/path"},
+    "replace": {"a": {"b": "d"}},
+}
+SIGNATURE = "0" * 64
+FILES = {"a.txt": "a\n", os.path.join("sub", "b.txt"): "b\n"}
+
+
+def make_tree(root):
+    for name, contents in FILES.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as fh:
+            fh.write(contents)
+    return root
+
+
+# key()
+def test_key():
+    key = ResultCache.key(params=PARAMS, signature=SIGNATURE)
+    assert ResultCache.key(params=OTHER_PATH, signature=SIGNATURE) == key
+    assert ResultCache.key(params=OTHER_REPLACE, signature=SIGNATURE) != key
+    assert ResultCache.key(params=PARAMS, signature="1" * 64) != key
+    assert ResultCache.key(
+        params=PARAMS,
+        signature=SIGNATURE,
+        version="other",
+    ) != key
+
+
+# get() / put()
+def test_put_and_get(tmpdir):
+    cache = ResultCache(cache_dir=os.path.join(str(tmpdir), "cache"))
+    src = make_tree(os.path.join(str(tmpdir), "src"))
+    dst = os.path.join(str(tmpdir), "dst")
+    os.mkdir(dst)
+    assert cache.get(key="key", dst=dst) is False
+    cache.put(key="key", src=src)
+    assert cache.get(key="key", dst=dst) is True
+    for name, contents in FILES.items():
+        with open(os.path.join(dst, name)) as fh:
+            assert fh.read() == contents
+
+
+def test_put_and_get_manifest(tmpdir):
+    cache = ResultCache(cache_dir=os.path.join(str(tmpdir), "cache"))
+    src = make_tree(os.path.join(str(tmpdir), "src"))
+    manifest.write(project_dir=src, files={})
+    cache.put(key="key", src=src)
+    dst = os.path.join(str(tmpdir), "dst")
+    os.mkdir(dst)
+    assert cache.get(key="key", dst=dst) is True
+    assert manifest.load(dst) == {}
+    assert sorted(os.listdir(dst)) == sorted(
+        name.split(os.sep)[0] for name in FILES
+    )
+    cache.max_entries = 0
+    cache.evict()
+    assert os.listdir(cache.cache_dir) == []
+
+
+def test_get_materializes_independent_files(tmpdir):
+    cache = ResultCache(cache_dir=os.path.join(str(tmpdir), "cache"))
+    cache.put(key="key", src=make_tree(os.path.join(str(tmpdir), "src")))
+    dst_dirs = [os.path.join(str(tmpdir), name) for name in ("a", "b")]
+    for dst in dst_dirs:
+        os.mkdir(dst)
+        cache.get(key="key", dst=dst)
+    for name, contents in FILES.items():
+        paths = [os.path.join(dst, name) for dst in dst_dirs]
+        assert os.stat(paths[0]).st_mode & stat.S_IWUSR
+        with open(paths[0], 'a') as fh:
+            fh.write(contents)
+        with open(paths[1]) as fh:
+            assert fh.read() == contents
+
+
+def test_evict_least_recently_used(tmpdir):
+    cache = ResultCache(cache_dir=str(tmpdir.join("cache")), max_entries=2)
+    src = make_tree(str(tmpdir.join("src")))
+    for i, key in enumerate(["a", "b"]):
+        cache.put(key=key, src=src)
+        os.utime(cache.entry_path(key), ns=(i, i))
+    os.mkdir(str(tmpdir.join("dst")))
+    cache.get(key="a", dst=str(tmpdir.join("dst")))
+    cache.put(key="c", src=src)
+    assert sorted(os.listdir(cache.cache_dir)) == ["a", "c"]
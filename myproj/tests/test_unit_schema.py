@@ -0,0 +1,155 @@
+"""
+Unit tests for '.schema'.
+"""
+import os
+import threading
+
+import pytest
+
+from myproj import schema
+from myproj.config import ConfigParser
+from myproj.models import (Defaults, Parameters)
+
+# Test parameters
+DEFAULTS = os.path.join(
+    os.path.dirname(__file__),
+    os.pardir,
+    "myproj",
+    "config",
+    "defaults.yaml",
+)
+DESCRIPTIONS = os.path.join(
+    os.path.dirname(__file__),
+    os.pardir,
+    "myproj",
+    "config",
+    "descriptions.yaml",
+)
+MULTI_FIELD = "soft.linter"
+SINGLE_FIELD = "project.license"
+FREE_FIELD = "project.name"
+UNRENDERED_FIELD = "project.path"
+INFERRED_FIELD = "org.slug"
+PARTIAL_PARAMS = {"org": {"name": "My Org"}}
+INFERRED_VALUE = "my_org"
+EMAIL_FIELD = "user.email"
+EMAIL_PARAMS = {"org": {"slug": "my_org"}, "user": {"slug": "me"}}
+EMAIL_VALUE = "me@my_org.com"
+GIT_EMAIL = "me@example.com"
+
+
+# SCHEMA
+def test_schema_paths_unique():
+    assert len(schema.FIELDS) == len(schema.SCHEMA)
+
+
+def test_sections_in_schema_order():
+    paths = [
+        f"{section}.{key}"
+        for section, keys in schema.SECTIONS.items()
+        for key in keys
+    ]
+    assert paths == [field.path for field in schema.SCHEMA]
+
+
+def test_choice_fields():
+    assert MULTI_FIELD in schema.CHOICE_FIELDS
+    assert FREE_FIELD not in schema.CHOICE_FIELDS
+
+
+def test_unrendered_fields():
+    assert schema.UNRENDERED_FIELDS == {UNRENDERED_FIELD}
+
+
+def test_models_match_schema():
+    assert Parameters().fields is schema.SECTIONS
+    assert Defaults().to_dict() == schema.defaults()
+
+
+def test_defaults_file_in_sync():
+    assert ConfigParser.yaml_to_dict(yaml_file=DEFAULTS) == schema.defaults()
+
+
+def test_descriptions_file_in_sync():
+    assert ConfigParser.yaml_to_dict(yaml_file=DESCRIPTIONS) == (
+        schema.descriptions()
+    )
+
+
+# Field
+def test_field_read_only():
+    with pytest.raises(AttributeError):
+        schema.FIELDS[FREE_FIELD].value = ""
+
+
+def test_field_allowed_includes_alternative():
+    field = schema.FIELDS[MULTI_FIELD]
+    assert field.allowed == frozenset(field.choices) | {field.alternative}
+
+
+def test_field_infer():
+    field = schema.FIELDS[INFERRED_FIELD]
+    assert field.infer(PARTIAL_PARAMS, schema.Probes()) == INFERRED_VALUE
+
+
+@pytest.mark.parametrize("git_email, expected", [
+    ("", EMAIL_VALUE),
+    (GIT_EMAIL, GIT_EMAIL),
+])
+def test_field_infer_email(git_email, expected):
+    field = schema.FIELDS[EMAIL_FIELD]
+    env = {"git_user_email": git_email}
+    assert field.infer(EMAIL_PARAMS, env) == expected
+
+
+def test_field_infer_email_without_git():
+    field = schema.FIELDS[EMAIL_FIELD]
+    assert field.infer(EMAIL_PARAMS, {}) == EMAIL_VALUE
+
+
+# Probes
+def test_probes_looked_up_once():
+    calls = []
+    probes = schema.Probes({"probe": lambda: calls.append(1) or len(calls)})
+    assert probes["probe"] == 1
+    assert probes["probe"] == 1
+    assert calls == [1]
+
+
+def test_probes_start_in_background():
+    event = threading.Event()
+    probes = schema.Probes({"probe": lambda: event.wait(5)}).start()
+    event.set()
+    assert probes["probe"] is True
+    assert list(probes) == ["probe"]
+
+
+def test_probes_reraise_exceptions():
+    probes = schema.Probes({"probe": lambda: 1 / 0}).start()
+    with pytest.raises(ZeroDivisionError):
+        probes["probe"]
+
+
+def test_field_normalize():
+    assert schema.FIELDS[MULTI_FIELD].normalize(" a, b") == ["a", "b"]
+    assert schema.FIELDS[MULTI_FIELD].normalize(["a"]) == ["a"]
+    assert schema.FIELDS[SINGLE_FIELD].normalize("mit") == "mit"
+
+
+def test_field_invalid():
+    assert schema.FIELDS[MULTI_FIELD].invalid(["flake8", "x"]) == ["x"]
+    assert schema.FIELDS[SINGLE_FIELD].invalid("mit") == []
+    assert schema.FIELDS[FREE_FIELD].invalid("anything") == []
+
+
+def test_field_to_defaults():
+    res = schema.FIELDS[INFERRED_FIELD].to_defaults()
+    assert res['value'] == schema.INFER
+    assert "choices" not in res
+    res = schema.FIELDS[SINGLE_FIELD].to_defaults()
+    assert list(res) == [
+        "value",
+        "choices",
+        "multiple",
+        "alternative",
+    ]
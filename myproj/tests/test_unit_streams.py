@@ -0,0 +1,78 @@
+"""
+Unit tests for '.streams'.
+"""
+import hashlib
+import io
+import os
+
+import pytest
+
+from myproj import streams
+
+# Test parameters
+CONTENTS = bytes(range(256)) * 1000
+OFFSET = 1000
+COUNT = 70000
+
+
+@pytest.fixture
+def src(tmpdir):
+    path = os.path.join(str(tmpdir), "src")
+    with open(path, 'wb') as fh:
+        fh.write(CONTENTS)
+    return path
+
+
+# chunks()
+def test_chunks():
+    res = list(streams.chunks(io.BytesIO(CONTENTS), size=COUNT))
+    assert b"".join(res) == CONTENTS
+    assert max(len(chunk) for chunk in res) == COUNT
+
+
+# sha256()
+def test_sha256():
+    assert streams.sha256(io.BytesIO(CONTENTS)) == (
+        hashlib.sha256(CONTENTS).hexdigest()
+    )
+
+
+# copy_range()
+@pytest.mark.parametrize("copy", streams._COPY)
+def test_copy_range(src, tmpdir, monkeypatch, copy):
+    monkeypatch.setattr(streams, '_COPY', [copy])
+    dst = os.path.join(str(tmpdir), "dst")
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        assert streams.copy_range(
+            fd_src=fsrc.fileno(),
+            fd_dst=fdst.fileno(),
+            count=COUNT,
+            offset=OFFSET,
+        ) == COUNT
+        assert fsrc.tell() == 0
+    with open(dst, 'rb') as fh:
+        assert fh.read() == CONTENTS[OFFSET:OFFSET + COUNT]
+
+
+def test_copy_range_falls_back(src, tmpdir, monkeypatch):
+    def unsupported(*args):
+        raise OSError("not supported")
+
+    monkeypatch.setattr(streams, '_COPY', [unsupported, streams._pread])
+    dst = os.path.join(str(tmpdir), "dst")
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        assert streams.copy_range(
+            fd_src=fsrc.fileno(),
+            fd_dst=fdst.fileno(),
+            count=len(CONTENTS) + 1,
+        ) == len(CONTENTS)
+
+
+# copy_file()
+def test_copy_file(src, tmpdir):
+    dst = os.path.join(str(tmpdir), "dst")
+    with open(dst, 'wb') as fh:
+        fh.write(b"head")
+        assert streams.copy_file(src=src, fdst=fh) == len(CONTENTS)
+    with open(dst, 'rb') as fh:
+        assert fh.read() == b"head" + CONTENTS
@@ -0,0 +1,30 @@
+"""
+Unit tests for '.utils'.
+"""
+import pytest
+
+from myproj import utils
+
+# Test parameters
+GIT_USER_NAME = "Jane Doe"
+NAME = " 1My Project 2.0-"
+SLUG = "my_project_20"
+
+
+# git_config()
+def test_git_config(monkeypatch):
+    class Pipe:
+        def read(self):
+            return GIT_USER_NAME + "\n"
+    monkeypatch.setattr('os.popen', lambda command: Pipe())
+    assert utils.git_config("user.name") == GIT_USER_NAME
+
+
+# slugify()
+def test_slugify():
+    assert utils.slugify(NAME) == SLUG
+
+
+def test_slugify_wrong_type():
+    with pytest.raises(TypeError):
+        utils.slugify(1)